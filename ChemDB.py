@@ -10,6 +10,7 @@
 # ++ Imports
 # ++---------------------------------------------------------------------------------------------------------------------++#
 from logging import DEBUG, FileHandler
+from multiprocessing import freeze_support
 
 from src.fctlib.configfile import GetConfig, GetConfigValue
 from src.fctlib.logging import LogLOGGER, SetHandlerLevel
@@ -45,6 +46,8 @@ def main():
 # ++ Software main entrypoint
 # +-----------------------------------------------------------------------------------------------------------------------+#
 if __name__ == "__main__":
+    # Lets worker processes start from a frozen (PyInstaller) executable
+    freeze_support()
     main()
 
     # # NOTE: Uncomment sys.excepthook injection under scr.fctlib.logging for unit tests!
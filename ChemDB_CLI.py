@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from multiprocessing import freeze_support
+
+from src.cli import RunCli
+from src.fctlib.logging import LogLOGGER
+from src.fctlib.quit import QuitExecution
+from src.fctlib.threads import RerouteThreadingExcepthook
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def main():
+    LogLOGGER.info(f"\n#++{'-'*114}++#\nStarted command line execution ...")
+
+    RerouteThreadingExcepthook()
+
+    exit_code = RunCli()
+
+    LogLOGGER.info(f"\nEnded command line execution with exit code {exit_code}!\n#++{'-'*114}++#")
+    QuitExecution(exit_code=exit_code)
+
+
+# +-----------------------------------------------------------------------------------------------------------------------+#
+# ++ Command line entrypoint, i.e.: python ChemDB_CLI.py "data/*.xlsx" --sources pubchem gestis --threads 4
+# +-----------------------------------------------------------------------------------------------------------------------+#
+if __name__ == "__main__":
+    # Lets worker processes start from a frozen (PyInstaller) executable
+    freeze_support()
+    main()
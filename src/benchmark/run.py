@@ -0,0 +1,243 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from datetime import datetime
+from json import dump, loads
+from pathlib import Path
+from subprocess import CalledProcessError, run
+from tempfile import TemporaryDirectory
+from threading import Event
+from time import perf_counter
+from typing import Any
+
+import pubchempy
+from pandas import DataFrame
+
+from src.benchmark.server import CHEMINFO_PATH, GESTIS_PATH, PUBCHEM_API_PATH, FixtureServer, LoadCatalogue
+from src.fctlib.logging import LogLOGGER
+from src.fctlib.metrics import RegMETRICS, StmMETRICS
+from src.fctlib.pandas import WriteDfToXlsx
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+PthRESULTS = Path.cwd() / "benchmarks"
+"""Folder path for benchmark results."""
+
+UNLISTED_CAS = "7732-18-5"
+"""Valid CAS number that isn't listed in the fixtures, so every source runs into its "no hit" path."""
+
+SOURCES = ("cheminfo", "pubchem", "gestis")
+"""Sources that can be benchmarked."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetGitCommit() -> str:
+    """Returns the short hash of the checked out commit, suffixed with "-dirty" for uncommitted changes.\n
+    - <- | <return> Commit hash or "unknown" if git isn't available"""
+
+    try:
+        commit = run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        changes = run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True)
+    except (OSError, CalledProcessError):
+        return "unknown"
+
+    return f"{commit}-dirty" if changes.stdout.strip() else commit
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def WriteInputFile(PthFile: Path, chemicals_count: int) -> bool:
+    """Writes an input file cycling through the fixture catalogue and one unlisted chemical.\n
+    - -> | <PthFile> Path of the .xlsx input file\n
+    - -> | <chemicals_count> Number of chemicals\n
+    - <- | <return> Write success"""
+
+    identifiers = [chemical["cas"] for chemical in LoadCatalogue()] + [UNLISTED_CAS]
+    DfInput = DataFrame({"CAS": [identifiers[row % len(identifiers)] for row in range(chemicals_count)]})
+
+    return WriteDfToXlsx(DfDataframe=DfInput, PthXlsFile=PthFile)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.4     Starts with an empty synonym index in the temporary folder
+# ++ 26-10-19    fJ      0.3     Passes a run config to ProcessFiles
+# ++ 26-10-19    fJ      0.2     Runs headless with the command line frontend instead of the GUI variables
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def RunBenchmark(
+    chemicals_count: int = 20,
+    threads: int = 1,
+    sources: tuple[str, ...] = SOURCES,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int | None = None,
+    trace_memory: bool = True,
+) -> dict[str, Any]:
+    """Runs ProcessFiles end-to-end against the fixture server and returns the benchmark results.\n
+    - -> | <chemicals_count> Number of chemicals to process\n
+    - -> | <threads> Number of webdriver threads, 1 runs single-threaded\n
+    - -> | <sources> Sources to query\n
+    - -> | <latency> Simulated base latency [s] per request\n
+    - -> | <jitter> Simulated additional latency [s] per request\n
+    - -> | <error_rate> Simulated probability [0..1] of a request to fail\n
+    - -> | <seed> Random seed for the simulation\n
+    - -> | <trace_memory> Switch to trace the Python memory peak, slows down processing slightly\n
+    - <- | <return> Results dictionary"""
+
+    # NOTE: Imported here, as importing the pipeline loads selenium and the query modules
+    import src.queries.chemikalieninfo as cheminfo
+    import src.queries.gestis as gestis
+    from src.cli import GetCliRunConfig, RegisterCliFrontend
+    from src.fctlib.synonyms import IdxSYNONYMS
+    from src.main import ProcessFiles
+
+    SrvFixtures = FixtureServer(latency=latency, jitter=jitter, error_rate=error_rate, seed=seed).Start()
+    urls = (cheminfo.URL, gestis.URL, pubchempy.API_BASE)
+    cheminfo.URL = f"{SrvFixtures.url}{CHEMINFO_PATH}"
+    gestis.URL = f"{SrvFixtures.url}{GESTIS_PATH}"
+    pubchempy.API_BASE = f"{SrvFixtures.url}{PUBCHEM_API_PATH}"
+
+    memory_peak = None
+    PthSynonymIndex = IdxSYNONYMS.PthFile
+    try:
+        with TemporaryDirectory() as temp_folder:
+            PthInput = Path(temp_folder) / "Benchmark.xlsx"
+            # Names resolved from past runs would skip the name searches, so each run starts without them
+            IdxSYNONYMS.Reset(PthFile=Path(temp_folder) / "synonyms.json")
+            WriteInputFile(PthFile=PthInput, chemicals_count=chemicals_count)
+            RegisterCliFrontend()
+            config = GetCliRunConfig(sources=sources, threads=threads, PthOutput=Path(temp_folder))
+
+            if trace_memory:
+                tracemalloc.start()
+            start = perf_counter()
+            ProcessFiles(file_paths=[PthInput], EvtCancel=Event(), config=config)
+            wall_time = perf_counter() - start
+            if trace_memory:
+                _, memory_peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+    finally:
+        SrvFixtures.Stop()
+        cheminfo.URL, gestis.URL, pubchempy.API_BASE = urls
+        IdxSYNONYMS.Reset(PthFile=PthSynonymIndex)
+
+    return {
+        "commit": GetGitCommit(),
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "parameters": {
+            "chemicals": chemicals_count,
+            "threads": threads,
+            "sources": list(sources),
+            "latency": latency,
+            "jitter": jitter,
+            "error_rate": error_rate,
+            "seed": seed,
+        },
+        "chemicals_per_second": chemicals_count / wall_time,
+        "wall_time": wall_time,
+        "memory_peak": memory_peak,
+        "stages": {f"{source}|{stage}": stats for (source, stage), stats in StmMETRICS.GetSummary().items()},
+        "functions": RegMETRICS.GetSummary()["histograms"],
+        "server": dict(SrvFixtures.stats),
+    }
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def CompareResults(results: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Returns report lines comparing throughput and p50 stage latencies of two benchmark results.\n
+    - -> | <results> Current results\n
+    - -> | <baseline> Results to compare with, i.e. of a previous commit\n
+    - <- | <return> Report lines"""
+
+    def Change(new: float, old: float) -> str:
+        return f"{(new - old) / old:+.1%}" if old else "n/a"
+
+    lines = [
+        f"Compared to <{baseline['commit']}>: {baseline['chemicals_per_second']:.3f} -> "
+        f"{results['chemicals_per_second']:.3f} chemicals/s "
+        f"({Change(results['chemicals_per_second'], baseline['chemicals_per_second'])})"
+    ]
+    for stage, stats in results["stages"].items():
+        if stage in baseline["stages"]:
+            p50_old, p50_new = baseline["stages"][stage]["p50"], stats["p50"]
+            lines.append(f"{stage:<34} p50: {p50_old:.3f} s -> {p50_new:.3f} s ({Change(p50_new, p50_old)})")
+
+    return lines
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetArguments() -> Namespace:
+    """Parses the command line arguments of the benchmark."""
+
+    ArpParser = ArgumentParser(description="Runs the processing pipeline against a local fixture server.")
+    ArpParser.add_argument("--chemicals", type=int, default=20, help="number of chemicals to process")
+    ArpParser.add_argument("--threads", type=int, default=1, help="number of webdriver threads, 1 runs single-threaded")
+    ArpParser.add_argument("--sources", nargs="+", choices=SOURCES, default=list(SOURCES), help="sources to query")
+    ArpParser.add_argument("--latency", type=float, default=0.0, help="simulated base latency [s] per request")
+    ArpParser.add_argument("--jitter", type=float, default=0.0, help="simulated additional latency [s] per request")
+    ArpParser.add_argument("--error-rate", type=float, default=0.0, help="simulated request failure rate [0..1]")
+    ArpParser.add_argument("--seed", type=int, default=None, help="random seed for latency and errors")
+    ArpParser.add_argument("--no-trace-memory", action="store_true", help="don't trace the memory peak")
+    ArpParser.add_argument("--compare", type=Path, default=None, help="results file to compare with")
+    ArpParser.add_argument("--output", type=Path, default=PthRESULTS, help="folder to write the results file to")
+
+    return ArpParser.parse_args()
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def main():
+    args = GetArguments()
+
+    results = RunBenchmark(
+        chemicals_count=args.chemicals,
+        threads=args.threads,
+        sources=tuple(args.sources),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        trace_memory=not args.no_trace_memory,
+    )
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    PthResults = args.output / f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_{results['commit']}.json"
+    with open(PthResults, "w", encoding="utf-8") as TxtFile:
+        dump(results, TxtFile, indent=2)
+
+    memory = f"{results['memory_peak'] / 1024**2:.1f} MiB" if results["memory_peak"] is not None else "not traced"
+    LogLOGGER.userinfo(
+        f"Benchmark <{results['commit']}>: {results['chemicals_per_second']:.3f} chemicals/s, "
+        f"wall time: {results['wall_time']:.1f} s, memory peak: {memory}"
+    )
+    LogLOGGER.userinfo(f"Stage latencies:\n{StmMETRICS.FormatSummary()}")
+    LogLOGGER.userinfo(f"Results written to <{PthResults}>.")
+
+    if args.compare is not None:
+        baseline = loads(args.compare.read_text(encoding="utf-8"))
+        LogLOGGER.userinfo("\n".join(CompareResults(results=results, baseline=baseline)))
+
+
+# +-----------------------------------------------------------------------------------------------------------------------+#
+# ++ Benchmark entrypoint
+# +-----------------------------------------------------------------------------------------------------------------------+#
+if __name__ == "__main__":
+    main()
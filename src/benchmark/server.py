@@ -0,0 +1,304 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from pathlib import Path
+from random import Random
+from string import Template
+from threading import Lock, Thread
+from time import sleep
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+PthFIXTURES = Path(__file__).parent / "fixtures"
+"""Fixtures folder path. Recorded pages can be dropped in as <source>/dossier_<id>.html or gestis/sdb_<id>.pdf and are
+served instead of the rendered templates."""
+
+PUBCHEM_API_PATH = "/pubchem/rest/pug"
+"""Path of the PubChem PUG REST stand-in, pubchempy.API_BASE has to point to it."""
+CHEMINFO_PATH = "/cheminfo/public"
+"""Path of the Chemikalieninfo search page stand-in."""
+GESTIS_PATH = "/gestis/search"
+"""Path of the Gestis search page stand-in."""
+
+PUBCHEM_FAULT_NOT_FOUND = {"Fault": {"Code": "PUGREST.NotFound", "Message": "No CID found"}}
+PUBCHEM_FAULT_BUSY = {"Fault": {"Code": "PUGREST.ServerBusy", "Message": "Too many requests or server too busy"}}
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TemplateValues(dict):
+    """Template substitution values that render missing entries as empty strings."""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def LoadCatalogue(PthFolder: Path = PthFIXTURES) -> list[dict[str, Any]]:
+    """Returns the chemicals catalogue the fixture server knows about.\n
+    - -> | <PthFolder> Fixtures folder path\n
+    - <- | <return> List of chemical dictionaries"""
+
+    return loads((PthFolder / "catalogue.json").read_text(encoding="utf-8"))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def FindChemical(catalogue: list[dict[str, Any]], term: str) -> dict[str, Any] | None:
+    """Returns the catalogue entry matching a CAS number or a German/English name, case insensitive.\n
+    - -> | <catalogue> Chemicals catalogue\n
+    - -> | <term> Query term\n
+    - <- | <return> Chemical dictionary or None if not listed"""
+
+    term = term.strip().lower()
+    return next(
+        (chemical for chemical in catalogue if term in (chemical[key].lower() for key in ("cas", "name_ger", "name_eng"))),
+        None,
+    )
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def RenderFixture(relative_path: str, values: dict[str, Any]) -> str:
+    """Returns a fixture template rendered with the given values.\n
+    - -> | <relative_path> Template path relative to the fixtures folder\n
+    - -> | <values> Substitution values, missing values are rendered empty\n
+    - <- | <return> Rendered fixture"""
+
+    return Template((PthFIXTURES / relative_path).read_text(encoding="utf-8")).substitute(TemplateValues(values))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class FixtureServer(ThreadingHTTPServer):
+    """Local HTTP stand-in for Chemikalieninfo, Gestis and the PubChem PUG REST API serving fixtures.\n
+    Every data request (searches, dossiers, PDFs, PubChem JSON) is delayed by the simulated latency and fails with HTTP 503
+    at the simulated error rate. The landing pages of the sources are only delayed."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """- -> | <latency> Base latency [s] per request\n
+        - -> | <jitter> Maximum additional, uniformly distributed latency [s] per request\n
+        - -> | <error_rate> Probability [0..1] of a data request to fail with HTTP 503\n
+        - -> | <seed> Random seed for reproducible latencies and errors\n
+        - -> | <host> Host to bind to\n
+        - -> | <port> Port to bind to, 0 picks a free port"""
+
+        super().__init__((host, port), FixtureRequestHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.catalogue = LoadCatalogue()
+        self.stats = {"requests": 0, "errors": 0}
+        self._random = Random(seed)
+        self._lock = Lock()
+        self._thread: Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def Start(self) -> "FixtureServer":
+        """Starts serving in a daemon thread."""
+        self._thread = Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def Stop(self):
+        """Stops serving and closes the socket."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def Simulate(self, may_fail: bool = True) -> bool:
+        """Sleeps for the simulated latency and decides if the request fails.\n
+        - -> | <may_fail> Switch if the request may fail\n
+        - <- | <return> True if the request has to fail"""
+
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = may_fail and self._random.random() < self.error_rate
+            self.stats["requests"] += 1
+            self.stats["errors"] += int(failed)
+
+        sleep(delay)
+        return failed
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests of the fixture server to the source stand-ins."""
+
+    server: FixtureServer
+    # Keep connections alive like the live sources, every response sends its Content-Length
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, Nagle's algorithm would hold back the body on kept alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any):
+        """Silences the default request logging to stderr."""
+
+    def do_GET(self):
+        self.HandleRequest(body=b"")
+
+    def do_POST(self):
+        self.HandleRequest(body=self.rfile.read(int(self.headers.get("Content-Length", 0))))
+
+    def HandleRequest(self, body: bytes):
+        """Parses path and parameters of the request and dispatches it to its route."""
+
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        params.update({key: values[0] for key, values in parse_qs(body.decode("utf-8")).items()})
+
+        routes = {
+            CHEMINFO_PATH: self.CheminfoSearchPage,
+            "/cheminfo/search": self.CheminfoHits,
+            "/cheminfo/dossier": self.CheminfoDossier,
+            GESTIS_PATH: self.GestisSearchPage,
+            "/gestis/hits": self.GestisHits,
+            "/gestis/data": self.GestisDossier,
+            "/gestis/pdf": self.GestisPdf,
+            f"{PUBCHEM_API_PATH}/compound/name/JSON": self.PubchemCompounds,
+            f"{PUBCHEM_API_PATH}/compound/cid/synonyms/JSON": self.PubchemSynonyms,
+        }
+        route = routes.get(url.path)
+        if route is None:
+            return self.Respond(status=HTTPStatus.NOT_FOUND, content="Not found", content_type="text/plain")
+
+        # Landing pages never fail, as the app doesn't retry navigation
+        if self.server.Simulate(may_fail=url.path not in (CHEMINFO_PATH, GESTIS_PATH)):
+            if url.path.startswith(PUBCHEM_API_PATH):
+                return self.RespondJson(status=HTTPStatus.SERVICE_UNAVAILABLE, data=PUBCHEM_FAULT_BUSY)
+            return self.Respond(status=HTTPStatus.SERVICE_UNAVAILABLE, content="Service unavailable")
+
+        route(params)
+
+    def Respond(self, content: str | bytes, status: int = HTTPStatus.OK, content_type: str = "text/html; charset=utf-8"):
+        """Sends a response."""
+
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def RespondJson(self, data: dict[str, Any], status: int = HTTPStatus.OK):
+        """Sends a JSON response."""
+        self.Respond(content=dumps(data), status=status, content_type="application/json")
+
+    def RespondRecordedOrRendered(self, recorded_path: str, template_path: str, values: dict[str, Any]):
+        """Sends a recorded page if one exists, the rendered template otherwise."""
+
+        PthRecorded = PthFIXTURES / recorded_path
+        if PthRecorded.is_file():
+            return self.Respond(content=PthRecorded.read_bytes())
+        self.Respond(content=RenderFixture(relative_path=template_path, values=values))
+
+    def GetChemical(self, key: str, value: str) -> dict[str, Any] | None:
+        """Returns the catalogue entry with the given source ID."""
+        source, id_key = key.split(".")
+        return next((chemical for chemical in self.server.catalogue if str(chemical[source][id_key]) == value), None)
+
+    def CheminfoSearchPage(self, params: dict[str, str]):
+        self.Respond(content=(PthFIXTURES / "cheminfo" / "search.html").read_bytes())
+
+    def CheminfoHits(self, params: dict[str, str]):
+        chemical = FindChemical(self.server.catalogue, params.get("term", ""))
+        if chemical is None:
+            return self.Respond(content="<div>Keine Treffer</div>")
+
+        link = f"/cheminfo/dossier?{urlencode({'id': chemical['cheminfo']['id_gsbl']})}"
+        hit = RenderFixture(relative_path="cheminfo/hit.html", values={**chemical, "number": 1, "link": link})
+        self.Respond(content=f"<div>1 Treffer</div>{hit}")
+
+    def CheminfoDossier(self, params: dict[str, str]):
+        chemical = self.GetChemical(key="cheminfo.id_gsbl", value=params.get("id", ""))
+        if chemical is None:
+            return self.Respond(status=HTTPStatus.NOT_FOUND, content="Not found")
+
+        pictograms = "".join(f'<img alt="{pictogram}" src="">' for pictogram in chemical["cheminfo"]["ghs_pictograms"])
+        self.RespondRecordedOrRendered(
+            recorded_path=f"cheminfo/dossier_{chemical['cheminfo']['id_gsbl']}.html",
+            template_path="cheminfo/dossier.html",
+            values={**chemical, **chemical["cheminfo"], "id_cas": chemical["cas"], "ghs_pictograms": pictograms},
+        )
+
+    def GestisSearchPage(self, params: dict[str, str]):
+        self.Respond(content=(PthFIXTURES / "gestis" / "search.html").read_bytes())
+
+    def GestisHits(self, params: dict[str, str]):
+        chemical = FindChemical(self.server.catalogue, params.get("term", ""))
+        if chemical is None:
+            return self.Respond(content="")
+
+        link = f"/gestis/data?{urlencode({'zvg': chemical['gestis']['id_zvg']})}"
+        hit = RenderFixture(relative_path="gestis/hit.html", values={**chemical, "link": link})
+        self.Respond(content=f'<div role="list">{hit}</div>')
+
+    def GestisDossier(self, params: dict[str, str]):
+        chemical = self.GetChemical(key="gestis.id_zvg", value=params.get("zvg", ""))
+        if chemical is None:
+            return self.Respond(status=HTTPStatus.NOT_FOUND, content="Not found")
+
+        zvg = chemical["gestis"]["id_zvg"]
+        self.RespondRecordedOrRendered(
+            recorded_path=f"gestis/dossier_{zvg}.html",
+            template_path="gestis/dossier.html",
+            values={**chemical, "pdf_link": f"{self.server.url}/gestis/pdf?{urlencode({'zvg': zvg})}"},
+        )
+
+    def GestisPdf(self, params: dict[str, str]):
+        PthPdf = PthFIXTURES / "gestis" / f"sdb_{params.get('zvg', '')}.pdf"
+        if not PthPdf.is_file():
+            PthPdf = PthFIXTURES / "gestis" / "sdb.pdf"
+        self.Respond(content=PthPdf.read_bytes(), content_type="application/pdf")
+
+    def PubchemCompounds(self, params: dict[str, str]):
+        chemical = FindChemical(self.server.catalogue, params.get("name", ""))
+        if chemical is None:
+            return self.RespondJson(status=HTTPStatus.NOT_FOUND, data=PUBCHEM_FAULT_NOT_FOUND)
+        self.Respond(
+            content=(PthFIXTURES / "pubchem" / f"{chemical['pubchem']['cid']}.json").read_bytes(),
+            content_type="application/json",
+        )
+
+    def PubchemSynonyms(self, params: dict[str, str]):
+        PthSynonyms = PthFIXTURES / "pubchem" / f"{params.get('cid', '')}_synonyms.json"
+        if not PthSynonyms.is_file():
+            return self.RespondJson(status=HTTPStatus.NOT_FOUND, data=PUBCHEM_FAULT_NOT_FOUND)
+        self.Respond(content=PthSynonyms.read_bytes(), content_type="application/json")
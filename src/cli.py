@@ -0,0 +1,365 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from os import environ
+from logging import DEBUG, FileHandler
+from multiprocessing import AuthenticationError
+from pathlib import Path
+from threading import Event, Thread
+from time import gmtime, monotonic, strftime
+from typing import Optional
+
+from src.fctlib.io import GetFilePathsFromPatterns, GetShard, GetSupportedFilesFromPath
+from src.fctlib.logging import LogLOGGER, SetHandlerLevel
+from src.frontend import Frontend, SetFrontend
+from src.main import AnalyseFiles, BusPROGRESS, ProcessFiles, RunConfig, RunQueryWorker
+from src.settings import CLI_PROGRESS_INTERVAL, PROGRESS_POLL_INTERVAL, SUPPORTED_EXTENSIONS
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+SOURCES = ("cheminfo", "pubchem", "gestis")
+"""Sources that can be queried."""
+FORMATS = ("xlsx", "parquet", "csv")
+"""Output file formats that can be written."""
+
+LstCLI_ERRORS: list[str] = []
+"""Errors reported by the processing pipeline during the current command line run."""
+
+EvtCANCEL_PROCESSING = Event()
+"""Event to cancel processing."""
+
+AUTHKEY_VARIABLE = "CHEMDB_AUTHKEY"
+"""Environment variable to read the broker authkey from, so it doesn't show up in the process list."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def CliToggleExecutionLock(force_enable: Optional[bool] = False, force_disable: Optional[bool] = False):
+    """Does nothing, as there are no widgets to lock on the command line.\n
+    - -> | <force_enable> Ignored\n
+    - -> | <force_disable> Ignored"""
+
+    return
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def CliEvaluateOnError(PthFolder: Path, error: str, show_in_gui: Optional[bool] = True):
+    """Logs an error that aborted the pipeline and remembers it for the exit code.\n
+    - -> | <PthFolder> Current folder path for error logging\n
+    - -> | <error> Error message to log\n
+    - -> | <show_in_gui> Ignored"""
+
+    LstCLI_ERRORS.append(error)
+    LogLOGGER.warning(f"USERINFO triggered by user-provided folder path <{PthFolder}>:")
+    LogLOGGER.usererror(error)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.2     Report the execution time
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def CliEvaluateAnalysis(report: dict[str, int | str]):
+    """Logs the processing report after the analysis.\n
+    - -> | <report> Report dictionary"""
+
+    LogLOGGER.userinfo(
+        f"File Analysis: {report['files_count']} files, {report['chems_count']} chemicals, "
+        f"{report['cas_count']} CAS numbers ({report['execution_time']:.2f} s)"
+    )
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def CliEvaluateProcessing(report: dict[str, int | str | None] | None, final: bool = False):
+    """Logs the processing report during and after file processing.\n
+    - -> | <report> Report dictionary or None if threading is currently initialised\n
+    - -> | <final> Switch to indicate if the report is during or at the end of processing"""
+
+    if report is None:
+        LogLOGGER.userinfo("Cleaning after processing ..." if final else "Preparing for processing ...")
+        return
+
+    if final:
+        LogLOGGER.userinfo(f"Finished after {report['execution_time']:.2f} s!")
+        return
+
+    rates = (
+        f" | {report['throughput']:.2f} chemicals/s, ETA {strftime('%H:%M:%S', gmtime(report['eta']))}"
+        if report.get("eta") is not None
+        else str()
+    )
+    LogLOGGER.userinfo(
+        f"Working on File {report['file_no']}|{report['files_count']} ({report['file_name']}): "
+        f"Chemical {report['chem_no']}|{report['chems_count']} (<{report['chem_id']}>) ...{rates}"
+    )
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.2     Settings moved to GetCliRunConfig()
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def RegisterCliFrontend():
+    """Registers the command line as frontend of the processing pipeline."""
+
+    SetFrontend(
+        Frontend(
+            ToggleExecutionLock=CliToggleExecutionLock,
+            EvaluateOnError=CliEvaluateOnError,
+            EvaluateAnalysis=CliEvaluateAnalysis,
+        )
+    )
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.4     Added merge input switch
+# ++ 26-10-19    fJ      0.3     Added output formats
+# ++ 26-10-19    fJ      0.2     Added worker process and broker settings
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetCliRunConfig(
+    sources: tuple[str, ...],
+    threads: int,
+    PthOutput: Path,
+    processes: int = 0,
+    broker_address: tuple[str, int] | None = None,
+    authkey: str = str(),
+    formats: tuple[str, ...] = ("xlsx",),
+    merge_input: bool = False,
+) -> RunConfig:
+    """Builds the run config of a command line run.\n
+    - -> | <sources> Sources to query\n
+    - -> | <threads> Number of webdriver threads, 1 runs single-threaded\n
+    - -> | <PthOutput> Folder path for the output files and substance data sheets\n
+    - -> | <processes> Number of local worker processes, 0 runs without worker processes\n
+    - -> | <broker_address> Host and port to serve jobs on for workers on other hosts\n
+    - -> | <authkey> Key workers have to authenticate with\n
+    - -> | <formats> Output file formats, i.e. xlsx\n
+    - -> | <merge_input> Switch to write the input rows next to their results to the .xlsx output files\n
+    - <- | <return> Run config"""
+
+    return RunConfig(
+        query_cheminfo="cheminfo" in sources,
+        query_pubchem="pubchem" in sources,
+        query_gestis="gestis" in sources,
+        run_threaded=threads > 1,
+        max_threads=max(threads, 1),
+        output_folder=PthOutput,
+        processes=max(processes, 0),
+        broker_address=broker_address,
+        broker_authkey=authkey.encode(),
+        output_formats=tuple(f".{output_format}" for output_format in dict.fromkeys(formats)),
+        merge_input=merge_input,
+    )
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.2     Added run config
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def CliProcessFiles(file_paths: list[Path], config: RunConfig) -> bool:
+    """Runs ProcessFiles in a separate thread and logs its progress, Ctrl+C cancels processing.\n
+    - -> | <file_paths> List of file paths compatible for processing\n
+    - -> | <config> Run config\n
+    - <- | <return> Processing success"""
+
+    EvtCANCEL_PROCESSING.clear()
+    ThrProcessing = Thread(
+        target=ProcessFiles,
+        kwargs={"file_paths": file_paths, "EvtCancel": EvtCANCEL_PROCESSING, "config": config},
+        daemon=True,
+    )
+    ThrProcessing.start()
+
+    finished = False
+    last_logged = 0.0
+    while True:
+        try:
+            ThrProcessing.join(timeout=PROGRESS_POLL_INTERVAL / 1000)
+        except KeyboardInterrupt:
+            if EvtCANCEL_PROCESSING.is_set():
+                raise
+            LogLOGGER.userinfo("Cancelling processing, press Ctrl+C again to abort immediately ...")
+            EvtCANCEL_PROCESSING.set()
+
+        for report, final in BusPROGRESS.Drain():
+            # Only log intermediate reports every few seconds, the log of a nightly run would be flooded otherwise
+            if report is not None and not final:
+                if monotonic() - last_logged < CLI_PROGRESS_INTERVAL:
+                    continue
+                last_logged = monotonic()
+            finished = finished or (report is not None and final)
+            CliEvaluateProcessing(report=report, final=final)
+
+        if not ThrProcessing.is_alive():
+            break
+
+    if not finished and not LstCLI_ERRORS:
+        CliEvaluateOnError(PthFolder=file_paths[0].parent, error="Processing ended unexpectedly, check the log file!")
+
+    return finished
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def ParseShard(value: str) -> tuple[int, int]:
+    """Parses a shard argument of the form K/N, i.e. "2/3" for the second of three machines.\n
+    - -> | <value> Shard argument\n
+    - <- | <return> Tuple: shard number, shards count"""
+
+    try:
+        shard_no, shards_count = (int(number) for number in value.split("/"))
+    except ValueError:
+        raise ArgumentTypeError(f"invalid shard <{value}>, expected K/N, i.e. 1/2")
+
+    if not 1 <= shard_no <= shards_count:
+        raise ArgumentTypeError(f"invalid shard <{value}>, K has to be between 1 and N")
+
+    return (shard_no, shards_count)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def ParseAddress(value: str) -> tuple[str, int]:
+    """Parses an address argument of the form HOST:PORT, i.e. "0.0.0.0:50000" to serve on all interfaces.\n
+    - -> | <value> Address argument\n
+    - <- | <return> Tuple: host, port"""
+
+    host, _, port = value.rpartition(":")
+    if not host or not port.isdigit() or not 0 < int(port) < 65536:
+        raise ArgumentTypeError(f"invalid address <{value}>, expected HOST:PORT, i.e. 127.0.0.1:50000")
+
+    return (host, int(port))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.4     Added merge argument
+# ++ 26-10-19    fJ      0.3     Added output formats argument
+# ++ 26-10-19    fJ      0.2     Added worker process and broker arguments
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetArguments(argv: list[str] | None = None) -> Namespace:
+    """Parses the command line arguments.\n
+    - -> | <argv> Arguments to parse, None parses sys.argv\n
+    - <- | <return> Parsed arguments"""
+
+    ArpParser = ArgumentParser(description="Queries the chemicals of the given files without the GUI.")
+    ArpParser.epilog = (
+        "Several hosts can share one job: run the coordinator with --serve and the input files, and the workers with "
+        "--worker and without input files. All of them need the same --authkey."
+    )
+    ArpParser.add_argument("inputs", nargs="*", help="input files, folders or glob patterns, i.e. 'data/**/*.xlsx'")
+    ArpParser.add_argument("--sources", nargs="+", choices=SOURCES, default=list(SOURCES), help="sources to query")
+    ArpParser.add_argument("--threads", type=int, default=1, help="number of webdriver threads, 1 runs single-threaded")
+    ArpParser.add_argument(
+        "--output", type=Path, default=None, help="folder for output files, default: folder of the first input file"
+    )
+    ArpParser.add_argument(
+        "--shard", type=ParseShard, default=None, help="only process the K-th of N shares of the input files, i.e. 1/2"
+    )
+    ArpParser.add_argument(
+        "--processes", type=int, default=0, help="number of worker processes, each with its own webdriver"
+    )
+    ArpParser.add_argument(
+        "--serve", type=ParseAddress, default=None, help="serve jobs to workers on other hosts on HOST:PORT"
+    )
+    ArpParser.add_argument(
+        "--worker", type=ParseAddress, default=None, help="run as worker for the coordinator serving on HOST:PORT"
+    )
+    ArpParser.add_argument(
+        "--authkey",
+        default=environ.get(AUTHKEY_VARIABLE, str()),
+        help=f"key workers authenticate with, default: environment variable {AUTHKEY_VARIABLE}",
+    )
+    ArpParser.add_argument(
+        "--formats", nargs="+", choices=FORMATS, default=["xlsx"], help="output file formats, default: xlsx"
+    )
+    ArpParser.add_argument(
+        "--merge", action="store_true", help="write the input rows next to their results to the xlsx output files"
+    )
+    ArpParser.add_argument("--analyse", action="store_true", help="only analyse the input files")
+    ArpParser.add_argument("--debug", action="store_true", help="write debug messages to the log file")
+
+    args = ArpParser.parse_args(argv)
+    if not args.inputs and args.worker is None:
+        ArpParser.error("the following arguments are required: inputs")
+    if (args.serve is not None or args.worker is not None) and not args.authkey:
+        ArpParser.error(f"--serve and --worker require --authkey or the environment variable {AUTHKEY_VARIABLE}")
+
+    return args
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.5     Pass the merge switch to the run config
+# ++ 26-10-19    fJ      0.4     Pass the output formats to the run config
+# ++ 26-10-19    fJ      0.3     Added worker mode and distributed processing
+# ++ 26-10-19    fJ      0.2     Builds the run config once per run
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def RunCli(argv: list[str] | None = None) -> int:
+    """Runs the analysis or processing of the given files without the GUI.\n
+    - -> | <argv> Arguments to parse, None parses sys.argv\n
+    - <- | <return> Exit code: 0 on success, 1 on errors"""
+
+    args = GetArguments(argv)
+    if args.debug:
+        SetHandlerLevel(ClsHandler=FileHandler, log_level=DEBUG)
+
+    if args.worker is not None:
+        try:
+            jobs_count = RunQueryWorker(address=args.worker, authkey=args.authkey.encode(), PthOutput=args.output)
+        except (ConnectionError, AuthenticationError) as Error:
+            LogLOGGER.usererror(f"Can't connect to the coordinator: {Error}")
+            return 1
+        LogLOGGER.userinfo(f"Worker finished after {jobs_count} chemicals.")
+        return 0
+
+    LstCLI_ERRORS.clear()
+    compatible_files = GetSupportedFilesFromPath(
+        file_paths=GetFilePathsFromPatterns(args.inputs), supported_extensions=SUPPORTED_EXTENSIONS
+    )
+    if args.shard is not None:
+        compatible_files = GetShard(file_paths=compatible_files, shard_no=args.shard[0], shards_count=args.shard[1])
+        LogLOGGER.userinfo(f"Shard {args.shard[0]}|{args.shard[1]}: {len(compatible_files)} files")
+    if not compatible_files:
+        LogLOGGER.usererror("No compatible files found!")
+        return 1
+
+    PthOutput = args.output if args.output is not None else compatible_files[0].parent
+    PthOutput.mkdir(parents=True, exist_ok=True)
+    RegisterCliFrontend()
+
+    if args.analyse:
+        AnalyseFiles(file_paths=compatible_files)
+    else:
+        config = GetCliRunConfig(
+            sources=tuple(args.sources),
+            threads=args.threads,
+            PthOutput=PthOutput,
+            processes=args.processes,
+            broker_address=args.serve,
+            authkey=args.authkey,
+            formats=tuple(args.formats),
+            merge_input=args.merge,
+        )
+        CliProcessFiles(file_paths=compatible_files, config=config)
+
+    return 1 if LstCLI_ERRORS else 0
@@ -0,0 +1,297 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from multiprocessing import get_context
+from multiprocessing.managers import BaseManager
+from os import getpid
+from queue import Empty, Queue
+from socket import gethostname
+from threading import Event, Lock
+from time import monotonic, sleep
+from typing import Any, Callable, Hashable
+
+from src.fctlib.logging import LogLOGGER
+from src.fctlib.ratelimit import TokenBucket
+from src.settings import JOB_MAX_ATTEMPTS, JOB_TIMEOUT
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+QueBROKER_JOBS = Queue()
+"""Job queue served by the broker process, items are tuples: job ID, payload. None denotes the stop signal."""
+QueBROKER_RESULTS = Queue()
+"""Result queue served by the broker process, items are tuples: job ID, result, error message or None."""
+QueBROKER_LEASES = Queue()
+"""Lease queue served by the broker process, items are tuples: job ID, ID of the worker that took the job."""
+BROKER_BUCKETS: dict[str, TokenBucket] = {}
+"""Token buckets served by the broker process by name, so rate limits hold for all workers together."""
+LckBROKER_BUCKETS = Lock()
+"""Lock of the token buckets dictionary."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetJobQueue() -> Queue:
+    """Returns the job queue, called in the broker process only."""
+    return QueBROKER_JOBS
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetResultQueue() -> Queue:
+    """Returns the result queue, called in the broker process only."""
+    return QueBROKER_RESULTS
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetLeaseQueue() -> Queue:
+    """Returns the lease queue, called in the broker process only."""
+    return QueBROKER_LEASES
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetTokenBucket(name: str, rate: float, capacity: float = 1.0) -> TokenBucket:
+    """Returns the token bucket of a rate limit, creates it on the first call. Called in the broker process only.\n
+    - -> | <name> Metrics name of the bucket\n
+    - -> | <rate> Allowed requests per second of all workers together\n
+    - -> | <capacity> Allowed burst of requests of all workers together"""
+
+    with LckBROKER_BUCKETS:
+        if name not in BROKER_BUCKETS:
+            BROKER_BUCKETS[name] = TokenBucket(name=name, rate=rate, capacity=capacity)
+        return BROKER_BUCKETS[name]
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetWorkerId(pid: int | None = None) -> tuple[str, int]:
+    """Returns the ID of a worker process on this host, which it reports with the jobs it takes.\n
+    - -> | <pid> Process ID of the worker, None for the current process\n
+    - <- | <return> Tuple: host name, process ID"""
+
+    return (gethostname(), getpid() if pid is None else pid)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class BrokerManager(BaseManager):
+    """Manager serving a job queue, a result queue and shared token buckets over TCP from a separate broker process.\n
+    Worker processes on the same or other hosts connect to it with the same address and authkey. The authkey
+    authenticates connections, as payloads are pickled and unpickling data from untrusted peers isn't safe."""
+
+
+BrokerManager.register("GetJobQueue", callable=GetJobQueue)
+BrokerManager.register("GetResultQueue", callable=GetResultQueue)
+BrokerManager.register("GetLeaseQueue", callable=GetLeaseQueue)
+BrokerManager.register("GetTokenBucket", callable=GetTokenBucket)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def StartBroker(address: tuple[str, int] = ("127.0.0.1", 0), authkey: bytes = b"") -> BrokerManager:
+    """Starts a broker process serving the job and result queues.\n
+    - -> | <address> Host and port to listen on, port 0 picks a free port\n
+    - -> | <authkey> Key workers have to authenticate with\n
+    - <- | <return> Started broker, its address attribute holds the actual address"""
+
+    # NOTE: Spawned instead of forked on all platforms, as forking a process running (logging) threads may deadlock
+    MgrBroker = BrokerManager(address=address, authkey=authkey, ctx=get_context("spawn"))
+    MgrBroker.start()
+
+    return MgrBroker
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def ConnectBroker(address: tuple[str, int], authkey: bytes, timeout: float = 60.0) -> BrokerManager:
+    """Connects to a running broker, retrying until it is reachable, so workers may start before the coordinator.\n
+    - -> | <address> Host and port of the broker\n
+    - -> | <authkey> Key to authenticate with\n
+    - -> | <timeout> Time [s] to keep retrying, raises ConnectionError afterwards\n
+    - <- | <return> Connected broker"""
+
+    deadline = monotonic() + timeout
+    while True:
+        MgrBroker = BrokerManager(address=address, authkey=authkey)
+        try:
+            MgrBroker.connect()
+            return MgrBroker
+        except ConnectionRefusedError:
+            if monotonic() >= deadline:
+                raise ConnectionError(f"Broker <{address[0]}:{address[1]}> not reachable after {timeout} s!")
+            sleep(0.5)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Report the jobs taken on the lease queue
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def RunWorker(MgrBroker: BrokerManager, handler: Callable[[Any], Any], EvtStop: Event | None = None) -> int:
+    """Pulls jobs from the broker and pushes the handler's results until the stop signal or the broker shuts down.\n
+    Exceptions of the handler are pushed as error message for the job, so a single failing job doesn't stop the worker.
+    Each job taken is reported on the lease queue, so the coordinator can requeue it if the worker dies.\n
+    - -> | <MgrBroker> Connected or started broker\n
+    - -> | <handler> Function called with the payload of each job, its result has to be picklable\n
+    - -> | <EvtStop> Event to stop the worker in between jobs\n
+    - <- | <return> Number of processed jobs"""
+
+    QueJobs = MgrBroker.GetJobQueue()
+    QueResults = MgrBroker.GetResultQueue()
+    QueLeases = MgrBroker.GetLeaseQueue()
+    worker_id = GetWorkerId()
+    jobs_count = 0
+
+    try:
+        while EvtStop is None or not EvtStop.is_set():
+            try:
+                job = QueJobs.get(timeout=1)
+            except Empty:
+                continue
+
+            # Put the stop signal back on the queue to stop other workers
+            if job is None:
+                QueJobs.put(None)
+                break
+
+            job_id, payload = job
+            QueLeases.put((job_id, worker_id))
+            try:
+                result, error = handler(payload), None
+            except Exception as Error:
+                LogLOGGER.error(f"Job <{job_id}> failed: <{Error!r}>.")
+                result, error = None, repr(Error)
+            QueResults.put((job_id, result, error))
+            jobs_count += 1
+    # The broker shut down, i.e. the coordinator finished or was cancelled
+    except (EOFError, ConnectionError) as Error:
+        LogLOGGER.info(f"Broker connection closed: <{Error!r}>.")
+
+    return jobs_count
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class JobTracker:
+    """Puts jobs on the broker and tracks them until their result arrives, used by the coordinator.\n
+    Workers report the jobs they take on the lease queue (s. RunWorker()). A job whose worker died or didn't return a
+    result within <timeout> is put back on the job queue. After <max_attempts> attempts it is failed instead, so a job
+    killing its workers doesn't kill all of them. Late results of requeued jobs are dropped."""
+
+    def __init__(
+        self,
+        MgrBroker: BrokerManager,
+        timeout: float = JOB_TIMEOUT,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        IsWorkerDead: Callable[[tuple[str, int]], bool] | None = None,
+    ):
+        """- -> | <MgrBroker> Started broker\n
+        - -> | <timeout> Time [s] a worker may take for a job before it is put back on the job queue\n
+        - -> | <max_attempts> Number of workers a job is handed to before it is failed\n
+        - -> | <IsWorkerDead> Function checking if the worker of a worker ID died, None only detects timeouts"""
+
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.IsWorkerDead = IsWorkerDead
+        self._QueJobs = MgrBroker.GetJobQueue()
+        self._QueResults = MgrBroker.GetResultQueue()
+        self._QueLeases = MgrBroker.GetLeaseQueue()
+        self._pending: dict[Hashable, Any] = {}
+        self._attempts: dict[Hashable, int] = {}
+        self._leases: dict[Hashable, tuple[tuple[str, int], float]] = {}
+        self._failed: list[tuple[Hashable, None, str]] = []
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def Put(self, job_id: Hashable, payload: Any):
+        """Puts a job on the job queue.\n
+        - -> | <job_id> Unique ID of the job\n
+        - -> | <payload> Payload passed to the workers' handler"""
+
+        self._pending[job_id] = payload
+        self._attempts[job_id] = 0
+        self._QueJobs.put((job_id, payload))
+
+    def Get(self, timeout: float = 1.0) -> tuple[Hashable, Any, str | None]:
+        """Returns the next result of a pending job, failed jobs are returned with an error message.\n
+        - -> | <timeout> Time [s] to wait for a result, raises queue.Empty afterwards\n
+        - <- | <return> Tuple: job ID, result, error message or None"""
+
+        self._CheckLeases()
+        if self._failed:
+            return self._Done(*self._failed.pop(0))
+
+        deadline = monotonic() + timeout
+        while True:
+            try:
+                job_id, result, error = self._QueResults.get(timeout=max(deadline - monotonic(), 0))
+            except Empty:
+                self._CheckLeases()
+                if self._failed:
+                    return self._Done(*self._failed.pop(0))
+                raise
+            if job_id in self._pending:
+                return self._Done(job_id, result, error)
+
+    def _Done(self, job_id: Hashable, result: Any, error: str | None) -> tuple[Hashable, Any, str | None]:
+        self._pending.pop(job_id, None)
+        self._attempts.pop(job_id, None)
+        self._leases.pop(job_id, None)
+        return (job_id, result, error)
+
+    def _CheckLeases(self):
+        """Collects the leases of pending jobs and requeues or fails the jobs of dead or timed out workers."""
+
+        while True:
+            try:
+                job_id, worker_id = self._QueLeases.get_nowait()
+            except Empty:
+                break
+            # Leases of requeued jobs and of jobs of former files are dropped as well
+            if job_id in self._pending:
+                self._attempts[job_id] += 1
+                self._leases[job_id] = (worker_id, monotonic())
+
+        for job_id, (worker_id, started) in list(self._leases.items()):
+            if self.IsWorkerDead is not None and self.IsWorkerDead(worker_id):
+                reason = f"Worker <{worker_id[0]}:{worker_id[1]}> died"
+            elif monotonic() - started > self.timeout:
+                reason = f"Worker <{worker_id[0]}:{worker_id[1]}> timed out after {self.timeout:.0f} s"
+            else:
+                continue
+
+            del self._leases[job_id]
+            if self._attempts[job_id] < self.max_attempts:
+                LogLOGGER.warning(f"{reason} on job <{job_id}>, putting it back on the job queue.")
+                self._QueJobs.put((job_id, self._pending[job_id]))
+            else:
+                LogLOGGER.error(f"{reason} on job <{job_id}> after {self._attempts[job_id]} attempt(s), failing it.")
+                self._failed.append((job_id, None, f"{reason}!"))
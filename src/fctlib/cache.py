@@ -0,0 +1,145 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import cpu_count, get_context
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+from src.fctlib.logging import AttachProcessLogQueue, GetProcessLogQueue, LogLOGGER
+from src.fctlib.metrics import RegMETRICS
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.2     Loader processes forward their log records to this process
+# ++ 26-10-19    fJ      1.1     Added Preload() to load files in parallel processes
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class FileCache:
+    """Thread-safe, least recently used cache of values loaded from files, i.e. parsed spreadsheets.\n
+    Entries are keyed by the resolved file path and the loader arguments and hold the file size and modification time
+    at load time. A file that changed since gets loaded again. Hits, misses and files loaded in parallel are counted as
+    <name>.hits, <name>.misses and <name>.preloads in RegMETRICS."""
+
+    def __init__(self, name: str, max_entries: int = 64):
+        """- -> | <name> Metrics name of the cache\n
+        - -> | <max_entries> Number of entries to keep, the least recently used entry is dropped first"""
+
+        self.name = name
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._entries: OrderedDict[tuple[Hashable, ...], tuple[tuple[int, int], Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def Clear(self):
+        """Drops all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def _GetKey(
+        self, PthFile: Path, loader: Callable[..., Any], args: tuple[Hashable, ...]
+    ) -> tuple[tuple[Hashable, ...], tuple[int, int]]:
+        """Returns the cache key and the current version (size, modification time) of a file."""
+
+        stat = PthFile.stat()
+        return (str(PthFile), loader.__qualname__, *args), (stat.st_size, stat.st_mtime_ns)
+
+    def _IsCached(self, key: tuple[Hashable, ...], version: tuple[int, int]) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry is not None and entry[0] == version
+
+    def _Store(self, key: tuple[Hashable, ...], version: tuple[int, int], value: Any):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def GetOrLoad(self, PthFile: Path, loader: Callable[..., Any], *args: Hashable) -> Any:
+        """Returns the cached value of a file or loads and caches it if the file is new or changed.\n
+        - -> | <PthFile> Path to the file\n
+        - -> | <loader> Function called with the file path and args to load the value, exceptions aren't cached\n
+        - -> | <args> Further hashable arguments of the loader, part of the cache key\n
+        - <- | <return> Cached or loaded value"""
+
+        PthFile = PthFile.resolve()
+        key, version = self._GetKey(PthFile, loader, args)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                RegMETRICS.GetCounter(f"{self.name}.hits").Increment()
+                return entry[1]
+
+        RegMETRICS.GetCounter(f"{self.name}.misses").Increment()
+        if entry is not None:
+            LogLOGGER.debug(f"<{PthFile.name}> changed since it was cached, loading it again.")
+        value = loader(PthFile, *args)
+        self._Store(key, version, value)
+
+        return value
+
+    def Preload(
+        self,
+        file_paths: list[Path],
+        loader: Callable[..., Any],
+        *args: Hashable,
+        max_workers: int = 8,
+        min_bytes: int = 0,
+    ) -> int:
+        """Loads the files that aren't cached yet in parallel processes, i.e. for CPU-bound parsing, so the following
+        GetOrLoad() calls are hits. Files that fail to load are skipped, GetOrLoad() loads them again and raises.\n
+        - -> | <file_paths> List of file paths\n
+        - -> | <loader> Function like for GetOrLoad(), has to be picklable (defined at module level)\n
+        - -> | <args> Further hashable arguments of the loader, have to be picklable\n
+        - -> | <max_workers> Maximum number of processes, limited to the number of CPUs and files to load\n
+        - -> | <min_bytes> Total size [bytes] of the files to load below which starting processes isn't worth it\n
+        - <- | <return> Number of loaded files, 0 if they weren't loaded in parallel"""
+
+        misses: dict[tuple[Hashable, ...], tuple[Path, tuple[int, int]]] = {}
+        for PthFile in file_paths:
+            try:
+                PthFile = PthFile.resolve()
+                key, version = self._GetKey(PthFile, loader, args)
+            # GetOrLoad() raises it
+            except OSError:
+                continue
+            if not self._IsCached(key, version):
+                misses[key] = (PthFile, version)
+
+        # Loading more files than the cache keeps would drop files loaded before
+        misses = dict(list(misses.items())[: self.max_entries])
+        max_workers = min(max_workers, cpu_count(), len(misses))
+        if max_workers < 2 or sum(version[0] for _, version in misses.values()) < min_bytes:
+            return 0
+
+        LogLOGGER.info(f"Loading {len(misses)} files in {max_workers} processes ...")
+        loaded_count = 0
+        # NOTE: Spawned instead of forked on all platforms, as forking a process running (logging) threads may deadlock
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=get_context("spawn"),
+            initializer=AttachProcessLogQueue,
+            initargs=(GetProcessLogQueue(),),
+        ) as Executor:
+            futures: dict[tuple[Hashable, ...], tuple[Future, tuple[int, int]]] = {
+                key: (Executor.submit(loader, PthFile, *args), version) for key, (PthFile, version) in misses.items()
+            }
+            # Stored in the order of file_paths, independent of which process finishes first
+            for key, (FtrLoad, version) in futures.items():
+                try:
+                    self._Store(key, version, FtrLoad.result())
+                    loaded_count += 1
+                except Exception as Error:
+                    LogLOGGER.debug(f"Preloading <{misses[key][0].name}> failed: <{Error!r}>.")
+
+        RegMETRICS.GetCounter(f"{self.name}.preloads").Increment(loaded_count)
+        return loaded_count
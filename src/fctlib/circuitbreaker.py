@@ -0,0 +1,154 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from collections import deque
+from threading import Lock
+from time import monotonic
+
+from src.fctlib.logging import LogLOGGER
+from src.fctlib.metrics import RegMETRICS
+from src.settings import BREAKER_FAILURE_RATE, BREAKER_MIN_CALLS, BREAKER_OPEN_TIME, BREAKER_WINDOW
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+CLOSED = "closed"
+"""State of a circuit breaker letting all calls pass."""
+OPEN = "open"
+"""State of a circuit breaker rejecting all calls."""
+HALF_OPEN = "half-open"
+"""State of a circuit breaker letting a single probe call pass."""
+
+LckBREAKERS = Lock()
+"""Lock of the circuit breakers dictionary."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class CircuitBreaker:
+    """Thread-safe circuit breaker of a web service, so a degraded service isn't queried for every chemical.\n
+    The outcomes of the latest <window> calls are kept. Once they hold at least <min_calls> calls and at least
+    <failure_rate> of them failed, the breaker opens and rejects calls. After <open_time> it lets a single probe call
+    pass (half-open): a successful probe closes the breaker, a failed probe opens it again. Openings and rejected calls
+    are counted as breaker.<name>.opened and breaker.<name>.rejected in RegMETRICS."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = BREAKER_FAILURE_RATE,
+        window: int = BREAKER_WINDOW,
+        min_calls: int = BREAKER_MIN_CALLS,
+        open_time: float = BREAKER_OPEN_TIME,
+    ):
+        """- -> | <name> Name of the web service\n
+        - -> | <failure_rate> Share of failed calls [0..1] that opens the breaker\n
+        - -> | <window> Number of latest calls the failure rate is taken from\n
+        - -> | <min_calls> Number of calls needed in the window before the breaker may open\n
+        - -> | <open_time> Time [s] the breaker rejects calls before letting a probe call pass"""
+
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_time = open_time
+        self._lock = Lock()
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state = CLOSED
+        self._changed = monotonic()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def Reset(self):
+        """Closes the breaker and forgets all outcomes, i.e. for a new run."""
+        with self._lock:
+            self._outcomes.clear()
+            self._SetState(CLOSED)
+
+    def _SetState(self, state: str):
+        self._state = state
+        self._changed = monotonic()
+
+    def Allow(self) -> bool:
+        """Checks if a call may pass. Every allowed call has to be followed by RecordSuccess() or RecordFailure().\n
+        - <- | <return> True if the call may pass, False if it has to be skipped"""
+
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            # A probe that never reported back doesn't keep the breaker half-open forever
+            if monotonic() - self._changed >= self.open_time:
+                if self._state == OPEN:
+                    LogLOGGER.info(f"Probing <{self.name}> after {self.open_time:.0f} s ...")
+                self._SetState(HALF_OPEN)
+                return True
+
+        RegMETRICS.GetCounter(f"breaker.{self.name}.rejected").Increment()
+        return False
+
+    def RecordSuccess(self):
+        """Records a successful call, i.e. the service responded."""
+
+        with self._lock:
+            if self._state == HALF_OPEN:
+                LogLOGGER.userinfo(f"<{self.name}> is available again, resuming queries ...")
+                self._outcomes.clear()
+                self._SetState(CLOSED)
+            self._outcomes.append(True)
+
+    def RecordFailure(self):
+        """Records a failed call, i.e. the service failed after all retries."""
+
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._SetState(OPEN)
+                LogLOGGER.warning(f"<{self.name}> is still unavailable, skipping it for {self.open_time:.0f} s ...")
+                return
+
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (
+                self._state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._SetState(OPEN)
+                RegMETRICS.GetCounter(f"breaker.{self.name}.opened").Increment()
+                LogLOGGER.warning(
+                    f"<{self.name}> failed {failures} of the latest {len(self._outcomes)} queries, skipping it for "
+                    f"{self.open_time:.0f} s ..."
+                )
+
+
+BREAKERS: dict[str, CircuitBreaker] = {}
+"""Circuit breakers of the process by web service name, s. GetCircuitBreaker()."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetCircuitBreaker(name: str) -> CircuitBreaker:
+    """Returns the circuit breaker of a web service, creates it if it doesn't exist yet.\n
+    - -> | <name> Name of the web service\n
+    - <- | <return> Circuit breaker"""
+
+    with LckBREAKERS:
+        return BREAKERS.setdefault(name, CircuitBreaker(name=name))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def ResetCircuitBreakers():
+    """Closes all circuit breakers, i.e. for a new run, so a service failing in the last run gets queried again."""
+
+    with LckBREAKERS:
+        for Breaker in BREAKERS.values():
+            Breaker.Reset()
@@ -0,0 +1,167 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from numbers import Integral, Real
+from typing import Any, Mapping, Sequence
+
+from numpy import array, empty, float64, full, int32, int64, nan, ndarray, zeros
+from pandas import Categorical, DataFrame, Series
+from pandas.arrays import IntegerArray
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+CODE_MISSING = -1
+"""Code of empty cells (None)."""
+CODE_NUMBER = -2
+"""Code of cells holding a number in the typed number array of the column."""
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+"""Range of integers that fit into int64 arrays, larger integers are stored as strings."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class ColumnarColumn:
+    """Single column of a ColumnarBuffer. Each cell holds a code: CODE_MISSING, CODE_NUMBER or the position of its value
+    in the categories. Numbers are stored in a typed array, int64 until the first float turns it into float64.\n
+    Once more than half of the rows hold distinct strings (i.e. links or timestamps), strings aren't looked up anymore,
+    as the lookup would take more memory than it saves."""
+
+    def __init__(self, rows_count: int):
+        """- -> | <rows_count> Number of rows"""
+
+        self.codes = full(rows_count, CODE_MISSING, dtype=int32)
+        self.categories: list[str] = []
+        self.numbers: ndarray | None = None
+        self._lookup: dict[str, int] | None = {}
+
+    def Set(self, row_no: int, value: Any):
+        """Sets the value of a cell, values that are neither None nor numbers are stored as strings.\n
+        - -> | <row_no> Row number, 0-based\n
+        - -> | <value> Value"""
+
+        if type(value) is str:
+            self._SetString(row_no, value)
+        elif value is None:
+            self.codes[row_no] = CODE_MISSING
+        # Booleans are numbers to Python, but they are written as True/False and not as 1/0
+        elif isinstance(value, Real) and not isinstance(value, bool) and (
+            not isinstance(value, Integral) or INT64_MIN <= value <= INT64_MAX
+        ):
+            if self.numbers is None:
+                self.numbers = zeros(len(self.codes), dtype=int64)
+            if not isinstance(value, Integral) and self.numbers.dtype == int64:
+                self.numbers = self.numbers.astype(float64)
+            self.numbers[row_no] = value
+            self.codes[row_no] = CODE_NUMBER
+        else:
+            self._SetString(row_no, str(value))
+
+    def _SetString(self, row_no: int, value: str):
+        code = self._lookup.get(value) if self._lookup is not None else None
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            if self._lookup is not None:
+                self._lookup[value] = code
+                if len(self._lookup) > len(self.codes) // 2:
+                    self._lookup = None
+        self.codes[row_no] = code
+
+    def Get(self, row_no: int) -> Any:
+        """Returns the value of a cell.\n
+        - -> | <row_no> Row number, 0-based\n
+        - <- | <return> Value"""
+
+        code = self.codes[row_no]
+        if code == CODE_MISSING:
+            return None
+        if code == CODE_NUMBER:
+            return self.numbers[row_no].item()
+        return self.categories[code]
+
+    def ToSeries(self, name: str) -> Series:
+        """Returns the column as pandas series without copying the typed arrays where possible: numbers only as int64
+        or float64 (nullable Int64 with empty cells), repeated strings only as categorical, others as objects.\n
+        - -> | <name> Name of the series\n
+        - <- | <return> Series"""
+
+        is_missing = self.codes == CODE_MISSING
+        is_number = self.codes == CODE_NUMBER
+        has_categories = not (is_missing | is_number).all()
+
+        if self.numbers is not None and not has_categories:
+            if not is_missing.any():
+                return Series(self.numbers, name=name, copy=False)
+            if self.numbers.dtype == int64:
+                return Series(IntegerArray(self.numbers, is_missing), name=name, copy=False)
+            numbers = self.numbers.copy()
+            numbers[is_missing] = nan
+            return Series(numbers, name=name, copy=False)
+
+        # Categories are only unique as long as strings are looked up
+        if self.numbers is None and has_categories and self._lookup is not None:
+            return Series(Categorical.from_codes(self.codes, categories=self.categories), name=name, copy=False)
+
+        values = empty(len(self.codes), dtype=object)
+        if has_categories:
+            is_category = ~(is_missing | is_number)
+            values[is_category] = array(self.categories, dtype=object)[self.codes[is_category]]
+        if self.numbers is not None:
+            values[is_number] = self.numbers[is_number].tolist()
+        return Series(values, name=name, copy=False)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class ColumnarBuffer:
+    """Column-wise buffer of records with a fixed number of rows, i.e. the compound datasets of an input file.\n
+    Strings are stored once per column and referenced by integer codes, so repeated values like NOT_LISTED or status
+    messages don't take memory per row, and numbers like masses and counts are stored in typed arrays. Rows can be set
+    in any order, rows that are never set stay empty (None)."""
+
+    def __init__(self, fields: Sequence[str], rows_count: int):
+        """- -> | <fields> Field names of the records, i.e. the fields of a named tuple constructor\n
+        - -> | <rows_count> Number of rows"""
+
+        self.fields = tuple(fields)
+        self._columns = [ColumnarColumn(rows_count) for _ in self.fields]
+        self._rows_count = rows_count
+
+    def __len__(self) -> int:
+        return self._rows_count
+
+    def SetRow(self, row_no: int, record: Sequence[Any] | Mapping[str, Any]):
+        """Sets the values of a row.\n
+        - -> | <row_no> Row number, 0-based\n
+        - -> | <record> Values in the order of the fields (i.e. a named tuple) or by field name, missing fields are
+        empty"""
+
+        if isinstance(record, Mapping):
+            record = [record.get(field) for field in self.fields]
+
+        for Column, value in zip(self._columns, record):
+            Column.Set(row_no, value)
+
+    def GetRow(self, row_no: int) -> tuple[Any, ...]:
+        """Returns the values of a row in the order of the fields.\n
+        - -> | <row_no> Row number, 0-based\n
+        - <- | <return> Values, None for empty cells"""
+
+        return tuple(Column.Get(row_no) for Column in self._columns)
+
+    def ToDataFrame(self) -> DataFrame:
+        """Returns the buffer as pandas dataframe with one column per field, s. ColumnarColumn.ToSeries().\n
+        - <- | <return> Dataframe"""
+
+        return DataFrame(
+            {field: Column.ToSeries(field) for field, Column in zip(self.fields, self._columns)},
+            index=range(self._rows_count),
+            copy=False,
+        )
@@ -405,6 +405,26 @@ def GetCtkVar(CtkWidget: ctk.Variable) -> Any:
     return CtkWidget.get()
 
 
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def AppendTextboxText(CtkWidget: ctk.CTkTextbox, text: str, max_lines: int):
+    """Appends text to a textbox in a single insert, trims its oldest lines and scrolls to its end.\n
+    - -> | <CtkWidget> Target textbox\n
+    - -> | <text> Text to append\n
+    - -> | <max_lines> Maximum number of lines the textbox keeps"""
+
+    CtkWidget.insert(index="end", text=text)
+
+    # NOTE: "end-1c" skips the trailing newline Tk adds to every text widget
+    line_count = int(CtkWidget.index("end-1c").split(".")[0])
+    if line_count > max_lines:
+        CtkWidget.delete(index1="1.0", index2=f"{line_count - max_lines + 1}.0")
+
+    CtkWidget.see("end")
+
+
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
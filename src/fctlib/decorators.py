@@ -1,26 +1,34 @@
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Imports
 # ++---------------------------------------------------------------------------------------------------------------------++#
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import wraps
 from logging import DEBUG, StreamHandler
-from time import sleep
+from random import uniform
+from threading import Event, Lock
+from time import perf_counter, sleep, thread_time
 from typing import Any, Callable
 
 from src.fctlib.logging import GetHandlerLevel, LogLOGGER, SetHandlerLevel
+from src.fctlib.metrics import RegMETRICS, StmMETRICS
 from src.fctlib.threads import ReturnThread
-from src.fctlib.time import GetRunTime
+from src.settings import RETRY_BUDGET_RATIO, RETRY_BUDGET_RESERVE, RETRY_MAX_DELAY
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.3     Added retry_after
 # ++ 24-02-19    fJ      0.2     Added RetryFailedException
 # ++ 24-02-15    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
 class RetryException(Exception):
-    """Custom exception that can be used to trigger a retry."""
+    """Custom exception that can be used to trigger a retry. <retry_after> is the time [s] the service asked to wait
+    before the retry (i.e. its Retry-After header), None if it didn't."""
 
-    def __init__(self, msg="Retry function call ..."):
+    def __init__(self, msg="Retry function call ...", retry_after: float | None = None):
         self.msg = msg
+        self.retry_after = retry_after
 
     def __str__(self):
         return repr(self.msg)
@@ -38,43 +46,162 @@ class RetryFailedException(Exception):
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class RetryBudget:
+    """Thread-safe retry budget of a processing run, shared by all Retry-decorated functions.\n
+    Each call deposits <ratio> tokens and each retry withdraws one, the balance is capped at <reserve>. While a service
+    fails, retries are limited to about <ratio> of the calls instead of every thread multiplying its load by the number
+    of attempts, and the budget refills once the service recovers. Waits for retries end early if the run is
+    cancelled."""
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, reserve: float = RETRY_BUDGET_RESERVE):
+        """- -> | <ratio> Tokens deposited per call, i.e. the share of calls that may be retried\n
+        - -> | <reserve> Maximum number of tokens, the budget starts full"""
+
+        self.ratio = ratio
+        self.reserve = reserve
+        self._lock = Lock()
+        self._tokens = reserve
+        self._EvtCancel: Event | None = None
+
+    def Start(self, EvtCancel: Event | None = None):
+        """Refills the budget for a new run.\n
+        - -> | <EvtCancel> Event cancelling the run, ends waits for retries"""
+
+        with self._lock:
+            self._tokens = self.reserve
+            self._EvtCancel = EvtCancel
+
+    def Deposit(self):
+        """Deposits the tokens of a call."""
+        with self._lock:
+            self._tokens = min(self.reserve, self._tokens + self.ratio)
+
+    def Withdraw(self) -> bool:
+        """Withdraws the token of a retry.\n
+        - <- | <return> True if the retry is within the budget"""
+
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def Wait(self, delay: float) -> bool:
+        """Waits for a retry.\n
+        - -> | <delay> Time [s] to wait\n
+        - <- | <return> False if the run was cancelled"""
+
+        if self._EvtCancel is None:
+            sleep(delay)
+            return True
+        return not self._EvtCancel.wait(delay)
+
+
+BdgRETRIES = RetryBudget()
+"""Retry budget shared by all Retry-decorated functions of the process, started by each processing run."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def ParseRetryAfter(value: str | None) -> float | None:
+    """Parses the Retry-After header of an HTTP response.\n
+    - -> | <value> Header value, delay in seconds or HTTP date\n
+    - <- | <return> Time [s] to wait, None if the header is missing or invalid"""
+
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      3.0     Unit test: passed
+# ++ 26-10-19    fJ      2.2     Exponential backoff with full jitter, retry budget, Retry-After, cancellation, metrics
+# ++ 26-10-19    fJ      2.1     Record failed attempts to StmMETRICS
 # ++ 24-03-04    fJ      2.0     Unit test: passed
 # ++ 24-03-04    fJ      1.1     Added prolonged delay
 # ++ 24-02-13    fJ      1.0     Unit test: passed
 # ++ 24-02-12    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
 def Retry(
-    ExcException: Exception = Exception,
+    ExcException: Exception = RetryException,
     attempts: int = 3,
-    delay: int = 1,
+    delay: float = 1,
+    max_delay: float = RETRY_MAX_DELAY,
 ) -> Callable[..., Any]:
     """Decorator for retrying function calls in case of specific exceptions.\n
     - -> | <ExcException> Exception name or tuple of names as reason for retry\n
     - -> | <attempts> Total number of tries (not retries)\n
-    - -> | <delay> Base delay [s] between tries, gets multiplied by current attempt count to prolong delay\n
+    - -> | <delay> Base delay [s] between tries, doubled per attempt\n
+    - -> | <max_delay> Maximum delay [s] between tries, also for a retry_after of the exception\n
+    The delay is drawn at random between 0 and the doubled base delay (full jitter), so threads failing at the same
+    time don't retry at the same time. A retry_after of the exception (s. RetryException) is waited at least, a
+    retry_after above <max_delay> isn't retried. Retries are withdrawn from BdgRETRIES and aren't made if it's
+    exhausted or the run is cancelled, RetryFailedException is raised instead.\n
+    Every failed attempt is recorded as "retry" stage including its delay, retries, their delays and the reasons to
+    give up as retry.* metrics in RegMETRICS.\n
     Source: http://www.saltycrane.com/blog/2009/11/trying-out-retry-decorator-python/"""
 
     def DecoRetry(FunctionInput: Callable[..., Any]) -> Callable[..., Any]:
         # Preserve introspection
         @wraps(wrapped=FunctionInput)
         def WrapRetry(*args: Any, **kwargs: Any) -> Any:
+            BdgRETRIES.Deposit()
             attempt = 1
-            while attempt < attempts:
-                # First (n-1) tries
+            while True:
+                start = perf_counter()
                 try:
                     return FunctionInput(*args, **kwargs)
                 except ExcException as Error:
-                    LogLOGGER.info(
-                        f"Attempt {attempt}/{attempts} for <{FunctionInput.__name__}> failed: <{Error}>! Will retry ..."
-                    )
-                    sleep(delay * attempt)
+                    if attempt >= attempts:
+                        LogLOGGER.error(f"Final attempt for <{FunctionInput.__name__}> failed: <{Error}>!")
+                        give_up = "exhausted"
+                    else:
+                        wait = uniform(0, min(max_delay, delay * 2 ** (attempt - 1)))
+                        retry_after = getattr(Error, "retry_after", None)
+                        if retry_after is not None and retry_after > max_delay:
+                            LogLOGGER.error(
+                                f"Attempt {attempt}/{attempts} for <{FunctionInput.__name__}> failed: <{Error}>! "
+                                f"Not retrying, as the service asked to wait {retry_after:.0f} s ..."
+                            )
+                            give_up = "retry_after"
+                        elif not BdgRETRIES.Withdraw():
+                            LogLOGGER.error(
+                                f"Attempt {attempt}/{attempts} for <{FunctionInput.__name__}> failed: <{Error}>! "
+                                "Not retrying, as the retry budget is exhausted ..."
+                            )
+                            give_up = "budget"
+                        else:
+                            wait = max(wait, retry_after or 0.0)
+                            LogLOGGER.info(
+                                f"Attempt {attempt}/{attempts} for <{FunctionInput.__name__}> failed: <{Error}>! "
+                                f"Will retry in {wait:.2f} s ..."
+                            )
+                            RegMETRICS.GetCounter("retry.retries").Increment()
+                            RegMETRICS.GetHistogram("retry.delay").Observe(wait)
+                            give_up = None if BdgRETRIES.Wait(wait) else "cancelled"
+
+                    StmMETRICS.Record("retry", perf_counter() - start, function=FunctionInput.__name__, attempt=attempt)
+                    if give_up is not None:
+                        RegMETRICS.GetCounter(f"retry.given_up.{give_up}").Increment()
+                        raise RetryFailedException()
                     attempt += 1
-            # Final try
-            try:
-                return FunctionInput(*args, **kwargs)
-            except ExcException as Error:
-                LogLOGGER.error(f"Final attempt for <{FunctionInput.__name__}> failed: <{Error}>!")
-                raise RetryFailedException()
 
         return WrapRetry
 
@@ -114,22 +241,45 @@ def DebugLogging(FunctionInput: Callable[..., Any]) -> Callable[..., Any]:
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      2.0     Unit test: passed
+# ++ 26-10-19    fJ      1.1     Record call durations and errors to RegMETRICS instead of logging them at INFO
 # ++ 24-02-13    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-12    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def Timer(FunctionInput: Callable[..., Any]) -> Callable[..., Any]:
-    """Decorator for logging execution and process time of a function."""
+def Timer(FunctionInput: Callable[..., Any] | None = None, *, name: str | None = None) -> Callable[..., Any]:
+    """Decorator for recording execution and CPU time of a function. Use as >>@Timer<< or >>@Timer(name="...")<<.\n
+    - -> | <name> Metrics name, defaults to the function name\n
+    Per call, the execution time [s] is observed as <name>, the thread's CPU time [s] as <name>.cpu and exceptions are
+    counted as <name>.errors in RegMETRICS."""
 
-    # Preserve introspection
-    @wraps(wrapped=FunctionInput)
-    def WrapTimer(*args: Any, **kwargs: Any) -> Any:
-        # Measure functions execution and process time and return result
-        timer = GetRunTime()
-        result = FunctionInput(*args, **kwargs)
-        GetRunTime(timer)
-        return result
+    def DecoTimer(FunctionInput: Callable[..., Any]) -> Callable[..., Any]:
+        metrics_name = name or FunctionInput.__name__
+        HstWallTime = RegMETRICS.GetHistogram(metrics_name)
+        HstCpuTime = RegMETRICS.GetHistogram(f"{metrics_name}.cpu")
+
+        # Preserve introspection
+        @wraps(wrapped=FunctionInput)
+        def WrapTimer(*args: Any, **kwargs: Any) -> Any:
+            # Measure functions execution and CPU time and return result
+            wall_start, cpu_start = perf_counter(), thread_time()
+            try:
+                return FunctionInput(*args, **kwargs)
+            except Exception:
+                RegMETRICS.GetCounter(f"{metrics_name}.errors").Increment()
+                raise
+            finally:
+                wall_time, cpu_time = perf_counter() - wall_start, thread_time() - cpu_start
+                HstWallTime.Observe(wall_time)
+                HstCpuTime.Observe(cpu_time)
+                LogLOGGER.debug("<%s> took %.4f s (CPU time: %.4f s)", metrics_name, wall_time, cpu_time)
+
+        return WrapTimer
+
+    # Called as @Timer without arguments
+    if FunctionInput is not None:
+        return DecoTimer(FunctionInput)
 
-    return WrapTimer
+    return DecoTimer
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
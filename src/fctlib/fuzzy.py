@@ -0,0 +1,265 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from collections import Counter
+from math import ceil
+from re import IGNORECASE, compile
+from typing import NamedTuple
+
+from src.fctlib.logging import LogLOGGER
+from src.fctlib.metrics import RegMETRICS
+from src.fctlib.ranking import NormaliseName
+from src.fctlib.synonyms import SynonymIndex
+from src.settings import FUZZY_MIN_SCORE
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+RepCONCENTRATION = compile(
+    r"(?<![\w-])(?:ca\.?\s*|approx\.?\s*|>=?\s*|<=?\s*|≥\s*|≤\s*)?\d+(?:[.,]\d+)?(?:\s*-\s*\d+(?:[.,]\d+)?)?\s*"
+    r"(?:%|vol\.?\s*-?\s*%|gew\.?\s*-?\s*%|wt\.?\s*-?\s*%|mol/l|mmol/l|g/l|mg/l|ppm|m|n)"
+    r"(?:\s*\(?\s*[wvm]\s*/\s*[wvm]\s*\)?)?(?!\w)",
+    IGNORECASE,
+)
+"""Concentration pattern within an inventory name, i.e. "96%", "37 % (w/w)", "0,1 M" or "95-97 %"."""
+RepGRADE = compile(
+    r"(?<!\w)(?:"
+    + "|".join(
+        [
+            r"techn(?:isch)?",
+            r"tech(?:nical)?",
+            r"reinst",
+            r"rein",
+            r"p\.?\s*a",
+            r"puriss",
+            r"purum",
+            r"(?:extra\s+)?pure",
+            r"zur\s+analyse",
+            r"for\s+analysis",
+            r"zur\s+synthese",
+            r"for\s+synthesis",
+            r"hplc",
+            r"gc",
+            r"acs",
+            r"reagent",
+            r"ph\.?\s*eur",
+            r"usp",
+            r"dab",
+            r"vergällt",
+            r"denaturiert",
+            r"denatured",
+            r"absolut",
+            r"abs",
+            r"wasserfrei",
+            r"anhydrous",
+        ]
+    )
+    + r")\.?(?!\w)",
+    IGNORECASE,
+)
+"""Grade and purity pattern within an inventory name, i.e. "techn.", "p.a." or "Ph. Eur."."""
+RepLEFTOVERS = compile(r"\(\s*[,;/]?\s*\)|\s{2,}")
+"""Pattern of empty brackets and repeated whitespace left over from removing concentrations and grades."""
+RepMARKERS = compile(
+    r"\d+|"
+    + "|".join(
+        sorted(
+            [
+                *["mono", "di", "tri", "tetra", "penta", "hexa", "hepta", "octa", "nona", "deca", "bis", "tris"],
+                *["meth", "eth", "prop", "but", "pent", "hex", "hept", "oct", "non", "dec"],
+                *["iso", "neo", "sec", "tert", "cyclo", "ortho", "meta", "para"],
+            ],
+            key=len,
+            reverse=True,
+        )
+    )
+)
+"""Pattern of the parts of a normalised name telling isomers and homologues apart: Locants, multiplying prefixes,
+chain lengths and isomer prefixes, i.e. "1,2-" and "1,3-Dichlorbenzol" or "Methyl-" and "Ethylacetat"."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def CleanName(name: str) -> str:
+    """Returns an inventory name without concentrations and grades, i.e. "Aceton techn." -> "Aceton" and
+    "Ethanol 96%" -> "Ethanol".\n
+    - -> | <name> Inventory name\n
+    - <- | <return> Cleaned name, the stripped name if nothing else is left"""
+
+    cleaned = RepGRADE.sub(" ", RepCONCENTRATION.sub(" ", name))
+    # Empty brackets may be nested, i.e. "(techn. (96%))"
+    while (removed := RepLEFTOVERS.sub(lambda match: " " if match.group().isspace() else "", cleaned)) != cleaned:
+        cleaned = removed
+    cleaned = cleaned.strip(" ,;:/-")
+
+    return cleaned if NormaliseName(cleaned) else name.strip()
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetTrigrams(name: str) -> Counter[str]:
+    """Returns the character trigrams of a normalised name, padded so its start and end count more.\n
+    - -> | <name> Normalised name, s. NormaliseName()\n
+    - <- | <return> Counter of trigrams"""
+
+    padded = f"##{name}#"
+    return Counter(padded[index : index + 3] for index in range(len(padded) - 2))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetMarkers(name: str) -> list[str]:
+    """Returns the parts of a normalised name telling isomers and homologues apart, s. RepMARKERS. Similar names with
+    other markers are different chemicals, i.e. "12dichlorbenzol" and "13dichlorbenzol".\n
+    - -> | <name> Normalised name, s. NormaliseName()\n
+    - <- | <return> List of markers in order of appearance"""
+
+    return RepMARKERS.findall(name)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class NameMatch(NamedTuple):
+    """Result of NameMatcher.Match()."""
+
+    term: str
+    """Query term to use, the cleaned name."""
+    cas_no: str | None
+    """CAS number of the matched indexed name, None if no name matched."""
+    confidence: float
+    """Similarity [0..1] of the cleaned name to the matched name, 1 for an exact match, 0 if no name matched. Only
+    exact matches identify the chemical, similar ones are suggestions to check."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Don't match names with other locants or prefixes, Rewrite() returns the name match
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class NameMatcher:
+    """Matches messy inventory names to the names of a synonym index before they are queried.\n
+    A name is cleaned from concentrations and grades (s. CleanName()) and looked up in the index. If it isn't indexed,
+    it is compared to the indexed names by the Dice coefficient of their character trigrams. Only names sharing one of
+    the name's rarest trigrams (found via an inverted trigram index) can reach <min_score>, so only they are compared.
+    Names with other locants or prefixes (s. GetMarkers()) never match, as isomers and homologues have similar names.
+    The best match counts if it scores at least <min_score> and no other CAS number scores the same.
+    The index' names are read once on creation, the trigram index is built on the first similarity search. Matches are
+    counted as fuzzy.exact, fuzzy.cleaned, fuzzy.similar and
+    fuzzy.unmatched in RegMETRICS, the confidence of similar matches is observed as fuzzy.confidence."""
+
+    def __init__(self, index: SynonymIndex, min_score: float = FUZZY_MIN_SCORE):
+        """- -> | <index> Synonym index to match names against\n
+        - -> | <min_score> Minimum similarity [0..1] of a similar match"""
+
+        self.min_score = min_score
+        self._names = index.GetNames()
+        self._keys = list(self._names)
+        self._postings: dict[str, list[int]] | None = None
+
+    def _BuildPostings(self):
+        """Builds the inverted trigram index: Numbers of the indexed names per trigram."""
+
+        self._postings = {}
+        for key_no, key in enumerate(self._keys):
+            for trigram in GetTrigrams(key):
+                self._postings.setdefault(trigram, []).append(key_no)
+
+    def _GetSimilar(self, key: str) -> tuple[str | None, float]:
+        """Returns the CAS number and the similarity of the most similar indexed name, None if it isn't unique."""
+
+        if self._postings is None:
+            self._BuildPostings()
+
+        trigrams = GetTrigrams(key)
+        size = sum(trigrams.values())
+        # A name reaching min_score shares at least min_shared trigrams, so it shares one of any size - min_shared + 1
+        # trigrams. Taking the rarest ones keeps the candidates few.
+        min_shared = ceil(self.min_score * size / (2 - self.min_score))
+        candidates: set[int] = set()
+        covered = 0
+        for trigram in sorted(trigrams, key=lambda trigram: len(self._postings.get(trigram, ()))):
+            candidates.update(self._postings.get(trigram, ()))
+            covered += trigrams[trigram]
+            if covered > size - min_shared:
+                break
+
+        # Names of too different length can't reach min_score either, a name has one trigram more than characters
+        min_size, max_size = min_shared, size * (2 - self.min_score) / self.min_score
+        markers = None
+        best_cas_no, best_score = None, 0.0
+        for key_no in candidates:
+            if not min_size <= len(self._keys[key_no]) + 1 <= max_size:
+                continue
+            key_trigrams = GetTrigrams(self._keys[key_no])
+            shared = sum((trigrams & key_trigrams).values())
+            score = 2 * shared / (size + sum(key_trigrams.values()))
+            if score < self.min_score or score < best_score:
+                continue
+            # Compare the markers of close names only, most candidates are dropped by their score already
+            markers = GetMarkers(key) if markers is None else markers
+            if GetMarkers(self._keys[key_no]) != markers:
+                continue
+            cas_no = self._names[self._keys[key_no]]
+            if score > best_score:
+                best_cas_no, best_score = cas_no, score
+            # Equally similar names of another chemical make the match ambiguous
+            elif score == best_score and cas_no != best_cas_no:
+                best_cas_no = None
+
+        return best_cas_no, best_score
+
+    def Match(self, name: str) -> NameMatch:
+        """Matches an inventory name to the indexed names.\n
+        - -> | <name> Inventory name\n
+        - <- | <return> Name match"""
+
+        cas_no = self._names.get(NormaliseName(name))
+        if cas_no is not None:
+            RegMETRICS.GetCounter("fuzzy.exact").Increment()
+            return NameMatch(term=name, cas_no=cas_no, confidence=1.0)
+
+        term = CleanName(name)
+        key = NormaliseName(term)
+        cas_no = self._names.get(key)
+        if cas_no is not None:
+            RegMETRICS.GetCounter("fuzzy.cleaned").Increment()
+            return NameMatch(term=term, cas_no=cas_no, confidence=1.0)
+
+        cas_no, score = self._GetSimilar(key) if key else (None, 0.0)
+        if cas_no is None or score < self.min_score:
+            RegMETRICS.GetCounter("fuzzy.unmatched").Increment()
+            return NameMatch(term=term, cas_no=None, confidence=0.0)
+
+        RegMETRICS.GetCounter("fuzzy.similar").Increment()
+        RegMETRICS.GetHistogram("fuzzy.confidence").Observe(score)
+        return NameMatch(term=term, cas_no=cas_no, confidence=score)
+
+    def Rewrite(self, name: str) -> NameMatch:
+        """Matches an inventory name like Match() and logs how it is rewritten, s. QueryTable.RewriteTerms().\n
+        - -> | <name> Inventory name\n
+        - <- | <return> Name match"""
+
+        match = self.Match(name)
+        if match.cas_no is not None and match.confidence < 1.0:
+            LogLOGGER.info(
+                f"<{name}> is similar to <{match.cas_no}> with a confidence of {match.confidence:.2f}, querying "
+                f"<{match.term}> by name only."
+            )
+        elif match.term != name:
+            cas_text = f"<{match.cas_no}>" if match.cas_no is not None else "no indexed name"
+            LogLOGGER.info(f"Cleaned <{name}> to <{match.term}>, matching {cas_text}.")
+
+        return match
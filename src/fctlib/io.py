@@ -90,3 +90,52 @@ def GetSupportedFilesFromPath(file_paths: list[Path], supported_extensions: dict
         return []
 
     return supported_file_paths
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetFilePathsFromPatterns(patterns: list[str]) -> list[Path]:
+    """Returns the file paths matching the given paths or glob patterns, i.e. from the command line.\n
+    - -> | <patterns> List of file paths, folder paths (all files inside) or glob patterns ("**" matches subfolders)\n
+    - <- | <return> Unique file paths sorted by file name, empty list if nothing matched"""
+
+    file_paths: dict[Path, None] = {}
+    for pattern in patterns:
+        PthPattern = Path(pattern).expanduser()
+        if PthPattern.is_dir():
+            matches = PthPattern.iterdir()
+        elif PthPattern.is_file():
+            matches = [PthPattern]
+        else:
+            anchor = Path(PthPattern.anchor) if PthPattern.is_absolute() else Path()
+            matches = anchor.glob(str(PthPattern.relative_to(anchor)))
+
+        file_paths.update((PthFile.resolve(), None) for PthFile in matches if PthFile.is_file())
+
+    if not file_paths:
+        LogLOGGER.debug(f"No files matching <{patterns}> found.")
+
+    return sorted(file_paths, key=lambda PthFile: (PthFile.name.lower(), str(PthFile)))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetShard(file_paths: list[Path], shard_no: int, shards_count: int) -> list[Path]:
+    """Returns the share of file paths to process by one of several machines, assigned round robin by file name.\n
+    Each file is part of exactly one shard, as long as all machines see the same files.\n
+    - -> | <file_paths> List of file paths\n
+    - -> | <shard_no> Number of the shard to return, 1-based\n
+    - -> | <shards_count> Total number of shards\n
+    - <- | <return> File paths of the shard"""
+
+    if not 1 <= shard_no <= shards_count:
+        raise ValueError(f"Shard <{shard_no}> is out of range 1 to {shards_count}!")
+
+    file_paths = sorted(file_paths, key=lambda PthFile: (PthFile.name.lower(), str(PthFile)))
+    return file_paths[shard_no - 1 :: shards_count]
@@ -3,11 +3,17 @@
 # ++---------------------------------------------------------------------------------------------------------------------++#
 import logging
 import sys
+from atexit import register
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from multiprocessing import current_process, get_context
+from multiprocessing.queues import Queue
+from queue import SimpleQueue
+from threading import Lock
 from traceback import extract_tb
 from types import TracebackType
 from typing import Callable
 
-from src.settings import PthLOGFILE
+from src.settings import LOG_BACKUP_COUNT, LOG_MAX_BYTES, PthLOGFILE
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -101,6 +107,44 @@ def AddCustomLoggingLevel(level_name: str, level_num: int, method_name: str | No
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class LogQueueListener(QueueListener):
+    """Queue listener that can be stopped more than once, i.e. explicitly and again on interpreter exit."""
+
+    def stop(self):
+        """Stops the listener thread after it processed all queued records, if it is still running."""
+        if self._thread is not None:
+            super().stop()
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def AttachQueueListener(LogLogger: logging.Logger, handlers: list[logging.Handler]) -> LogQueueListener:
+    """Routes all log records of a logger through a queue to a single listener thread which runs the given handlers.\n
+    Logging threads only enqueue their records, formatting and I/O are done by the listener thread.\n
+    - -> | <LogLogger> Logger to attach the queue to\n
+    - -> | <handlers> Handlers to run in the listener thread, their individual log levels are respected\n
+    - <- | <return> Started queue listener, gets stopped and flushed on interpreter exit"""
+
+    QueLogRecords = SimpleQueue()
+    LogLogger.addHandler(QueueHandler(QueLogRecords))
+
+    LstListener = LogQueueListener(QueLogRecords, *handlers, respect_handler_level=True)
+    LstListener.start()
+    register(LstListener.stop)
+
+    return LstListener
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      3.1     Child processes only log to the console until they forward to their parent process
+# ++ 26-10-19    fJ      3.0     Handlers run in a queue listener thread, FileHandler replaced by RotatingFileHandler
 # ++ 24-03-04    fJ      2.0     Dev tests: passed ... works as intended
 # ++ 24-02-25    fJ      1.2     Replaced os.path with pathlib.Path
 # ++ 24-02-16    fJ      1.1     Deleted unspecific error handling
@@ -109,10 +153,12 @@ def AddCustomLoggingLevel(level_name: str, level_num: int, method_name: str | No
 # ++ 24-02-12    fJ      0.2     Reworked
 # ++ 24-02-01    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def SetRootLogger() -> logging.Logger:
+def SetRootLogger() -> tuple[logging.Logger, LogQueueListener]:
     """Creates and configures the root logger for the app. Logs are written to the console and to a file.\n
-    Includes: StreamHandler, FileHandler, FunctionHandler\n
-    - <- | <return> Root logger with the appended handlers"""
+    Includes: StreamHandler, RotatingFileHandler, FunctionHandler, all run by a single queue listener thread\n
+    Child processes (i.e. spawned worker processes re-importing this module) only log to the console, so only one
+    process writes and rotates the log file. They forward their records to it with AttachProcessLogQueue().\n
+    - <- | <return> Tuple: root logger with the attached queue, queue listener running the handlers"""
 
     AddCustomLoggingLevel("USERINFO", 25, "userinfo")
     AddCustomLoggingLevel("USERERROR", 45, "usererror")
@@ -138,30 +184,41 @@ def SetRootLogger() -> logging.Logger:
     HdlLogConsole = logging.StreamHandler()
     HdlLogConsole.setFormatter(logging.Formatter(fmt=base_log_format))
     HdlLogConsole.setLevel(log_level["console"])
-    LogLogger.addHandler(HdlLogConsole)
 
-    # Create and setup the FileHandler for logging to the logfile
+    # NOTE: Spawned processes import this module before parent_process() is set, but after getting their process name
+    if current_process().name != "MainProcess":
+        return LogLogger, AttachQueueListener(LogLogger=LogLogger, handlers=[HdlLogConsole])
+
+    # Create and setup the RotatingFileHandler for logging to the logfile, rotated by size
     PthLOGFILE.parent.mkdir(parents=True, exist_ok=True)
-    HdlLogFile = logging.FileHandler(filename=PthLOGFILE, mode="a", encoding="utf-8")
+    HdlLogFile = RotatingFileHandler(
+        filename=PthLOGFILE, mode="a", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+    )
     HdlLogFile.setFormatter(logging.Formatter(fmt=file_log_format, datefmt=date_format))
     HdlLogFile.setLevel(log_level["file"])
-    LogLogger.addHandler(HdlLogFile)
 
     # Create and setup the FunctionHandler for using a function to log
     HdlLogFunction = FunctionHandler()
     HdlLogFunction.setFormatter(logging.Formatter(fmt=function_log_format))
     HdlLogFunction.setLevel(log_level["user"])
     HdlLogFunction.addFilter(UserLevelFilter())
-    LogLogger.addHandler(HdlLogFunction)
 
-    return LogLogger
+    # NOTE: The handlers are not attached to the logger directly, so logging threads never block on their I/O
+    LstListener = AttachQueueListener(LogLogger=LogLogger, handlers=[HdlLogConsole, HdlLogFile, HdlLogFunction])
+
+    return LogLogger, LstListener
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Global logger
 # ++---------------------------------------------------------------------------------------------------------------------++#
-LogLOGGER = SetRootLogger()
-"""Root logger for console and logfile logging."""
+LogLOGGER, LstLOGLISTENER = SetRootLogger()
+"""Root logger for console and logfile logging and the queue listener running its handlers."""
+
+LckPROCESS_LOG_QUEUE = Lock()
+"""Lock of the process log queue, s. GetProcessLogQueue()."""
+QueLOGPROCESSES: Queue | None = None
+"""Queue child processes forward their log records to, None until a child process needs it."""
 
 # Uses a custom global exception hook for logging uncaught exceptions.
 sys.excepthook = LogUnhandledExceptionsHook
@@ -169,6 +226,7 @@ sys.excepthook = LogUnhandledExceptionsHook
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      2.1     Handlers are looked up in the queue listener
 # ++ 24-03-04    fJ      2.0     Dev tests: passed ... works as intended
 # ++ 24-02-16    fJ      1.1     Deleted unspecific error handling
 # ++ 24-02-12    fJ      1.0     Dev tests: passed ... works as intended
@@ -179,11 +237,12 @@ def GetHandlerLevel(ClsHandler: logging.Handler) -> int:
     - -> | <ClsHandler> logging.StreamHandler or logging.FileHandler\n
     - <- | <return> log level, -1 if no handler of that instance was found"""
 
-    return next((HdlHandler.level for HdlHandler in LogLOGGER.handlers if isinstance(HdlHandler, ClsHandler)), -1)
+    return next((HdlHandler.level for HdlHandler in LstLOGLISTENER.handlers if isinstance(HdlHandler, ClsHandler)), -1)
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      2.1     Handlers are looked up in the queue listener
 # ++ 24-03-04    fJ      2.0     Dev tests: passed ... works as intended
 # ++ 24-02-16    fJ      1.1     Deleted unspecific error handling
 # ++ 24-02-12    fJ      1.0     Dev tests: passed ... works as intended
@@ -193,11 +252,12 @@ def GetLowestHandlerLevel() -> int:
     """Returns the currently lowest log level of the global logger handlers.\n
     - <- | <return> log level, -1 if no handler of that instance was found"""
 
-    return min((HdlHandler.level for HdlHandler in LogLOGGER.handlers), default=-1)
+    return min((HdlHandler.level for HdlHandler in LstLOGLISTENER.handlers), default=-1)
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      2.1     Handlers are looked up in the queue listener
 # ++ 24-03-04    fJ      2.0     Dev tests: passed ... works as intended
 # ++ 24-02-16    fJ      1.1     Deleted unspecific error handling
 # ++ 24-02-12    fJ      1.0     Dev tests: passed ... works as intended
@@ -208,7 +268,7 @@ def SetHandlerLevel(ClsHandler: logging.Handler, log_level: int):
     - -> | <ClsHandler> logging.StreamHandler or logging.FileHandler\n
     - -> | <log_levels> NOTSET = 0 | DEBUG = 10 | INFO = 20 | WARNING = 30 | ERROR = 40 | CRITICAL = 50"""
 
-    for HdlHandler in LogLOGGER.handlers:
+    for HdlHandler in LstLOGLISTENER.handlers:
         if isinstance(HdlHandler, ClsHandler):
             HdlHandler.setLevel(log_level)
             SetLowestHandlerLevelInRoot()
@@ -226,3 +286,45 @@ def SetLowestHandlerLevelInRoot():
     """Sets the log level of the root logger to the lowest log level of it's handlers."""
     LogLOGGER.setLevel(GetLowestHandlerLevel())
     return
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetProcessLogQueue() -> Queue:
+    """Returns the queue child processes forward their log records to, s. AttachProcessLogQueue(). On first call, a
+    further listener thread is started that runs the forwarded records by the handlers of LstLOGLISTENER, so only this
+    process writes and rotates the log file.\n
+    - <- | <return> Queue to pass to the child processes on their start"""
+
+    global QueLOGPROCESSES
+
+    with LckPROCESS_LOG_QUEUE:
+        if QueLOGPROCESSES is None:
+            QueLOGPROCESSES = get_context("spawn").Queue()
+            # NOTE: Not stopped on interpreter exit, as the queue can't start its feeder thread for the stop signal then.
+            #       The child processes end before, the daemon listener thread handles their records as they arrive.
+            LogQueueListener(QueLOGPROCESSES, *LstLOGLISTENER.handlers, respect_handler_level=True).start()
+
+    return QueLOGPROCESSES
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def AttachProcessLogQueue(QueLogRecords: Queue | None):
+    """Forwards the log records of a child process to its parent process instead of logging to the console. Called
+    first thing in the child process, i.e. as process pool initializer.\n
+    - -> | <QueLogRecords> Queue of the parent process, s. GetProcessLogQueue(), None keeps logging to the console"""
+
+    if QueLogRecords is None:
+        return
+
+    for HdlHandler in list(LogLOGGER.handlers):
+        LogLOGGER.removeHandler(HdlHandler)
+    LstLOGLISTENER.stop()
+    LogLOGGER.addHandler(QueueHandler(QueLogRecords))
@@ -0,0 +1,334 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from cProfile import Profile
+from csv import DictWriter
+from io import StringIO
+from json import dump, dumps
+from pathlib import Path
+from pstats import Stats
+from threading import Lock, local
+from time import perf_counter, time
+from typing import Any
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetPercentiles(values: list[float], percentiles: tuple[int, ...] = (50, 95, 99)) -> dict[int, float | None]:
+    """Returns percentiles of a list of values, linearly interpolated between the closest ranks.\n
+    - -> | <values> List of values\n
+    - -> | <percentiles> Percentiles to return\n
+    - <- | <return> Dictionary of percentile and value, values are None if the list is empty"""
+
+    if not values:
+        return {percentile: None for percentile in percentiles}
+
+    values = sorted(values)
+    results = {}
+    for percentile in percentiles:
+        rank = (len(values) - 1) * percentile / 100
+        lower = int(rank)
+        upper = min(lower + 1, len(values) - 1)
+        results[percentile] = values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+    return results
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Added Merge() for stages recorded by worker processes
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class StageMetrics:
+    """Thread-safe recorder for stage timings of single items, i.e. the query stages of a chemical.\n
+    Labels set by <Context()> get added to all stages recorded by the same thread, so deeply nested stages don't need to
+    know which chemical or source they are working on."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._local = local()
+        self._records: list[dict[str, Any]] = []
+
+    def Reset(self):
+        """Discards all recorded stages."""
+        with self._lock:
+            self._records = []
+
+    @contextmanager
+    def Context(self, **labels: Any) -> Iterator[None]:
+        """Adds labels to all stages recorded by the current thread within the context.\n
+        - -> | <labels> Labels to add, i.e. chem_id="50-00-0" or source="Gestis\""""
+
+        previous = getattr(self._local, "labels", {})
+        self._local.labels = {**previous, **labels}
+        try:
+            yield
+        finally:
+            self._local.labels = previous
+
+    @contextmanager
+    def Measure(self, stage: str, **labels: Any) -> Iterator[None]:
+        """Records the duration of the stage within the context, also if it raises an exception.\n
+        - -> | <stage> Stage name\n
+        - -> | <labels> Additional labels for this stage only"""
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.Record(stage=stage, duration=perf_counter() - start, **labels)
+
+    def Record(self, stage: str, duration: float, **labels: Any):
+        """Records a stage duration.\n
+        - -> | <stage> Stage name\n
+        - -> | <duration> Stage duration [s]\n
+        - -> | <labels> Additional labels for this stage only"""
+
+        record = {"time": time(), **getattr(self._local, "labels", {}), **labels, "stage": stage, "duration": duration}
+        with self._lock:
+            self._records.append(record)
+
+    def Merge(self, records: list[dict[str, Any]], **labels: Any):
+        """Adds stages recorded elsewhere, i.e. by a worker process.\n
+        - -> | <records> Records as returned by <GetRecords()>\n
+        - -> | <labels> Labels to add to the records, labels already set by the records are kept"""
+
+        context = getattr(self._local, "labels", {})
+        with self._lock:
+            self._records.extend({**context, **labels, **record} for record in records)
+
+    def GetRecords(self) -> list[dict[str, Any]]:
+        """Returns a copy of all recorded stages."""
+        with self._lock:
+            return list(self._records)
+
+    def GetSummary(self, group_by: tuple[str, ...] = ("source", "stage")) -> dict[tuple[str, ...], dict[str, float]]:
+        """Returns count, total and p50/p95/p99 durations of all recorded stages grouped by labels.\n
+        - -> | <group_by> Labels to group by, stages without a label are grouped under "-"\n
+        - <- | <return> Dictionary of label values and statistics"""
+
+        durations: dict[tuple[str, ...], list[float]] = {}
+        for record in self.GetRecords():
+            key = tuple(str(record.get(label, "-")) for label in group_by)
+            durations.setdefault(key, []).append(record["duration"])
+
+        summary = {}
+        for key, values in sorted(durations.items()):
+            p50, p95, p99 = GetPercentiles(values).values()
+            summary[key] = {"count": len(values), "total": sum(values), "p50": p50, "p95": p95, "p99": p99}
+
+        return summary
+
+    def FormatSummary(self) -> str:
+        """Returns the summary grouped by source and stage as a printable table."""
+
+        lines = [f"{'Source':<16}{'Stage':<18}{'Count':>8}{'p50 [s]':>10}{'p95 [s]':>10}{'p99 [s]':>10}{'Total [s]':>12}"]
+        for (source, stage), stats in self.GetSummary().items():
+            lines.append(
+                f"{source:<16}{stage:<18}{stats['count']:>8}{stats['p50']:>10.3f}{stats['p95']:>10.3f}"
+                f"{stats['p99']:>10.3f}{stats['total']:>12.3f}"
+            )
+
+        return "\n".join(lines)
+
+    def Export(self, PthFile: Path) -> bool:
+        """Writes all recorded stages to a .jsonl or .csv file.\n
+        - -> | <PthFile> Path of the metrics file, the suffix determines the format\n
+        - <- | <return> Write success"""
+
+        records = self.GetRecords()
+        PthFile.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            with open(PthFile, "w", newline="", encoding="utf-8") as TxtFile:
+                if PthFile.suffix.lower() == ".csv":
+                    fields = list(dict.fromkeys(field for record in records for field in record))
+                    CsvWriter = DictWriter(TxtFile, fieldnames=fields, restval="")
+                    CsvWriter.writeheader()
+                    CsvWriter.writerows(records)
+                else:
+                    TxtFile.writelines(f"{dumps(record, default=str)}\n" for record in records)
+            return True
+        # Catch error if the file is currently open
+        except PermissionError:
+            return False
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class Histogram:
+    """Thread-safe histogram of observed values, i.e. call durations."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._values: list[float] = []
+
+    def Reset(self):
+        """Discards all observed values."""
+        with self._lock:
+            self._values = []
+
+    def Observe(self, value: float):
+        """Adds a value to the histogram."""
+        with self._lock:
+            self._values.append(value)
+
+    def GetSummary(self) -> dict[str, float | None]:
+        """Returns count, total, min, max and p50/p95/p99 of all observed values."""
+
+        with self._lock:
+            values = list(self._values)
+
+        p50, p95, p99 = GetPercentiles(values).values()
+        return {
+            "count": len(values),
+            "total": sum(values),
+            "min": min(values, default=None),
+            "max": max(values, default=None),
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+        }
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class Counter:
+    """Thread-safe counter, i.e. for calls or errors."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._value = 0
+
+    def Reset(self):
+        """Resets the counter to zero."""
+        with self._lock:
+            self._value = 0
+
+    def Increment(self, amount: int = 1):
+        """Increments the counter by the given amount."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class MetricsRegistry:
+    """Thread-safe registry of named histograms and counters, created on first use.\n
+    Observing a value costs a lock and a list append, so instrumentation can stay on in production. CPU profiles
+    (cProfile) and memory peaks (tracemalloc) are expensive and therefore only captured on demand by <Capture()>."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._histograms: dict[str, Histogram] = {}
+        self._counters: dict[str, Counter] = {}
+        self._profiles: dict[str, str] = {}
+
+    def Reset(self):
+        """Resets all histograms and counters and discards all profiles. Metrics are reset in place, so references held
+        by instrumented functions stay valid."""
+        with self._lock:
+            for metric in (*self._histograms.values(), *self._counters.values()):
+                metric.Reset()
+            self._profiles = {}
+
+    def GetHistogram(self, name: str) -> Histogram:
+        """Returns the histogram of the given name, creates it if it doesn't exist yet."""
+        with self._lock:
+            return self._histograms.setdefault(name, Histogram())
+
+    def GetCounter(self, name: str) -> Counter:
+        """Returns the counter of the given name, creates it if it doesn't exist yet."""
+        with self._lock:
+            return self._counters.setdefault(name, Counter())
+
+    @contextmanager
+    def Capture(self, name: str, cpu: bool = False, memory: bool = False) -> Iterator[None]:
+        """Captures a CPU profile and/or the memory peak of the code within the context.\n
+        - -> | <name> Name to store the profile as, the memory peak [bytes] is observed as <name>.memory_peak\n
+        - -> | <cpu> Switch to capture a cProfile, skipped if another profiler is already active\n
+        - -> | <memory> Switch to trace the memory peak, skipped if tracemalloc is already tracing"""
+
+        PrfProfile = Profile() if cpu else None
+        if PrfProfile is not None:
+            try:
+                PrfProfile.enable()
+            except ValueError:
+                PrfProfile = None
+
+        memory = memory and not tracemalloc.is_tracing()
+        if memory:
+            tracemalloc.start()
+
+        try:
+            yield
+        finally:
+            if memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.GetHistogram(f"{name}.memory_peak").Observe(peak)
+
+            if PrfProfile is not None:
+                PrfProfile.disable()
+                StrStats = StringIO()
+                Stats(PrfProfile, stream=StrStats).sort_stats("cumulative").print_stats(50)
+                with self._lock:
+                    self._profiles[name] = StrStats.getvalue()
+
+    def GetSummary(self) -> dict[str, dict[str, Any]]:
+        """Returns the summaries of all histograms, the values of all counters and all captured profiles."""
+
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+            profiles = dict(self._profiles)
+
+        return {
+            "histograms": {name: histogram.GetSummary() for name, histogram in sorted(histograms.items())},
+            "counters": {name: counter.value for name, counter in sorted(counters.items())},
+            "profiles": profiles,
+        }
+
+    def Export(self, PthFile: Path) -> bool:
+        """Writes the summary to a .json file.\n
+        - -> | <PthFile> Path of the metrics file\n
+        - <- | <return> Write success"""
+
+        PthFile.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            with open(PthFile, "w", encoding="utf-8") as TxtFile:
+                dump(self.GetSummary(), TxtFile, indent=2)
+            return True
+        # Catch error if the file is currently open
+        except PermissionError:
+            return False
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Global metrics
+# ++---------------------------------------------------------------------------------------------------------------------++#
+StmMETRICS = StageMetrics()
+"""Stage timings of the current processing run."""
+RegMETRICS = MetricsRegistry()
+"""Function metrics of the current processing run, i.e. call durations recorded by the Timer decorator."""
@@ -1,36 +1,158 @@
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Imports
 # ++---------------------------------------------------------------------------------------------------------------------++#
+from datetime import date, time
+from importlib.util import find_spec
+from itertools import zip_longest
+from numbers import Number
 from pathlib import Path
-from typing import NamedTuple
+from typing import Any, Callable, Iterator, NamedTuple
 
-from pandas import DataFrame, read_csv, read_excel
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from pandas import NA, DataFrame, NaT, read_csv, read_excel
+from pandas.io.parsers import TextParser
+
+from src.fctlib.decorators import Timer
+from src.fctlib.logging import LogLOGGER
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+EXCEL_ENGINE = "calamine" if find_spec("python_calamine") is not None else None
+"""Pandas engine to read Excel files with: the much faster calamine engine if python-calamine is installed (optional),
+None for the pandas default (openpyxl for .xlsx, xlrd for .xls)."""
+CSV_CHUNK_ROWS = 10_000
+"""Number of rows of .csv files to parse at once when streaming their rows."""
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetHeaderFromFilePath(PthFile: Path) -> list[str | None]:
+    """Returns the column headers of a spreadsheet-like file without loading its data.\n
+    .xlsx files are read with a read-only openpyxl pass over the first row, other files with pandas.\n
+    - -> | <PthFile> Path to the spreadsheet-like file\n
+    - <- | <return> Column headers by column position, None for unnamed columns"""
+
+    if PthFile.suffix.lower() == ".xlsx" and EXCEL_ENGINE is None:
+        WbkFile = load_workbook(PthFile, read_only=True, data_only=True)
+        try:
+            # Pandas reads the first sheet with the first row as header, even if it is blank
+            header = next(WbkFile.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+        finally:
+            WbkFile.close()
+        return [str(cell) if cell is not None else None for cell in header]
+
+    if PthFile.suffix.lower() == ".csv":
+        columns = read_csv(PthFile, nrows=0).columns
+    else:
+        columns = read_excel(PthFile, nrows=0, engine=EXCEL_ENGINE).columns
+
+    return [str(col) if not str(col).startswith("Unnamed") else None for col in columns]
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Keep blank rows, so the rows match the input rows with a single column as well
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetDfFromXlsxCols(PthFile: Path, usecols: list[int]) -> DataFrame:
+    """Returns a pandas dataframe of some columns of an excel .xlsx file from a read-only openpyxl pass, the same as
+    >>read_excel(PthFile, usecols=usecols)<< but only converting the cells of these columns.\n
+    - -> | <PthFile> Path to the excel .xlsx file\n
+    - -> | <usecols> Column positions to load, ascending\n
+    - <- | <return> Dataframe"""
+
+    data: list[list[Any]] = []
+    last_row_with_data = -1
+
+    WbkFile = load_workbook(PthFile, read_only=True, data_only=True)
+    try:
+        for row_no, row in enumerate(WbkFile.worksheets[0].iter_rows(values_only=True)):
+            # Trailing empty rows are dropped like in pandas, regarding all columns
+            if any(value is not None for value in row):
+                last_row_with_data = row_no
+            # Convert cells like pandas: empty cells to "" (parsed as NaN) and integer floats to int
+            data.append(
+                [
+                    "" if value is None else int(value) if isinstance(value, float) and value.is_integer() else value
+                    for value in (row[col_no] if col_no < len(row) else None for col_no in usecols)
+                ]
+            )
+    finally:
+        WbkFile.close()
+
+    # Blank rows are kept as NaN like in pandas, a single column of blank cells would be skipped as blank lines otherwise
+    return TextParser(data[: last_row_with_data + 1], header=0, skip_blank_lines=False).read()
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Sniff the header first and only load the columns to search
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-21    fJ      0.3     Reworked
 # ++ 24-02-06    fJ      0.2     Added docstring
 # ++ 24-02-01    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def GetDfFromFilePath(PthFile: Path) -> DataFrame | None:
+def GetDfFromFilePath(PthFile: Path, cols_to_search: list[str] | None = None) -> DataFrame | None:
     """Returns a pandas dataframe from a spreadsheet-like file.\n
     - -> | <PthFile> Path to the spreadsheet-like file\n
-    - <- | <return> Dataframe or None if PermissionError"""
+    - -> | <cols_to_search> Unique column(s) header or header part to load, None loads all columns\n
+    - <- | <return> Dataframe (empty if no column to search was found) or None if PermissionError"""
 
-    if PthFile.suffix.lower() in [".xlsx", ".xls"]:
-        try:
-            return read_excel(PthFile)
-        # Catch error if the file is currently open
-        except PermissionError:
-            return None
-    if PthFile.suffix.lower() in [".csv"]:
-        return read_csv(PthFile)
+    try:
+        usecols = None
+        if cols_to_search is not None:
+            usecols = sorted(GetUniqueColIndices(GetHeaderFromFilePath(PthFile), cols_to_search))
+            # Skip loading the data of files without any column to search
+            if not usecols:
+                return DataFrame()
+
+        # Pandas' openpyxl reader converts all cells, even with usecols
+        if PthFile.suffix.lower() == ".xlsx" and EXCEL_ENGINE is None and usecols is not None:
+            return GetDfFromXlsxCols(PthFile, usecols)
+        if PthFile.suffix.lower() in [".xlsx", ".xls"]:
+            return read_excel(PthFile, usecols=usecols, engine=EXCEL_ENGINE)
+        if PthFile.suffix.lower() in [".csv"]:
+            return read_csv(PthFile, usecols=usecols)
+    # Catch error if the file is currently open
+    except PermissionError:
+        return None
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetUniqueColIndices(header: list[str | None], cols_to_search: list[str]) -> list[int]:
+    """Returns the positions of unique columns in a header, a column is unique if it is the only one containing the
+    header part (case insensitive).\n
+    - -> | <header> Column headers by column position, None or "Unnamed..." for unnamed columns\n
+    - -> | <cols_to_search> Unique column(s) header or header part\n
+    - <- | <return> Column positions in the order of cols_to_search"""
+
+    unique_cols = []
+    for col_header in cols_to_search:
+        col_match = [
+            col_no
+            for col_no, col in enumerate(header)
+            if col is not None and "Unnamed" not in str(col) and col_header.lower() in str(col).lower()
+        ]
+        if len(col_match) == 1:
+            unique_cols.append(col_match[0])
+
+    return unique_cols
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Match columns with GetUniqueColIndices()
 # ++ 24-03-04    fJ      1.0     Unit test: passed
 # ++ 24-02-21    fJ      0.3     Reworked
 # ++ 24-02-06    fJ      0.2     Added docstring
@@ -42,13 +164,7 @@ def GetUniqueColsFromDf(DfDataframe: DataFrame, cols_to_search: list[str]) -> Da
     - -> | <cols_to_search> Unique column(s) header or header part\n
     - <- | <return> Dataframe of only unique column(s)"""
 
-    unique_cols = []
-    for col_header in cols_to_search:
-        col_match = [col for col in DfDataframe.columns if "Unnamed" not in col and col_header.lower() in col.lower()]
-        if len(col_match) == 1:
-            unique_cols.append(col_match[0])
-
-    return DfDataframe[unique_cols]
+    return DfDataframe.iloc[:, GetUniqueColIndices(list(DfDataframe.columns), cols_to_search)]
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -67,23 +183,213 @@ def GetDfFromNtList(nt_list: list[NamedTuple], nt_constructor: NamedTuple) -> Da
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetXlsxCellValue(value: Any) -> Any:
+    """Returns a value openpyxl can write to a cell, like pandas' Excel writers do.\n
+    - -> | <value> Dataframe value\n
+    - <- | <return> None for NA values, numbers, strings and datetimes as is, others as string"""
+
+    if value is None or value is NA or value is NaT:
+        return None
+    if isinstance(value, Number):
+        # NaN is the only value not equal to itself
+        return None if value != value else value
+    if isinstance(value, (str, date, time)):
+        return value
+
+    return str(value)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      2.0     Unit test: passed
+# ++ 26-10-19    fJ      1.2     Stream rows to a write-only workbook instead of pandas' to_excel()
+# ++ 26-10-19    fJ      1.1     Added Timer decorator
 # ++ 24-03-04    fJ      1.0     Unit test: passed
 # ++ 24-02-25    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
+@Timer
 def WriteDfToXlsx(DfDataframe: DataFrame, PthXlsFile: Path) -> bool:
-    """Writes out a dataframe to an excel .xlsx file.\n
+    """Writes out a dataframe including its index to an excel .xlsx file. Rows are streamed to a write-only openpyxl
+    workbook, which keeps memory constant and is much faster than pandas' to_excel() for wide dataframes.\n
     - -> | <DfDataframe> Dataframe\n
     - -> | <PthXlsFile> Path to store the excel .xlsx file\n
     - <- | <return> Write success"""
 
+    # Open the file first, so a file that is currently open fails before any row is written
     try:
-        DfDataframe.to_excel(excel_writer=PthXlsFile, sheet_name="Query Output", index=True, engine="openpyxl")
+        FleOutput = PthXlsFile.open("wb")
+    # Catch error if the file is currently open
+    except PermissionError:
+        return False
+
+    with FleOutput:
+        WbkOutput = Workbook(write_only=True)
+        WksOutput = WbkOutput.create_sheet(title="Query Output")
+
+        header = []
+        for col in [DfDataframe.index.name, *DfDataframe.columns]:
+            header.append(WriteOnlyCell(WksOutput, value=GetXlsxCellValue(col)))
+            header[-1].font = Font(bold=True)
+        WksOutput.append(header)
+        for row in DfDataframe.itertuples(index=True, name=None):
+            WksOutput.append([GetXlsxCellValue(value) for value in row])
+
+        WbkOutput.save(FleOutput)
+
+    return True
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def IterRowsFromFilePath(PthFile: Path) -> Iterator[list[Any]]:
+    """Yields the header and then the data rows of a spreadsheet-like file one at a time, the data rows match the rows
+    of GetDfFromFilePath(). .xlsx files are streamed with a read-only openpyxl pass and .csv files in chunks of
+    CSV_CHUNK_ROWS rows, .xls files are loaded at once.\n
+    - -> | <PthFile> Path to the spreadsheet-like file\n
+    - <- | <return> Iterator of rows, the header first and padded to the widest row, blank data rows are empty lists"""
+
+    if PthFile.suffix.lower() == ".xlsx":
+        WbkFile = load_workbook(PthFile, read_only=True, data_only=True)
+        try:
+            WksFile = WbkFile.worksheets[0]
+            rows = WksFile.iter_rows(values_only=True)
+            header = list(next(rows, ()))
+            yield header + [None] * ((WksFile.max_column or 0) - len(header))
+
+            # Trailing blank rows are dropped like in pandas, so blank rows are only yielded once data follows
+            blank_rows_count = 0
+            for row in rows:
+                if all(value is None for value in row):
+                    blank_rows_count += 1
+                    continue
+                yield from ([] for _ in range(blank_rows_count))
+                blank_rows_count = 0
+                yield list(row)
+        finally:
+            WbkFile.close()
+        return
+
+    yield GetHeaderFromFilePath(PthFile)
+    if PthFile.suffix.lower() == ".csv":
+        for DfChunk in read_csv(PthFile, chunksize=CSV_CHUNK_ROWS):
+            yield from (list(row) for row in DfChunk.itertuples(index=False, name=None))
+    else:
+        yield from (list(row) for row in read_excel(PthFile, engine=EXCEL_ENGINE).itertuples(index=False, name=None))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+@Timer
+def WriteDfToParquet(DfDataframe: DataFrame, PthParquetFile: Path) -> bool:
+    """Writes out a dataframe including its index to a .parquet file. Object columns are written as strings, as query
+    results mix numbers and strings (i.e. "Not listed!") within a column.\n
+    - -> | <DfDataframe> Dataframe\n
+    - -> | <PthParquetFile> Path to store the .parquet file\n
+    - <- | <return> Write success"""
+
+    object_cols = [col for col, dtype in DfDataframe.dtypes.items() if dtype == object]
+    try:
+        DfDataframe.astype({col: "string" for col in object_cols}).to_parquet(PthParquetFile, index=True)
+        return True
+    # Catch error if the file is currently open
+    except PermissionError:
+        return False
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+@Timer
+def WriteDfToCsv(DfDataframe: DataFrame, PthCsvFile: Path) -> bool:
+    """Writes out a dataframe including its index to a .csv file, UTF-8 encoded with BOM so Excel detects umlauts.\n
+    - -> | <DfDataframe> Dataframe\n
+    - -> | <PthCsvFile> Path to store the .csv file\n
+    - <- | <return> Write success"""
+
+    try:
+        DfDataframe.to_csv(PthCsvFile, index=True, encoding="utf-8-sig")
         return True
     # Catch error if the file is currently open
     except PermissionError:
         return False
 
 
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+@Timer
+def WriteMergedDfToXlsx(PthSourceFile: Path, DfDataframe: DataFrame, PthXlsFile: Path) -> bool:
+    """Writes out the rows of a spreadsheet-like source file side by side with the rows of a dataframe to an excel .xlsx
+    file, i.e. the rows of an input file next to their query results. The source rows are streamed from the file to a
+    write-only openpyxl workbook, so only the dataframe is held in memory.\n
+    - -> | <PthSourceFile> Path to the spreadsheet-like file, its data rows match the dataframe rows by position\n
+    - -> | <DfDataframe> Dataframe, its index isn't written\n
+    - -> | <PthXlsFile> Path to store the excel .xlsx file\n
+    - <- | <return> Write success"""
+
+    # Open the files first, so a file that is currently open fails before any row is written
+    try:
+        source_rows = IterRowsFromFilePath(PthSourceFile)
+        source_header = next(source_rows)
+        FleOutput = PthXlsFile.open("wb")
+    # Catch error if either file is currently open
+    except PermissionError:
+        source_rows.close()
+        return False
+
+    with FleOutput:
+        WbkOutput = Workbook(write_only=True)
+        WksOutput = WbkOutput.create_sheet(title="Query Output")
+
+        header = []
+        for col in [*source_header, *DfDataframe.columns]:
+            header.append(WriteOnlyCell(WksOutput, value=GetXlsxCellValue(col)))
+            header[-1].font = Font(bold=True)
+        WksOutput.append(header)
+
+        source_width = len(source_header)
+        source_rows_count = 0
+        for source_row, row in zip_longest(source_rows, DfDataframe.itertuples(index=False, name=None)):
+            source_rows_count += source_row is not None
+            source_values = [GetXlsxCellValue(value) for value in (source_row or [])[:source_width]]
+            source_values += [None] * (source_width - len(source_values))
+            WksOutput.append(source_values + [GetXlsxCellValue(value) for value in (row or ())])
+
+        WbkOutput.save(FleOutput)
+
+    if source_rows_count != len(DfDataframe):
+        LogLOGGER.warning(
+            f"<{PthSourceFile.name}> has {source_rows_count} rows but {len(DfDataframe)} results, "
+            f"it may have changed during processing and the rows of <{PthXlsFile.name}> may not match!"
+        )
+
+    return True
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Output writers
+# ++---------------------------------------------------------------------------------------------------------------------++#
+OUTPUT_WRITERS: dict[str, Callable[[DataFrame, Path], bool]] = {
+    ".xlsx": WriteDfToXlsx,
+    ".parquet": WriteDfToParquet,
+    ".csv": WriteDfToCsv,
+}
+"""Dataframe writers by output file extension, each returns False if the file is currently open."""
+
+
 # # ++---------------------------------------------------------------------------------------------------------------------++#
 # # ++ DATE        DEV     VER     ACTIONS
 # # ++ 24-02-06    fJ      0.2     Added docstring
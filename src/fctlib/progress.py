@@ -0,0 +1,83 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from queue import Empty, SimpleQueue
+from time import monotonic
+from typing import Any
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetThroughputAndEta(done: int, total: int, elapsed: float) -> tuple[float, float | None]:
+    """Returns the throughput and the estimated time remaining of a running process.\n
+    - -> | <done> Number of finished items\n
+    - -> | <total> Total number of items\n
+    - -> | <elapsed> Elapsed time [s] since the process started\n
+    - <- | <return> Tuple: throughput [items/s], estimated time remaining [s] or None if it can't be estimated yet"""
+
+    if done <= 0 or elapsed <= 0:
+        return (0.0, None)
+
+    throughput = done / elapsed
+    return (throughput, max(total - done, 0) / throughput)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class ProgressBus:
+    """Thread-safe bus to decouple progress reports of worker threads from their (GUI) consumer.\n
+    Workers publish lightweight events, the consumer polls them at its own, bounded rate using <Drain()>."""
+
+    def __init__(self):
+        self._queue = SimpleQueue()
+        self._started = monotonic()
+
+    def Start(self):
+        """Resets the bus and sets the start time used for throughput and ETA estimation."""
+        self.Clear()
+        self._started = monotonic()
+
+    def Publish(self, report: dict[str, Any] | None, final: bool = False):
+        """Publishes a progress event. The report is copied, so the publisher may keep on mutating it.\n
+        - -> | <report> Report dictionary or None for state changes without a report\n
+        - -> | <final> Switch to indicate if the report is during or at the end of processing"""
+
+        if report is not None:
+            report = dict(report)
+            if "chem_no" in report and "chems_count" in report:
+                report["throughput"], report["eta"] = GetThroughputAndEta(
+                    done=int(report["chem_no"]), total=int(report["chems_count"]), elapsed=monotonic() - self._started
+                )
+        self._queue.put((report, final))
+
+    def Drain(self) -> list[tuple[dict[str, Any] | None, bool]]:
+        """Returns all pending events in order. Consecutive intermediate reports are coalesced into the latest one, as only
+        the latest one needs to be rendered.\n
+        - <- | <return> List of tuples: report, final switch"""
+
+        events: list[tuple[dict[str, Any] | None, bool]] = []
+        while True:
+            try:
+                report, final = self._queue.get_nowait()
+            except Empty:
+                return events
+
+            is_intermediate = report is not None and not final
+            if is_intermediate and events and events[-1][0] is not None and not events[-1][1]:
+                events[-1] = (report, final)
+            else:
+                events.append((report, final))
+
+    def Clear(self):
+        """Discards all pending events."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except Empty:
+                return
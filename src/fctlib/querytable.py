@@ -0,0 +1,179 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from pathlib import Path
+from typing import Callable, Iterator
+
+from numpy import column_stack, empty, full, nan, ndarray
+from pandas import DataFrame, NA, Series, notna
+
+from src.fctlib.pandas import GetDfFromFilePath, GetUniqueColsFromDf
+from src.fctlib.regex import CheckCasNos
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+NAME_MATCH_FIELDS = ("name_match_cas", "name_match_confidence")
+"""Output fields of the CAS number matched to a name of a row without CAS number and the match's confidence [0..1]."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.3     Keep the name matches, only fill in CAS numbers of exact matches
+# ++ 26-10-19    fJ      1.2     Added RewriteTerms() to rewrite the query terms of name-only rows
+# ++ 26-10-19    fJ      1.1     Added ResolveCasNos() to fill in CAS numbers of name-only rows
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class QueryTable:
+    """Array-backed table of the query terms of one input file, one row per file row.\n
+    The first column holds the valid CAS number or None, the other columns further query terms (i.e. names) or None.
+    Rows without any query term are empty, they are kept so the output rows match the input rows. CAS numbers matched
+    to the names of rows without one are kept apart from the query terms, s. RewriteTerms()."""
+
+    def __init__(self, terms: ndarray, matches: DataFrame | None = None):
+        """- -> | <terms> 2D object array of query terms, first column valid CAS numbers, None for missing terms\n
+        - -> | <matches> Name matches per row, s. GetNameMatches(), None if no name was matched"""
+
+        self.terms = terms
+        self._matches = matches
+        has_terms = notna(terms)
+        self.valid = has_terms.any(axis=1)
+        """Boolean array of rows with at least one query term."""
+        self.has_cas = has_terms[:, 0]
+        """Boolean array of rows with a valid CAS number."""
+
+    def __len__(self) -> int:
+        return self.terms.shape[0]
+
+    @property
+    def chems_count(self) -> int:
+        """Number of rows with at least one query term."""
+        return int(self.valid.sum())
+
+    @property
+    def cas_count(self) -> int:
+        """Number of rows with a valid CAS number."""
+        return int(self.has_cas.sum())
+
+    def GetTerms(self, row_no: int) -> list[str | None] | None:
+        """Returns the query terms of a row.\n
+        - -> | <row_no> Row number, 0-based\n
+        - <- | <return> List of query terms, first is valid CAS number or None, None if the row is empty"""
+
+        if not self.valid[row_no]:
+            return None
+
+        cas_no, *terms = self.terms[row_no]
+        return [cas_no] + [term for term in terms if term is not None]
+
+    def items(self) -> Iterator[tuple[int, list[str | None] | None]]:
+        """Yields row number and query terms (s. GetTerms()) of all rows."""
+
+        for row_no in range(len(self)):
+            yield row_no, self.GetTerms(row_no)
+
+    def GetNameMatches(self) -> DataFrame:
+        """Returns the CAS numbers matched to the names of rows without one and their confidence, s. RewriteTerms().\n
+        - <- | <return> Dataframe with one row per row and the columns NAME_MATCH_FIELDS, empty cells for rows without
+        match"""
+
+        if self._matches is not None:
+            return self._matches
+        cas_field, confidence_field = NAME_MATCH_FIELDS
+        return DataFrame({cas_field: empty(len(self), dtype=object), confidence_field: full(len(self), nan)})
+
+    def ResolveCasNos(self, resolve: Callable[[str], str | None]) -> "QueryTable":
+        """Returns a query table with the CAS numbers of rows without one filled in from their other query terms.\n
+        - -> | <resolve> Function returning the CAS number of a query term or None, i.e. SynonymIndex.Resolve()\n
+        - <- | <return> New query table if a CAS number was filled in, else this one, so cached tables stay as read"""
+
+        def Rewrite(term: str) -> tuple[str, str | None, float]:
+            cas_no = resolve(term)
+            return term, cas_no, 0.0 if cas_no is None else 1.0
+
+        return self.RewriteTerms(Rewrite)
+
+    def RewriteTerms(self, rewrite: Callable[[str], tuple[str, str | None, float]]) -> "QueryTable":
+        """Returns a query table with the query terms of rows without CAS number rewritten and the CAS numbers matched
+        to them.\n
+        Only exact matches (confidence 1) fill in the CAS number the row is queried by, similar names may be isomers or
+        homologues. The most confident match of each row is kept for the output, s. GetNameMatches().\n
+        - -> | <rewrite> Function returning the rewritten query term, its CAS number or None and the confidence [0..1]
+        of the CAS number, i.e. NameMatcher.Rewrite()\n
+        - <- | <return> New query table if a query term changed or matched, else this one, so cached tables stay as
+        read"""
+
+        rewritten: dict[str, tuple[str, str | None, float]] = {}
+        terms = self.terms.copy()
+        matches = self.GetNameMatches().copy()
+        for row_no in (self.valid & ~self.has_cas).nonzero()[0]:
+            best_confidence = 0.0
+            for col_no in range(1, terms.shape[1]):
+                term = terms[row_no, col_no]
+                if term is None:
+                    continue
+                # Rewrite each distinct term once, inventories repeat names
+                if term not in rewritten:
+                    rewritten[term] = rewrite(term)
+                terms[row_no, col_no], cas_no, confidence = rewritten[term]
+                if cas_no is None or confidence <= best_confidence:
+                    continue
+                best_confidence = confidence
+                matches.iloc[row_no] = [cas_no, confidence]
+                if confidence >= 1.0:
+                    terms[row_no, 0] = cas_no
+
+        if all(new_term == term and cas_no is None for term, (new_term, cas_no, _) in rewritten.items()):
+            return self
+
+        return QueryTable(terms, matches=matches)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetQueryTable(PdsCasNos: Series | None, DfTerms: DataFrame) -> QueryTable:
+    """Returns the query table of an input file using column operations only.\n
+    - -> | <PdsCasNos> Column with CAS numbers, invalid CAS numbers are dropped, None if the file has none\n
+    - -> | <DfTerms> Columns with further query terms (i.e. names), blank cells are dropped\n
+    - <- | <return> Query table"""
+
+    rows_count = len(DfTerms) if PdsCasNos is None else len(PdsCasNos)
+    cas_nos = empty(rows_count, dtype=object)
+    if PdsCasNos is not None:
+        PdsStrings = PdsCasNos.astype("string")
+        cas_nos = PdsStrings.where(CheckCasNos(PdsStrings)).to_numpy(dtype=object, na_value=None)
+
+    terms = [
+        PdsTerms.astype("string").str.strip().replace("", NA).to_numpy(dtype=object, na_value=None)
+        for _, PdsTerms in DfTerms.items()
+    ]
+
+    return QueryTable(column_stack([cas_nos, *terms]))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created from PreprocessFiles()
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetQueryTableFromFilePath(PthFile: Path, cols_to_search: tuple[str, ...]) -> QueryTable | None:
+    """Returns the query table of a spreadsheet-like file, only its identifier columns are loaded.\n
+    - -> | <PthFile> Path to the spreadsheet-like file\n
+    - -> | <cols_to_search> Identifier column(s) header or header part, the first one holds CAS numbers\n
+    - <- | <return> Query table or None if the file has no identifier column, raises PermissionError if the file is
+    currently open"""
+
+    DfFile = GetDfFromFilePath(PthFile, cols_to_search=list(cols_to_search))
+    if DfFile is None:
+        raise PermissionError(f"Can't access <{PthFile.name}>!")
+
+    DfCasNos = GetUniqueColsFromDf(DfDataframe=DfFile, cols_to_search=list(cols_to_search[:1]))
+    DfTerms = GetUniqueColsFromDf(DfDataframe=DfFile, cols_to_search=list(cols_to_search[1:]))
+    if not DfCasNos.shape[1] and not DfTerms.shape[1]:
+        return None
+
+    return GetQueryTable(PdsCasNos=DfCasNos.iloc[:, 0] if DfCasNos.shape[1] else None, DfTerms=DfTerms)
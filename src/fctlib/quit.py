@@ -8,12 +8,14 @@ from src.fctlib.selenium import QuitWebDrivers
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Added exit code for command line runs
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-06    fJ      0.2     Added docstring
 # ++ 24-02-05    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def QuitExecution():
-    """Cleans prior to and terminates app execution."""
+def QuitExecution(exit_code: int = 0):
+    """Cleans prior to and terminates app execution.\n
+    - -> | <exit_code> Exit code of the app"""
 
     QuitWebDrivers()
-    exit()
+    exit(exit_code)
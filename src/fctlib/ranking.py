@@ -0,0 +1,178 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from re import compile
+from typing import Iterable, NamedTuple
+from unicodedata import combining, normalize
+
+from src.fctlib.regex import CheckCasNo
+from src.settings import RANKING_MIN_SCORE, RANKING_RUNNER_UPS
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+RepCASCANDIDATE = compile(r"(?<![\d-])\d{2,7}-\d{2}-\d(?![\d-])")
+"""CAS number pattern within a text, i.e. a hit's text. Matches still need the checksum check."""
+RepNONWORD = compile(r"[\W_]+")
+"""Pattern of characters ignored when comparing names: Whitespace, punctuation and symbols."""
+
+SCORE_CAS = 1.0
+"""Score of a hit listing the queried CAS number."""
+SCORE_NAME_EXACT = 0.95
+"""Score of a hit named exactly like the query term, ignoring case."""
+SCORE_NAME_NORMALISED = 0.9
+"""Score of a hit named like the query term, ignoring case, accents, whitespace and punctuation."""
+SCORE_SYNONYM_CAS = 0.85
+"""Score of a hit listing a CAS number known from other sources for the chemical."""
+SCORE_SYNONYM_NAME = 0.8
+"""Score of a hit named like a synonym known from other sources for the chemical."""
+SCORE_TOKENS = 0.5
+"""Maximum score of a hit whose name contains all words of the query term, weighted by the share of matching words."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class Ranking(NamedTuple):
+    """Result of RankCandidates()."""
+
+    selected: int | None
+    """Index of the selected candidate, None if no candidate is good and unique enough."""
+    score: float
+    """Score [0..1] of the best ranked candidate, 0 if there is none."""
+    runner_ups: list[tuple[str, float]]
+    """Names and scores of the next best ranked candidates, best first."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def NormaliseName(name: str) -> str:
+    """Returns a chemical name normalised for comparison: Case, accents, whitespace and punctuation are removed, so
+    "1,2-Dichlorethan" and "1.2 dichlorethan" compare equal.\n
+    - -> | <name> Chemical name\n
+    - <- | <return> Normalised name"""
+
+    decomposed = normalize("NFKD", name.casefold())
+    return RepNONWORD.sub("", "".join(char for char in decomposed if not combining(char)))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetCasNumbers(text: str) -> set[str]:
+    """Returns all CAS numbers with a valid checksum found in a text.\n
+    - -> | <text> Text, i.e. a hit's text\n
+    - <- | <return> Set of CAS numbers"""
+
+    return {cas for cas in RepCASCANDIDATE.findall(text) if CheckCasNo(cas)}
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def ScoreCandidate(text: str, query_term: str, synonyms: Iterable[str] = ()) -> float:
+    """Scores how likely a hit is the queried chemical, from the hit's text only.\n
+    A hit listing the queried CAS number scores highest, one listing another CAS number scores 0. Otherwise the hit's
+    names (the lines of its text) are compared to the query term and to the synonyms, s. the SCORE_* values.\n
+    - -> | <text> Hit's text, names and CAS numbers on separate lines\n
+    - -> | <query_term> Term the database was queried for\n
+    - -> | <synonyms> Names and CAS numbers known from other sources for the chemical, i.e. PubChem's synonyms\n
+    - <- | <return> Score [0..1]"""
+
+    cas_numbers = GetCasNumbers(text)
+    if CheckCasNo(query_term) and cas_numbers:
+        return SCORE_CAS if query_term in cas_numbers else 0.0
+
+    synonyms = set(synonyms)
+    synonym_cas_numbers = {synonym for synonym in synonyms if CheckCasNo(synonym)}
+    if cas_numbers & synonym_cas_numbers:
+        return SCORE_SYNONYM_CAS
+    if cas_numbers and synonym_cas_numbers:
+        return 0.0
+
+    names = [line.strip() for line in text.splitlines() if line.strip()]
+    if any(name.casefold() == query_term.strip().casefold() for name in names):
+        return SCORE_NAME_EXACT
+    normalised_names = {NormaliseName(name) for name in names}
+    if NormaliseName(query_term) in normalised_names:
+        return SCORE_NAME_NORMALISED
+    if normalised_names & {NormaliseName(synonym) for synonym in synonyms - synonym_cas_numbers}:
+        return SCORE_SYNONYM_NAME
+
+    # Partial match: All words of the query term are words of a name, the fewer other words the better
+    query_tokens = set(RepNONWORD.split(query_term.casefold())) - {""}
+    score = 0.0
+    for name in names:
+        name_tokens = set(RepNONWORD.split(name.casefold())) - {""}
+        if query_tokens and query_tokens <= name_tokens:
+            score = max(score, SCORE_TOKENS * len(query_tokens) / len(name_tokens))
+
+    return score
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def RankCandidates(
+    candidates: list[str],
+    query_term: str,
+    synonyms: Iterable[str] = (),
+    min_score: float = RANKING_MIN_SCORE,
+    runner_ups: int = RANKING_RUNNER_UPS,
+) -> Ranking:
+    """Ranks ambiguous hits by ScoreCandidate() and selects the best one, if it scores at least <min_score> and higher
+    than all others.\n
+    - -> | <candidates> Hits' texts\n
+    - -> | <query_term> Term the database was queried for\n
+    - -> | <synonyms> Names and CAS numbers known from other sources for the chemical\n
+    - -> | <min_score> Minimum score [0..1] of the selected candidate\n
+    - -> | <runner_ups> Number of next best ranked candidates to return\n
+    - <- | <return> Ranking"""
+
+    synonyms = set(synonyms)
+    scores = [ScoreCandidate(text=text, query_term=query_term, synonyms=synonyms) for text in candidates]
+    # Stable sort, so equally scored candidates keep the database's order
+    ranked = sorted(range(len(candidates)), key=lambda index: scores[index], reverse=True)
+    if not ranked:
+        return Ranking(selected=None, score=0.0, runner_ups=[])
+
+    best = ranked[0]
+    unique = len(ranked) == 1 or scores[best] > scores[ranked[1]]
+    selected = best if unique and scores[best] >= min_score else None
+    # Without a selection, the best candidate is a runner-up as well
+    others = ranked[1:] if selected is not None else ranked
+
+    # The first line of a hit's text is its name
+    names = [(candidates[index].strip().splitlines() or [""])[0] for index in others[:runner_ups]]
+
+    return Ranking(
+        selected=selected,
+        score=scores[best],
+        runner_ups=[(name, scores[index]) for name, index in zip(names, others[:runner_ups])],
+    )
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def FormatRunnerUps(runner_ups: list[tuple[str, float]]) -> str:
+    """Formats the runner-ups of a ranking for a query status.\n
+    - -> | <runner_ups> Names and scores of the runner-ups, s. Ranking\n
+    - <- | <return> Runner-ups text, empty if there are none"""
+
+    if not runner_ups:
+        return ""
+    return "Runner-ups: " + ", ".join(f"<{name}> ({score:.2f})" for name, score in runner_ups) + "."
@@ -0,0 +1,69 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from threading import Event, Lock
+from time import monotonic, sleep
+from typing import Callable
+
+from src.fctlib.metrics import RegMETRICS
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Share the rate limit with other processes
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TokenBucket:
+    """Thread-safe token bucket limiting the request rate to a service, i.e. to its documented rate limit.\n
+    The bucket holds up to <capacity> tokens and refills at <rate> tokens per second. Each request takes a token, so
+    bursts of up to <capacity> requests pass at once and the long-term rate never exceeds <rate>. Requests finding the
+    bucket empty reserve the next token and wait for it outside the lock, so they pass in order of arrival. Waits are
+    observed as <name>.wait [s] in RegMETRICS.\n
+    The bucket only limits the requests of its process. Processes sharing a rate limit reserve their tokens from one
+    bucket instead, i.e. the one served by the broker to the worker processes (s. Share())."""
+
+    def __init__(self, name: str, rate: float, capacity: float = 1.0):
+        """- -> | <name> Metrics name of the bucket\n
+        - -> | <rate> Tokens [1/s] added per second, i.e. the allowed requests per second\n
+        - -> | <capacity> Maximum number of tokens, i.e. the allowed burst of requests"""
+
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._lock = Lock()
+        self._tokens = capacity
+        self._updated = monotonic()
+        self._SharedReserve: Callable[[], float] | None = None
+
+    def Share(self, SharedReserve: Callable[[], float] | None):
+        """Shares the rate limit with other processes by reserving the tokens from a bucket they share.\n
+        - -> | <SharedReserve> Reserve() of the shared bucket, i.e. of a broker proxy, None reserves from this bucket"""
+        self._SharedReserve = SharedReserve
+
+    def Reserve(self) -> float:
+        """Takes a token without waiting for it.\n
+        - <- | <return> Time [s] to wait until the token is available"""
+
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Negative tokens are reserved by waiting requests
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def Acquire(self, EvtCancel: Event | None = None) -> bool:
+        """Takes a token, waits until the bucket holds one.\n
+        - -> | <EvtCancel> Event to stop waiting, i.e. on cancelling the processing\n
+        - <- | <return> True once the token is taken, False if cancelled while waiting"""
+
+        wait = self.Reserve() if self._SharedReserve is None else self._SharedReserve()
+        if wait <= 0:
+            return True
+
+        RegMETRICS.GetHistogram(f"{self.name}.wait").Observe(wait)
+        if EvtCancel is None:
+            sleep(wait)
+            return True
+        return not EvtCancel.wait(wait)
@@ -4,6 +4,9 @@
 from collections import OrderedDict
 from re import Pattern, compile, findall, match
 
+from numpy import arange, frombuffer, uint8
+from pandas import Series
+
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Module variables
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -41,6 +44,31 @@ def CheckCasNo(str_input: str) -> bool:
     return sum(int(char) * (i) for i, char in enumerate(reversed(cas_string))) % 10 == int(cas_string[-1])
 
 
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def CheckCasNos(PdsInput: Series) -> Series:
+    """Checks a whole column for valid CAS numbers like CheckCasNo(), using vectorised string and array operations.\n
+    - -> | <PdsInput> Series of values to check by their string representation, NA and non-ASCII values are invalid\n
+    - <- | <return> Boolean Series of CAS number validity with the same index"""
+
+    PdsStrings = PdsInput.astype("string")
+    # Non-ASCII digits match the pattern as well, but don't fit the digits matrix below
+    PdsValid = (PdsStrings.str.match(RepCASNUMBER) & PdsStrings.str.isascii()).fillna(False).astype(bool)
+    if not PdsValid.any():
+        return PdsValid
+
+    # Left-pad the (at most 10) digits with zeros, so the digits form a matrix and the checksum is a dot product
+    digits = PdsStrings[PdsValid].str.replace("-", "", regex=False).str.zfill(10).str.cat()
+    digits_matrix = frombuffer(digits.encode("ascii"), dtype=uint8).reshape(-1, 10) - ord("0")
+    checksums = digits_matrix[:, :-1] @ arange(9, 0, -1) % 10
+    PdsValid[PdsValid] = checksums == digits_matrix[:, -1]
+
+    return PdsValid
+
+
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
 # ++ 24-02-12    fJ      1.0     Unit test: passed
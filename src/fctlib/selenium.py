@@ -5,7 +5,7 @@ from multiprocessing import cpu_count
 from pathlib import Path
 from queue import Queue
 from time import sleep
-from typing import Optional
+from typing import Any, NamedTuple, Optional
 
 from selenium import webdriver
 from selenium.common.exceptions import JavascriptException, NoSuchElementException, TimeoutException
@@ -18,7 +18,14 @@ from selenium.webdriver.support import expected_conditions as Expect
 from selenium.webdriver.support.wait import WebDriverWait
 
 from src.fctlib.logging import LogLOGGER
-from src.settings import DRV_NO_TIMEOUT, DRV_RUN_HEADLESS, DRV_SLEEPTIME, DRV_TIMEOUT
+from src.fctlib.metrics import StmMETRICS
+from src.settings import DRV_NO_TIMEOUT, DRV_RUN_HEADLESS, DRV_SCROLL_ATTEMPTS, DRV_SLEEPTIME, DRV_TIMEOUT
+
+# Optional, compiles the XPaths of XpathDescriptors for parsers working on fetched HTML instead of a webdriver
+try:
+    from lxml.etree import XPath
+except ImportError:
+    XPath = None
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Global webdriver elements
@@ -39,6 +46,17 @@ BY_LOCATORS = {
 }
 """Selenium locators lookup dictionary"""
 
+JS_ELEMENT_CONTENTS = """
+const [elements, linkXpath] = arguments;
+return elements.map((element) => {
+    const link = linkXpath
+        ? document.evaluate(linkXpath, element, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : null;
+    return [(element.innerText || element.textContent || "").trim(), link ? link.href : null];
+});
+"""
+"""Script returning the text and the href of a link inside each of the given elements, s. GetElementContents()."""
+
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
@@ -162,6 +180,7 @@ def InitWebDriversForThreading(max_threads: Optional[int] = 1):
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      2.1     Record navigation time to StmMETRICS
 # ++ 24-03-04    fJ      2.0     Dev tests: passed ... works as intended
 # ++ 24-02-16    fJ      1.1     Deleted unspecific error handling
 # ++ 24-02-14    fJ      1.0     Dev tests: passed ... works as intended
@@ -174,14 +193,16 @@ def NavigateURL(WdrDriver: WebDriver, url: str):
     - -> | <WdrDriver> WebDriver to use\n
     - -> | <url> URL to navigate to"""
 
-    WdrDriver.get(url)
-    # Sleep so the browser catches up to the visuals change
-    sleep(DRV_SLEEPTIME)
+    with StmMETRICS.Measure("navigation"):
+        WdrDriver.get(url)
+        # Sleep so the browser catches up to the visuals change
+        sleep(DRV_SLEEPTIME)
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      2.1     Bounded the number of scroll attempts, so a never displayed element can't hang the query
 # ++ 24-03-04    fJ      2.0     Dev tests: passed ... works as intended
 # ++ 24-02-16    fJ      1.1     Deleted unspecific error handling
 # ++ 24-02-14    fJ      1.0     Dev tests: passed ... works as intended
@@ -189,18 +210,67 @@ def NavigateURL(WdrDriver: WebDriver, url: str):
 # ++ 24-02-06    fJ      0.2     Added docstring
 # ++ 24-02-01    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def ScrollTo(WdrDriver: WebDriver, WelTarget: WebElement):
+def ScrollTo(WdrDriver: WebDriver, WelTarget: WebElement, attempts: int = DRV_SCROLL_ATTEMPTS) -> bool:
     """Scrolls the given target into view.\n
     - -> | <WdrDriver> Target element-containing WebDriver\n
     - -> | <WelTarget> Target element\n
+    - -> | <attempts> Maximum number of scroll attempts\n
+    - <- | <return> True if the target is displayed, False otherwise\n
     On occasions, we need to force scroll the target into view to get access to its content."""
 
     try:
-        while not WelTarget.is_displayed():
+        for _ in range(attempts):
+            if WelTarget.is_displayed():
+                return True
             WdrDriver.execute_script("arguments[0].scrollIntoView(true);", WelTarget)
+        if WelTarget.is_displayed():
+            return True
     # JavascriptException usually means that the element is not defined
     except JavascriptException:
         LogLOGGER.warning(f"Element <{WelTarget.__class__}> not defined!")
+        return False
+
+    LogLOGGER.debug(f"Element <{WelTarget.__class__}> not displayed after {attempts} scroll attempts.")
+    return False
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class ElementContent(NamedTuple):
+    """Content of a web element collected by GetElementContents()."""
+
+    element: WebElement
+    """Web element."""
+    text: str
+    """Rendered text of the element, stripped."""
+    href: str | None
+    """Absolute URL of the link inside the element, None if there is none."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetElementContents(
+    WdrDriver: WebDriver, elements: list[WebElement], link_xpath: Optional[str] = None
+) -> list[ElementContent]:
+    """Gets the texts and links of the given elements with a single script call.\n
+    Unlike reading WebElement.text element by element, this neither needs a round trip per element nor scrolling
+    the elements into view first.\n
+    - -> | <WdrDriver> Elements-containing WebDriver\n
+    - -> | <elements> Web elements\n
+    - -> | <link_xpath> XPath of the link relative to each element, its href is collected as well\n
+    - <- | <return> Contents in order of the elements"""
+
+    if not elements:
+        return []
+
+    contents = WdrDriver.execute_script(JS_ELEMENT_CONTENTS, elements, link_xpath)
+    return [ElementContent(WelElement, text, href) for WelElement, (text, href) in zip(elements, contents)]
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -336,6 +406,55 @@ def XpathConstructor(locator_list: list[str]) -> tuple[str, bool]:
     return xpath, get_multiple
 
 
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class XpathDescriptor(NamedTuple):
+    """Location descriptor list compiled once (s. CompileXpathDescriptors()), so no XPath is built per lookup."""
+
+    name: str
+    """Descriptor name, i.e. the dataset field."""
+    parent: str
+    """XPath of the parent element, relative to the page or dossier."""
+    target: str
+    """XPath of the target element(s), relative to the parent element."""
+    get_multiple: bool
+    """Switch to get multiple elements."""
+    parent_compiled: Any = None
+    """lxml XPath object of the parent XPath, None if lxml isn't installed."""
+    target_compiled: Any = None
+    """lxml XPath object of the target XPath, None if lxml isn't installed."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def CompileXpathDescriptors(locator_lists: list[list[str]], parent_template: str) -> dict[str, XpathDescriptor]:
+    """Compiles location descriptor lists into XPath descriptors, i.e. once at import.\n
+    - -> | <locator_lists> Location descriptor lists (Descriptor name|parent ID|target XPath parts ...)\n
+    - -> | <parent_template> XPath of the parent element with an {id} placeholder for the parent ID\n
+    - <- | <return> XPath descriptors by descriptor name, in the order of the lists"""
+
+    descriptors: dict[str, XpathDescriptor] = {}
+    for locator_list in locator_lists:
+        parent = parent_template.format(id=locator_list[1])
+        target, get_multiple = XpathConstructor(locator_list[2:])
+        descriptors[locator_list[0]] = XpathDescriptor(
+            name=locator_list[0],
+            parent=parent,
+            target=target,
+            get_multiple=get_multiple,
+            parent_compiled=XPath(parent) if XPath is not None else None,
+            target_compiled=XPath(target) if XPath is not None else None,
+        )
+
+    return descriptors
+
+
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
 # ++ 24-03-04    fJ      2.0     Dev tests: passed ... works as intended
@@ -0,0 +1,178 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from json import JSONDecodeError, dump, load
+from pathlib import Path
+from threading import Lock
+from typing import Iterable
+
+from src.fctlib.logging import LogLOGGER
+from src.fctlib.metrics import RegMETRICS
+from src.fctlib.ranking import NormaliseName
+from src.fctlib.regex import CheckCasNo
+from src.settings import PthSYNONYM_INDEX
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+SYNONYM_INDEX_VERSION = 1
+"""File format version of the synonym index, files of other versions are ignored."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Added Export() to send the names found by worker processes to the coordinator
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class SynonymIndex:
+    """Thread-safe index of chemical names to CAS numbers, filled with the names sources return for a CAS number and
+    kept between runs, so name-only rows can be queried by CAS number.\n
+    Names are keyed by NormaliseName(). A name found for different CAS numbers (i.e. for isomers or a generic name) is
+    ambiguous and doesn't resolve anymore. The index is loaded from its file on first use and only written by Save()
+    if it changed. Resolved and unresolved names are counted as synonyms.hits and synonyms.misses in RegMETRICS."""
+
+    def __init__(self, PthFile: Path | None = None):
+        """- -> | <PthFile> Path to the index file, None keeps the index in memory only"""
+
+        self.PthFile = PthFile
+        self._lock = Lock()
+        self._names: dict[str, str | None] = {}
+        self._loaded = PthFile is None
+        self._changed = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._Load()
+            return len(self._names)
+
+    def Reset(self, PthFile: Path | None = None):
+        """Drops all names without saving and switches to another index file, i.e. for benchmarks.\n
+        - -> | <PthFile> Path to the index file, None keeps the index in memory only"""
+
+        with self._lock:
+            self.PthFile = PthFile
+            self._names.clear()
+            self._loaded = PthFile is None
+            self._changed = False
+
+    def _Load(self):
+        """Loads the index file once, has to be called with the lock held."""
+
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.PthFile.is_file():
+            return
+
+        try:
+            with open(self.PthFile, "r", encoding="utf-8") as file:
+                content = load(file)
+            if content.get("version") != SYNONYM_INDEX_VERSION:
+                LogLOGGER.warning(f"Ignoring synonym index <{self.PthFile}> of another version.")
+                return
+            for cas_no, names in content["cas_numbers"].items():
+                for name in names:
+                    self._names[name] = cas_no if self._names.get(name, cas_no) == cas_no else None
+            self._names.update(dict.fromkeys(content["ambiguous"]))
+        except (OSError, JSONDecodeError, AttributeError, KeyError, TypeError) as Error:
+            LogLOGGER.warning(f"Can't read synonym index <{self.PthFile}>: <{Error}>, starting a new one.")
+            self._names.clear()
+
+    def Add(self, cas_no: str, names: Iterable[str]) -> int:
+        """Adds names of a chemical to the index.\n
+        - -> | <cas_no> CAS number of the chemical, names of invalid CAS numbers aren't added\n
+        - -> | <names> Names of the chemical, CAS numbers among them are skipped\n
+        - <- | <return> Number of names added or turned ambiguous"""
+
+        if not CheckCasNo(cas_no):
+            return 0
+        keys = {NormaliseName(name) for name in names if isinstance(name, str) and not CheckCasNo(name.strip())}
+        keys.discard("")
+
+        changed = 0
+        with self._lock:
+            self._Load()
+            for key in keys:
+                if key not in self._names:
+                    self._names[key] = cas_no
+                elif self._names[key] not in (cas_no, None):
+                    self._names[key] = None
+                else:
+                    continue
+                changed += 1
+            self._changed = self._changed or changed > 0
+
+        return changed
+
+    def GetNames(self) -> dict[str, str]:
+        """Returns the names that resolve, i.e. to build a fuzzy matcher.\n
+        - <- | <return> Dictionary of normalised names and their CAS numbers"""
+
+        with self._lock:
+            self._Load()
+            return {name: cas_no for name, cas_no in self._names.items() if cas_no is not None}
+
+    def Export(self) -> dict[str, list[str]]:
+        """Returns the names that resolve grouped by CAS number, i.e. to add the names a worker process found to the
+        coordinator's index.\n
+        - <- | <return> Dictionary of CAS numbers and their normalised names"""
+
+        with self._lock:
+            self._Load()
+            return self._GroupNames()
+
+    def _GroupNames(self) -> dict[str, list[str]]:
+        """Groups the names that resolve by CAS number, has to be called with the lock held."""
+
+        cas_numbers: dict[str, list[str]] = {}
+        for name, cas_no in self._names.items():
+            if cas_no is not None:
+                cas_numbers.setdefault(cas_no, []).append(name)
+        return cas_numbers
+
+    def Resolve(self, name: str) -> str | None:
+        """Returns the CAS number of a chemical name.\n
+        - -> | <name> Chemical name\n
+        - <- | <return> CAS number, None if the name isn't indexed or ambiguous"""
+
+        with self._lock:
+            self._Load()
+            cas_no = self._names.get(NormaliseName(name))
+
+        RegMETRICS.GetCounter("synonyms.hits" if cas_no is not None else "synonyms.misses").Increment()
+        return cas_no
+
+    def Save(self) -> bool:
+        """Writes the index to its file if it changed since it was loaded. The file is replaced at once, so an
+        interrupted write doesn't corrupt it.\n
+        - <- | <return> True if the index is written or unchanged, False if it can't be written"""
+
+        with self._lock:
+            if self.PthFile is None or not self._changed:
+                return True
+
+            # Group the names by CAS number, so each CAS number is stored once
+            content = {
+                "version": SYNONYM_INDEX_VERSION,
+                "cas_numbers": self._GroupNames(),
+                "ambiguous": sorted(name for name, cas_no in self._names.items() if cas_no is None),
+            }
+
+            PthTemp = self.PthFile.with_suffix(".tmp")
+            try:
+                self.PthFile.parent.mkdir(parents=True, exist_ok=True)
+                with open(PthTemp, "w", encoding="utf-8") as file:
+                    dump(content, file, ensure_ascii=False, separators=(",", ":"))
+                PthTemp.replace(self.PthFile)
+            except OSError as Error:
+                LogLOGGER.warning(f"Can't write synonym index <{self.PthFile}>: <{Error}>.")
+                return False
+
+            self._changed = False
+
+        return True
+
+
+IdxSYNONYMS = SynonymIndex(PthFile=PthSYNONYM_INDEX)
+"""Synonym index of the process, s. SynonymIndex."""
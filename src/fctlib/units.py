@@ -0,0 +1,136 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from re import compile
+
+from numpy import nan
+from pandas import DataFrame, Series, concat, factorize, to_numeric
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+RepQUANTITY = compile(
+    # Qualifier like "ca." or ">=", ignored
+    r"^\s*(?:ca\.?|etwa|~|<=?|>=?|≤|≥)?\s*"
+    # German formatted number, i.e. "-19,1" or "1.013,25"
+    r"(?P<number>[-+]?\d[\d.]*(?:,\d+)?)"
+    # Upper bound of a range, ignored
+    r"(?:\s*(?:-|bis)\s*[-+]?\d[\d.]*(?:,\d+)?)?"
+    # Unit up to conditions like "bei 20 °C", remarks in brackets or further values
+    r"\s*(?P<unit>[^(;|]*?)\s*(?:\bbei\b.*|\(.*|[;|].*)?$"
+)
+"""Regex pattern of a quantity as listed on Chemikalieninfo, i.e. "0,79 g/cm3 bei 20 °C". Ranges give their lower
+bound."""
+RepTHOUSANDS = compile(r"^[-+]?[1-9]\d{0,2}(?:\.\d{3})+(?:,\d+)?$")
+"""Regex pattern of a German formatted number with thousands separators, i.e. "1.013" or "1.013,25"."""
+
+UNITS: dict[str, tuple[str, float, float]] = {
+    # Temperature
+    "°C": ("K", 1.0, 273.15),
+    "K": ("K", 1.0, 0.0),
+    "°F": ("K", 5 / 9, 273.15 - 32 * 5 / 9),
+    # Density and mass concentration
+    "g/cm3": ("kg/m3", 1e3, 0.0),
+    "g/ml": ("kg/m3", 1e3, 0.0),
+    "g/mL": ("kg/m3", 1e3, 0.0),
+    "kg/l": ("kg/m3", 1e3, 0.0),
+    "kg/L": ("kg/m3", 1e3, 0.0),
+    "kg/m3": ("kg/m3", 1.0, 0.0),
+    "g/l": ("kg/m3", 1.0, 0.0),
+    "g/L": ("kg/m3", 1.0, 0.0),
+    "g/m3": ("kg/m3", 1e-3, 0.0),
+    "mg/l": ("kg/m3", 1e-3, 0.0),
+    "mg/L": ("kg/m3", 1e-3, 0.0),
+    "mg/m3": ("kg/m3", 1e-6, 0.0),
+    # Pressure
+    "Pa": ("Pa", 1.0, 0.0),
+    "hPa": ("Pa", 1e2, 0.0),
+    "kPa": ("Pa", 1e3, 0.0),
+    "MPa": ("Pa", 1e6, 0.0),
+    "mbar": ("Pa", 1e2, 0.0),
+    "bar": ("Pa", 1e5, 0.0),
+    "Torr": ("Pa", 101325 / 760, 0.0),
+    "mmHg": ("Pa", 101325 / 760, 0.0),
+    "atm": ("Pa", 101325.0, 0.0),
+    # Dynamic viscosity
+    "Pas": ("Pa*s", 1.0, 0.0),
+    "mPas": ("Pa*s", 1e-3, 0.0),
+    "cP": ("Pa*s", 1e-3, 0.0),
+    # Surface tension
+    "N/m": ("N/m", 1.0, 0.0),
+    "mN/m": ("N/m", 1e-3, 0.0),
+    "dyn/cm": ("N/m", 1e-3, 0.0),
+    # Energy
+    "eV": ("J", 1.602176634e-19, 0.0),
+    "J/mol": ("J/mol", 1.0, 0.0),
+    "kJ/mol": ("J/mol", 1e3, 0.0),
+    "J/g": ("J/kg", 1e3, 0.0),
+    "kJ/kg": ("J/kg", 1e3, 0.0),
+    # Length
+    "nm": ("m", 1e-9, 0.0),
+    # Volume fraction
+    "Vol.-%": ("%", 1.0, 0.0),
+    "Vol%": ("%", 1.0, 0.0),
+    "%": ("%", 1.0, 0.0),
+    # Dimensionless, i.e. refractive index
+    "": ("", 1.0, 0.0),
+}
+"""Units by spelling (without whitespace, "*" and "·", with "³" as "3"): SI unit, factor and offset to convert a value
+into the SI unit: value_si = value * factor + offset."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetQuantities(PdsValues: Series) -> DataFrame:
+    """Parses a column of German formatted quantities with units (i.e. "-19,1 °C" or "1.013 hPa bei 20 °C") into SI
+    values and units, using column operations only.\n
+    - -> | <PdsValues> Column of quantities, other values (i.e. NOT_LISTED) and unknown units give empty cells\n
+    - <- | <return> Dataframe with the columns "value" (float in SI unit) and "unit" (SI unit), same index"""
+
+    # Parse each distinct value once, i.e. NOT_LISTED or the same boiling point of many rows
+    codes, uniques = factorize(PdsValues.astype("string"), use_na_sentinel=False)
+    # Unicode minus and dashes to hyphen-minus
+    PdsStrings = Series(uniques, dtype="string").str.replace(r"[−–]", "-", regex=True)
+    DfParts = PdsStrings.str.extract(RepQUANTITY)
+
+    numbers = DfParts["number"]
+    numbers = numbers.mask(numbers.str.fullmatch(RepTHOUSANDS).fillna(False), numbers.str.replace(".", "", regex=False))
+    numbers = to_numeric(numbers.str.replace(",", ".", regex=False), errors="coerce")
+
+    units = DfParts["unit"].str.replace(r"[\s*·⋅]", "", regex=True).str.replace("³", "3", regex=False)
+    # Look up all units at once, unknown units and cells without a quantity give empty rows
+    DfUnits = DataFrame.from_dict(UNITS, orient="index", columns=["unit", "factor", "offset"])
+    DfUnits = DfUnits.reindex(units.fillna("").where(numbers.notna(), "?").to_numpy())
+
+    values = numbers.to_numpy(dtype="float64", na_value=nan) * DfUnits["factor"].to_numpy()
+    values += DfUnits["offset"].to_numpy()
+    return DataFrame(
+        {"value": values[codes], "unit": Series(DfUnits["unit"].to_numpy()[codes], dtype="string")},
+        index=PdsValues.index,
+    )
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.0     Unit test: passed
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def AddQuantityColumns(DfDataframe: DataFrame, cols: list[str]) -> DataFrame:
+    """Returns a dataframe with the parsed SI values and units (s. GetQuantities()) of some columns next to them as
+    <column>_value and <column>_unit columns.\n
+    - -> | <DfDataframe> Dataframe\n
+    - -> | <cols> Columns of quantities, columns not in the dataframe are skipped\n
+    - <- | <return> Dataframe with added columns"""
+
+    parts = []
+    for col in DfDataframe.columns:
+        parts.append(DfDataframe[col])
+        if col in cols:
+            DfQuantities = GetQuantities(DfDataframe[col])
+            parts.append(DfQuantities["value"].rename(f"{col}_value"))
+            parts.append(DfQuantities["unit"].rename(f"{col}_unit"))
+
+    return concat(parts, axis=1)
@@ -0,0 +1,56 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+from typing import Callable, NamedTuple
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.3     Documented that the callbacks are called from the processing thread
+# ++ 26-10-19    fJ      0.2     Removed GetSetting, settings are passed as RunConfig
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class Frontend(NamedTuple):
+    """Callbacks of the frontend (GUI or CLI) running the processing pipeline. Run settings aren't looked up here, they
+    are passed to the pipeline as RunConfig. The callbacks are called from the processing thread, a GUI has to run them
+    on its own thread.\n
+    - ToggleExecutionLock: Locks or unlocks the frontend while the pipeline is running\n
+    - EvaluateOnError: Reports an error that aborted the pipeline\n
+    - EvaluateAnalysis: Reports the result of a file analysis"""
+
+    ToggleExecutionLock: Callable[..., None]
+    EvaluateOnError: Callable[..., None]
+    EvaluateAnalysis: Callable[[dict[str, int | str]], None]
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+FrnFRONTEND: Frontend | None = None
+"""Frontend registered by SetFrontend(), the pipeline doesn't import the GUI so it can run headless."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def SetFrontend(frontend: Frontend):
+    """Registers the frontend the processing pipeline reports to.\n
+    - -> | <frontend> Frontend callbacks"""
+
+    global FrnFRONTEND
+    FrnFRONTEND = frontend
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetFrontend() -> Frontend:
+    """Returns the registered frontend.\n
+    - <- | <return> Frontend callbacks, raises RuntimeError if no frontend was registered"""
+
+    if FrnFRONTEND is None:
+        raise RuntimeError("No frontend registered, call SetFrontend() before running the pipeline!")
+
+    return FrnFRONTEND
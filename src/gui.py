@@ -1,12 +1,15 @@
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Imports
 # ++---------------------------------------------------------------------------------------------------------------------++#
+from collections import deque
 from ctypes import windll
 from multiprocessing import cpu_count
 from pathlib import Path
 from platform import system
+from queue import Empty, SimpleQueue
 from threading import Event, Thread
-from typing import Optional
+from time import gmtime, strftime
+from typing import Callable, Optional
 from webbrowser import open
 
 from customtkinter import BooleanVar, CTk, StringVar, Variable, set_appearance_mode, set_default_color_theme
@@ -15,8 +18,9 @@ from PIL import ImageTk
 import src.fctlib.ctk as fctCtk
 from src.fctlib.configfile import GetConfigValue, StoreConfig
 from src.fctlib.io import GetFilePaths, GetSupportedFilesFromPath
-from src.fctlib.logging import FunctionHandler, LogLOGGER
-from src.main import AnalyseFiles, ProcessFiles
+from src.fctlib.logging import FunctionHandler, LogLOGGER, LstLOGLISTENER
+from src.frontend import Frontend, SetFrontend
+from src.main import AnalyseFiles, BusPROGRESS, ProcessFiles, RunConfig
 from src.settings import (
     APP_AUTHOR,
     APP_GITHUB_LINK,
@@ -24,10 +28,14 @@ from src.settings import (
     APP_NAME,
     APP_VERSION,
     GUI_PADDING,
+    PRINTER_MAX_LINES,
+    PRINTER_POLL_INTERVAL,
+    PROGRESS_POLL_INTERVAL,
     SUPPORTED_EXTENSIONS,
     PthASSET_FILEDIALOG,
     PthASSET_ICON,
     PthCONFIG_FILE,
+    PthLOGFILE,
 )
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -39,6 +47,12 @@ GUI_PADDING_SML = int(GUI_PADDING * 0.5)
 EvtCANCEL_PROCESSING = Event()
 """Event to cancel processing."""
 
+QuePRINTER = SimpleQueue()
+"""Queue for Printer textbox entries, drained on the GUI thread. None denotes clearing the Printer textbox."""
+
+QueFRONTEND_CALLS = SimpleQueue()
+"""Queue for frontend calls of the processing threads as tuples of function, args and kwargs, run on the GUI thread."""
+
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
@@ -63,6 +77,7 @@ def GuiSetFilePaths():
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Builds the run config for processing once from the GUI variables
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-03-03    fJ      0.3     Moved file selection here to accomodate for FilePaths (before: FolderPaths)
 # ++ 24-02-26    fJ      0.2     Reworked to accomodate for splitted AnalyseFiles()/ProcessFiles()
@@ -99,18 +114,51 @@ def GuiExecute(argument: str = None):
         target = AnalyseFiles
         kwargs["file_paths"] = compatible_files
     elif argument == "processing":
+        config = GetGuiRunConfig(PthOutput=PthParent)
+        if config is None:
+            return EvaluateOnError(PthFolder=PthParent, error="Invalid Max Threads! Enter a positive number.")
+
         if EvtCANCEL_PROCESSING.is_set():
             EvtCANCEL_PROCESSING.clear()
 
         target = ProcessFiles
         kwargs["file_paths"] = compatible_files
         kwargs["EvtCancel"] = EvtCANCEL_PROCESSING
-        kwargs["run_threaded"] = bool(fctCtk.GetCtkVar(BlvRunThreaded))
+        kwargs["config"] = config
 
     ThrExecuteMain = Thread(target=target, kwargs=kwargs, daemon=True)
     ThrExecuteMain.start()
 
 
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.2     Added merge input switch
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetGuiRunConfig(PthOutput: Path) -> RunConfig | None:
+    """Builds the run config from the GUI variables, so the processing pipeline never touches them.\n
+    - -> | <PthOutput> Folder path for the output files and substance data sheets\n
+    - <- | <return> Run config or None if max threads isn't a positive number"""
+
+    run_threaded = bool(fctCtk.GetCtkVar(BlvRunThreaded))
+    try:
+        max_threads = int(fctCtk.GetCtkVar(StvMaxThreads))
+    except ValueError:
+        max_threads = 0
+    if max_threads < 1 and run_threaded:
+        return None
+
+    return RunConfig(
+        query_cheminfo=bool(fctCtk.GetCtkVar(BlvQueryChemInfo)),
+        query_pubchem=bool(fctCtk.GetCtkVar(BlvQueryPubChem)),
+        query_gestis=bool(fctCtk.GetCtkVar(BlvQueryGestis)),
+        run_threaded=run_threaded,
+        max_threads=max(max_threads, 1),
+        output_folder=PthOutput,
+        merge_input=bool(fctCtk.GetCtkVar(BlvMergeInput)),
+    )
+
+
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
@@ -159,6 +207,7 @@ def EvaluateOnError(PthFolder: Path, error: str, show_in_gui: Optional[bool] = T
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Log the execution time
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-21    fJ      0.2     Reworked
 # ++ 24-02-11    fJ      0.1     Created
@@ -169,6 +218,7 @@ def EvaluateAnalysis(report: dict[str, int | str]):
 
     LblHideProgress.lift()
     SetWdgPrinterText(print="", clear_printer=True)
+    LogLOGGER.userinfo(f"Analysed after {report["execution_time"]:.2f} s!")
     fctCtk.SetCtkVar(CtkWidget=StvCurrentJob, value="File Analysis:")
     fctCtk.SetCtkVar(CtkWidget=StvFilesCnt, value=report["files_count"])
     fctCtk.SetCtkVar(CtkWidget=StvChemsCnt, value=report["chems_count"])
@@ -180,6 +230,7 @@ def EvaluateAnalysis(report: dict[str, int | str]):
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Rendered from GuiPollProgress() on the GUI thread, added throughput and ETA
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-21    fJ      0.2     Reworked
 # ++ 24-02-11    fJ      0.1     Created
@@ -209,8 +260,13 @@ def EvaluateProzessing(report: dict[str, int | str | None] | None, final: bool =
     LblHideProgress.lower()
 
     if not final:
+        rates = (
+            f" | {report['throughput']:.2f} chemicals/s, ETA {strftime('%H:%M:%S', gmtime(report['eta']))}"
+            if report.get("eta") is not None
+            else str()
+        )
         LogLOGGER.userinfo(
-            f"Working on File {report['file_no']}|{report['files_count']} ({report['file_name']}): Chemical {report['chem_no']}|{report['chems_count']} (<{report['chem_id']}>) ..."
+            f"Working on File {report['file_no']}|{report['files_count']} ({report['file_name']}): Chemical {report['chem_no']}|{report['chems_count']} (<{report['chem_id']}>) ...{rates}"
         )
         return
 
@@ -220,6 +276,47 @@ def EvaluateProzessing(report: dict[str, int | str | None] | None, final: bool =
     return
 
 
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GuiQueueCall(function: Callable[..., None]) -> Callable[..., None]:
+    """Wraps a GUI function, so calls of the processing threads are queued and run by GuiPollProgress() instead.\n
+    - -> | <function> GUI function to wrap\n
+    - <- | <return> Function queueing the call with its arguments"""
+
+    def QueueCall(*args, **kwargs):
+        QueFRONTEND_CALLS.put((function, args, kwargs))
+
+    return QueueCall
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.2     Run the queued frontend calls of the processing threads
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GuiPollProgress():
+    """Runs the queued frontend calls and renders the progress reports published by the processing threads, then
+    reschedules itself.\n
+    Runs on the GUI thread, so CTk widgets are never touched by the processing threads. Intermediate reports are coalesced
+    by the progress bus, so the GUI renders at most one of them per poll interval."""
+
+    # Frontend calls go first: the execution lock is set before the first report and errors are reported after the
+    # progress bus was cleared, so the final report or error of a short run is never overwritten by the lock
+    while True:
+        try:
+            function, args, kwargs = QueFRONTEND_CALLS.get_nowait()
+        except Empty:
+            break
+        function(*args, **kwargs)
+
+    for report, final in BusPROGRESS.Drain():
+        EvaluateProzessing(report=report, final=final)
+
+    CtkGui.after(PROGRESS_POLL_INTERVAL, GuiPollProgress)
+
+
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
@@ -245,21 +342,61 @@ def GuiCancel():
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Queues the text for GuiPollPrinter() instead of prepending it to the Printer textbox
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-09    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
 def SetWdgPrinterText(print: str | list[str], clear_printer: bool = False):
-    """Sets the text of the Printer textbox.\n
+    """Sets the text of the Printer textbox. Safe to call from any thread, the text is rendered by GuiPollPrinter().\n
     - -> | <print> Text to print\n
     - -> | <clear_printer> Switch to clear the Printer textbox before printing"""
 
     if clear_printer:
-        TxbPrinter.delete(index1="0.0", index2="end")
+        QuePRINTER.put(None)
 
-    if isinstance(print, str):
-        TxbPrinter.insert(index="0.0", text=print)
-    else:
-        TxbPrinter.insert(index="0.0", text="\n".join(print))
+    text = print if isinstance(print, str) else "\n".join(print)
+    if text:
+        QuePRINTER.put(text)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GuiPollPrinter():
+    """Renders queued entries in the Printer textbox in a single batch and reschedules itself.\n
+    Entries are collected in a ring buffer of PRINTER_MAX_LINES entries, so bursts of log entries never cost more than one
+    bounded insert. The textbox itself keeps PRINTER_MAX_LINES lines, the full log is written to the log file."""
+
+    entries: deque[str] = deque(maxlen=PRINTER_MAX_LINES)
+    clear_printer = False
+    while True:
+        try:
+            entry = QuePRINTER.get_nowait()
+        except Empty:
+            break
+        if entry is None:
+            entries.clear()
+            clear_printer = True
+            continue
+        entries.append(entry)
+
+    if clear_printer:
+        TxbPrinter.delete(index1="1.0", index2="end")
+    if entries:
+        fctCtk.AppendTextboxText(CtkWidget=TxbPrinter, text="".join(entries), max_lines=PRINTER_MAX_LINES)
+
+    CtkGui.after(PRINTER_POLL_INTERVAL, GuiPollPrinter)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def OpenLogFile():
+    """Opens the full log file in the systems default application."""
+
+    open(url=PthLOGFILE.as_uri(), new=2, autoraise=True)
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -678,6 +815,26 @@ BtnToggleLog = fctCtk.CtkButton(
         "pady": 0,
     },
 )
+# Main -> Tab 1: Button Full Log
+BtnOpenLogFile = fctCtk.CtkButton(
+    Widget={
+        "master": TabProcessing,
+        "base_size": fctCtk.STD_SIZE - 2,
+        "width": 1,
+        "fg_color": ["gray85", "gray15"],
+        "font_color": ["gray10", "#DCE4EE"],
+        "text": "Full Log ...",
+        "font_bold": True,
+        "FncCommand": OpenLogFile,
+    },
+    Grid={
+        "row": 4,
+        "column": 0,
+        "padx": 0,
+        "pady": (GUI_PADDING_SML, 0),
+        "sticky": "new",
+    },
+)
 # Main -> Tab 1: Frame Progress
 FrmProgress = fctCtk.CtkFrame(
     Widget={
@@ -737,7 +894,8 @@ LblHideProgress = fctCtk.CtkLabel(
 )
 # Main: Tab 2
 TabSettings = TabMain.tab("Settings")
-TabSettings.grid_rowconfigure(0, weight=1)
+# The last row takes the remaining height, so the frames stay at the top
+TabSettings.grid_rowconfigure(1, weight=1)
 # TODO: This seems stupid ... but it works for now
 TabSettings.grid_columnconfigure(0, weight=4)
 TabSettings.grid_columnconfigure(1, weight=1)
@@ -889,6 +1047,53 @@ EntMaxThreads = fctCtk.CtkEntry(
     },
 )
 
+# Main -> Tab 2: Frame Output
+FrmOutput = fctCtk.CtkFrame(
+    Widget={
+        "master": TabSettings,
+    },
+    Grid={
+        "row": 1,
+        "column": 1,
+        "padx": GUI_PADDING_SML,
+        "pady": GUI_PADDING_SML,
+        "sticky": "new",
+        "colconfig": 0,
+    },
+)
+# Main -> Tab 2 -> Frame 3: Label Output
+LblOutput = fctCtk.CtkLabel(
+    Widget={
+        "master": FrmOutput,
+        "fg_color": ["gray75", "gray25"],
+        "text": "Output Settings",
+        "font_bold": True,
+    },
+    Grid={
+        "row": 0,
+        "column": 0,
+        "padx": GUI_PADDING_SML,
+        "pady": GUI_PADDING_SML,
+    },
+)
+# Main -> Tab 2 -> Frame 3: Checkbox Merge Input
+BlvMergeInput = BooleanVar()
+ChbMergeInput = fctCtk.CtkCheckbox(
+    Widget={
+        "master": FrmOutput,
+        "base_size": fctCtk.STD_SIZE - 2,
+        "text": "Input Rows next to Results",
+        "variable": BlvMergeInput,
+        "font_bold": True,
+    },
+    Grid={
+        "row": 1,
+        "column": 0,
+        "padx": GUI_PADDING,
+        "pady": GUI_PADDING_SML,
+    },
+)
+
 
 # Main: Printer
 TxbPrinter = fctCtk.CtkTextbox(
@@ -947,6 +1152,7 @@ BtnVersion = fctCtk.CtkButton(
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Added output settings
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-03-02    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -969,6 +1175,9 @@ def GuiInitConfig():
             "run_threaded": False,
             "max_threads": cpu_count(),
         },
+        "OUTPUT": {
+            "merge_input": False,
+        },
         "DEBUG": {
             "debug_mode": False,
         },
@@ -979,6 +1188,7 @@ def GuiInitConfig():
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Store output settings
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-27    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -998,6 +1208,9 @@ def OnGuiExit():
             "run_threaded": fctCtk.GetCtkVar(BlvRunThreaded),
             "max_threads": fctCtk.GetCtkVar(StvMaxThreads),
         },
+        "OUTPUT": {
+            "merge_input": fctCtk.GetCtkVar(BlvMergeInput),
+        },
         "DEBUG": {
             "debug_mode": GetConfigValue("DEBUG", "debug_mode"),
         },
@@ -1009,6 +1222,10 @@ def OnGuiExit():
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.4     Queue the frontend calls of the processing threads for the GUI thread
+# ++ 26-10-19    fJ      1.3     Set the output settings from the config file
+# ++ 26-10-19    fJ      1.2     Registers the GUI as frontend of the processing pipeline
+# ++ 26-10-19    fJ      1.1     Added polling of the progress bus and the Printer queue, handlers live in the log listener
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-27    fJ      0.4     Added OnGuiExit to store config to a file
 # ++ 24-02-20    fJ      0.3     Refactored
@@ -1018,8 +1235,17 @@ def OnGuiExit():
 def StartGui():
     """Sets up and starts the GUI."""
 
+    # Register the GUI as frontend of the processing pipeline, its calls are run on the GUI thread by GuiPollProgress()
+    SetFrontend(
+        Frontend(
+            ToggleExecutionLock=GuiQueueCall(GuiToggleExecutionLock),
+            EvaluateOnError=GuiQueueCall(EvaluateOnError),
+            EvaluateAnalysis=GuiQueueCall(EvaluateAnalysis),
+        )
+    )
+
     # Setup loggings FunctionHandler for the Printer function
-    for LhdHandler in LogLOGGER.handlers:
+    for LhdHandler in LstLOGLISTENER.handlers:
         if isinstance(LhdHandler, FunctionHandler):
             LhdHandler.set_function(SetWdgPrinterText)
 
@@ -1032,11 +1258,16 @@ def StartGui():
     fctCtk.SetCtkVar(CtkWidget=BlvQueryGestis, value=GetConfigValue("QUERY", "gestis"))
     fctCtk.SetCtkVar(CtkWidget=BlvRunThreaded, value=GetConfigValue("THREADING", "run_threaded"))
     fctCtk.SetCtkVar(CtkWidget=StvMaxThreads, value=GetConfigValue("THREADING", "max_threads"))
+    fctCtk.SetCtkVar(CtkWidget=BlvMergeInput, value=GetConfigValue("OUTPUT", "merge_input"))
 
     # TODO: This seems stupid ... but it works for now
     CtkGui.after(30, fctCtk.SetCtkVar, StvCurrentJob, "")
     CtkGui.after(30, fctCtk.ToggleWidgetVisibility, TxbPrinter, True)
 
+    # Start polling the progress bus and the Printer queue
+    CtkGui.after(PROGRESS_POLL_INTERVAL, GuiPollProgress)
+    CtkGui.after(PRINTER_POLL_INTERVAL, GuiPollPrinter)
+
     # Bind post-close protocol to the GUI
     CtkGui.protocol("WM_DELETE_WINDOW", OnGuiExit)
 
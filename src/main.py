@@ -2,25 +2,52 @@
 # ++ Imports
 # ++---------------------------------------------------------------------------------------------------------------------++#
 from collections import namedtuple
+from datetime import datetime
+from multiprocessing import get_context
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue as ProcessQueue
 from pathlib import Path
-from queue import Queue
+from queue import Empty, Queue
+from secrets import token_bytes
 from threading import Event, Thread
-from time import sleep
-from typing import NamedTuple
+from time import perf_counter, sleep
+from typing import Any, NamedTuple
 
 from selenium.webdriver.chrome.webdriver import WebDriver
 
-import src.gui as gui
-from src.fctlib.ctk import GetCtkVar
-from src.fctlib.logging import LogLOGGER
-from src.fctlib.pandas import GetDfFromFilePath, GetDfFromNtList, GetUniqueColsFromDf, WriteDfToXlsx
+from src.fctlib.broker import BrokerManager, ConnectBroker, GetWorkerId, JobTracker, RunWorker, StartBroker
+from src.fctlib.cache import FileCache
+from src.fctlib.circuitbreaker import ResetCircuitBreakers
+from src.fctlib.columnar import ColumnarBuffer
+from src.fctlib.decorators import BdgRETRIES, Timer
+from src.fctlib.fuzzy import NameMatcher
+from src.fctlib.logging import AttachProcessLogQueue, GetProcessLogQueue, LogLOGGER
+from src.fctlib.metrics import RegMETRICS, StmMETRICS
+from src.fctlib.pandas import OUTPUT_WRITERS, WriteMergedDfToXlsx
+from src.fctlib.progress import ProgressBus
+from src.fctlib.querytable import GetQueryTableFromFilePath, QueryTable
 from src.fctlib.regex import CheckCasNo
 from src.fctlib.selenium import WEBDRIVERS, InitWebDriversForThreading, QueWEBDRIVERS, QuitWebDrivers
+from src.fctlib.synonyms import IdxSYNONYMS
 from src.fctlib.time import GetRunTime
-from src.queries.chemikalieninfo import NtpCI_CONSTRUCTOR, QueryChemInfo
+from src.fctlib.units import AddQuantityColumns
+from src.frontend import GetFrontend
+from src.queries.chemikalieninfo import QUANTITY_FIELDS, NtpCI_CONSTRUCTOR, QueryChemInfo
 from src.queries.gestis import NtpGT_CONSTRUCTOR, QueryGestis
-from src.queries.pubchem import NtpPC_CONSTRUCTOR, QueryPubChem
-from src.settings import SUPPORTED_REQUEST_COL_NAMES
+from src.queries.pubchem import BktPUBCHEM, NtpPC_CONSTRUCTOR, QueryPubChem
+from src.settings import (
+    BROKER_CONNECT_TIMEOUT,
+    FILE_CACHE_SIZE,
+    FILE_READ_PARALLEL_MIN_BYTES,
+    FILE_READ_PROCESSES,
+    METRICS_CPU_PROFILE,
+    METRICS_FILE_FORMAT,
+    METRICS_TRACE_MEMORY,
+    NOT_LISTED,
+    SUPPORTED_REQUEST_COL_NAMES,
+    WORKER_STOP_TIMEOUT,
+    PthMETRICS_FOLDER,
+)
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Module variables
@@ -29,69 +56,164 @@ REPORT: dict[str, int | str] = {}
 """Process report dictionary."""
 
 QueQUERY = Queue()
-"""Queue for query data."""
+"""Queue for query data, items are tuples: query number, query terms, enqueue time."""
 QueOUTPUT = Queue()
 """Queue for output data."""
 
+BusPROGRESS = ProgressBus()
+"""Progress bus for reporting processing progress to the frontend, which polls it from its own thread."""
+
+CacQUERY_TABLES = FileCache(name="QueryTables", max_entries=FILE_CACHE_SIZE)
+"""Query tables of parsed input files, reused until a file changes."""
+
+MgrBROKER: BrokerManager | None = None
+"""Broker serving query jobs to worker processes in distributed runs."""
+LstWORKER_PROCESSES: list[BaseProcess] = []
+"""Local worker processes of distributed runs."""
+
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.4     Added merge input switch
+# ++ 26-10-19    fJ      0.3     Added output formats
+# ++ 26-10-19    fJ      0.2     Added worker process and broker settings
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class RunConfig(NamedTuple):
+    """Immutable settings of a processing run, built once by the frontend and passed through the pipeline.\n
+    Worker threads never touch frontend (Tk) variables, and the settings can be pickled to worker processes."""
+
+    query_cheminfo: bool = True
+    """Switch to query Chemikalieninfo."""
+    query_pubchem: bool = True
+    """Switch to query PubChem."""
+    query_gestis: bool = True
+    """Switch to query Gestis."""
+    run_threaded: bool = False
+    """Switch to run processing in multiple threads instead of a single one."""
+    max_threads: int = 1
+    """Maximum number of webdriver threads."""
+    output_folder: Path = Path.cwd()
+    """Folder path for the output files and substance data sheets."""
+    processes: int = 0
+    """Number of local worker processes, each owning its own webdriver. 0 runs without local worker processes."""
+    broker_address: tuple[str, int] | None = None
+    """Host and port to serve jobs on for worker processes on other hosts, None only serves local worker processes."""
+    broker_authkey: bytes = b""
+    """Key worker processes have to authenticate with, a random one is used for local worker processes if empty."""
+    output_formats: tuple[str, ...] = (".xlsx",)
+    """Extensions of the output files written per input file, s. OUTPUT_WRITERS."""
+    merge_input: bool = False
+    """Switch to write the input rows side by side with their results to the .xlsx output files."""
+
+    @property
+    def run_distributed(self) -> bool:
+        """Switch to run processing in worker processes, takes precedence over threaded processing."""
+        return self.processes > 0 or self.broker_address is not None
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.9     Query only exact name matches by CAS number
+# ++ 26-10-19    fJ      1.8     Clean up and fuzzy match the names of name-only rows
+# ++ 26-10-19    fJ      1.7     Resolve name-only rows to CAS numbers by the synonym index
+# ++ 26-10-19    fJ      1.6     Parse uncached files in parallel processes
+# ++ 26-10-19    fJ      1.5     Reuse the query tables of unchanged files from CacQUERY_TABLES
+# ++ 26-10-19    fJ      1.4     Build a query table per file with column operations instead of iterating rows
+# ++ 26-10-19    fJ      1.3     Only load the identifier columns of the files
+# ++ 26-10-19    fJ      1.2     Report errors to the registered frontend instead of the GUI
+# ++ 26-10-19    fJ      1.1     Added Timer decorator
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-25    fJ      0.3     Replaced os.path with pathlib.Path
 # ++ 24-02-21    fJ      0.2     Reworked
 # ++ 24-02-10    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def PreprocessFiles(file_paths: list[Path]) -> dict[str, dict[int, list[str] | None]] | None:
+@Timer
+def PreprocessFiles(file_paths: list[Path]) -> dict[str, QueryTable] | None:
     """Constructs a queries dictionary for query analysis or processing from given folder path.\n
     - -> | <file_paths> List of file paths\n
-    - <- | <return> Queries dictionary, structure: {File Name, {Entry Number, [Entry ID, first is valid CAS or None] | None if empty line}}"""
+    - <- | <return> Queries dictionary, structure: {File Name, Query table of the file's rows}"""
 
-    queries: dict[str, dict[int, list[str] | None]] = {}
+    queries: dict[str, QueryTable] = {}
     PthParent = next((PthFile.parent for PthFile in file_paths if PthFile.is_file()), None)
+    MtcNames = NameMatcher(index=IdxSYNONYMS)
+
+    # Parse the files in parallel processes, they are then taken from the cache in the order of file_paths
+    CacQUERY_TABLES.Preload(
+        file_paths,
+        GetQueryTableFromFilePath,
+        tuple(SUPPORTED_REQUEST_COL_NAMES),
+        max_workers=FILE_READ_PROCESSES,
+        min_bytes=FILE_READ_PARALLEL_MIN_BYTES,
+    )
 
     for PthFile in file_paths:
         file_name = PthFile.name
-        DfFile = GetDfFromFilePath(PthFile)
-        if DfFile is None:
-            return gui.EvaluateOnError(PthFolder=PthParent, error=f"Can't access <{file_name}>! Is it currently open?")
-
-        DfIdentifierCols = GetUniqueColsFromDf(DfDataframe=DfFile, cols_to_search=SUPPORTED_REQUEST_COL_NAMES)
+        try:
+            qry_table = CacQUERY_TABLES.GetOrLoad(
+                PthFile, GetQueryTableFromFilePath, tuple(SUPPORTED_REQUEST_COL_NAMES)
+            )
+        except PermissionError:
+            return GetFrontend().EvaluateOnError(
+                PthFolder=PthParent, error=f"Can't access <{file_name}>! Is it currently open?"
+            )
 
-        if not DfIdentifierCols.shape[1]:
-            continue
-
-        queries[file_name] = {}
         # Skip files without supported identifier columns
-        if DfIdentifierCols.shape[1] == 0:
+        if qry_table is None:
             continue
 
-        for row_num, PdsRows in DfIdentifierCols.iterrows():
-            # Skip completely empty rows
-            if PdsRows.isna().all():
-                queries[file_name][row_num] = None
-                continue
-
-            for Cell in PdsRows:
-                if queries[file_name].get(row_num) is None:
-                    queries[file_name][row_num] = [str(Cell)] if CheckCasNo(str(Cell)) else [None]
-                else:
-                    queries[file_name][row_num].append(str(Cell))
+        # Query name-only rows by the CAS number found for the exact name in past runs, clean up their names otherwise.
+        # Similar names are only reported in the output, they may be isomers or homologues.
+        queries[file_name] = qry_table.RewriteTerms(MtcNames.Rewrite)
+        if resolved_count := queries[file_name].cas_count - qry_table.cas_count:
+            LogLOGGER.info(f"Resolved {resolved_count} name(s) of <{file_name}> to CAS numbers by the synonym index.")
 
     if not queries:
-        return gui.EvaluateOnError(PthFolder=PthParent, error="No file with specified identifier columns found!")
+        return GetFrontend().EvaluateOnError(
+            PthFolder=PthParent, error="No file with specified identifier columns found!"
+        )
 
     return queries
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetKnownSynonyms(query_terms: list[str], *datasets: dict[str, Any]) -> set[str]:
+    """Collects the names and CAS numbers of a chemical known so far, to rank ambiguous hits of the next source.\n
+    - -> | <query_terms> List of terms for a chemical to query for\n
+    - -> | <datasets> Compound data of the sources queried so far\n
+    - <- | <return> Set of names and CAS numbers"""
+
+    synonyms = {query_term for query_term in query_terms if query_term}
+    for dataset in datasets:
+        synonyms.add(dataset.get("id_cas"))
+        synonyms.add(dataset.get("name_iupac_eng"))
+        synonyms.update(str(dataset.get("name_registered_ger", "")).split("|"))
+        synonyms.update(str(dataset.get("name_registered_eng", "")).split("|"))
+        synonyms.update(cas for cas in str(dataset.get("cas_numbers", "")).split(", ") if CheckCasNo(cas))
+
+    return {synonym for synonym in synonyms if isinstance(synonym, str) and synonym.strip() and synonym != NOT_LISTED}
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.5     Only index the names found by a CAS number from the input or an exact name match
+# ++ 26-10-19    fJ      1.4     Rank ambiguous hits with the names and CAS numbers known from the other sources
+# ++ 26-10-19    fJ      1.3     Read the query switches from the run config, passed once per run
+# ++ 26-10-19    fJ      1.2     Read the query switches from the registered frontend instead of Tk variables
+# ++ 26-10-19    fJ      1.1     Record per source query time to StmMETRICS
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-22    fJ      0.2     Reworked
 # ++ 24-02-04    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def GetQueryDataset(query_terms: list[str], WdrDriver: WebDriver = None, EvtCancel: Event | None = None) -> NamedTuple:
+def GetQueryDataset(
+    query_terms: list[str], config: RunConfig, WdrDriver: WebDriver = None, EvtCancel: Event | None = None
+) -> NamedTuple:
     """Collects queried data from web services.\n
     - -> | <query_terms> List of terms for a chemical to query for\n
+    - -> | <config> Run config\n
     - -> | <WdrDriver> Webdriver to use\n
     - -> | <EvtCancel> Cancel event to listen to\n
     - <- | <return> Compound dataset from different webservices"""
@@ -99,9 +221,12 @@ def GetQueryDataset(query_terms: list[str], WdrDriver: WebDriver = None, EvtCanc
     data_cheminfo = {}
     data_pubchem = {}
     data_gestis = {}
+    # Only the CAS number from the input or from an exact name match identifies the chemical, so only the names found
+    # by it are kept in the synonym index. Names found by a name query might belong to another chemical.
+    indexed_cas = query_terms[0]
 
     # Query Chemikalieninfo
-    if GetCtkVar(CtkWidget=gui.BlvQueryChemInfo):
+    if config.query_cheminfo:
         for query_term in query_terms:
             if EvtCancel is not None and EvtCancel.is_set():
                 return NtpEMPTY
@@ -110,7 +235,13 @@ def GetQueryDataset(query_terms: list[str], WdrDriver: WebDriver = None, EvtCanc
             if query_term is None or "Success!" in data_cheminfo.get("query_status_ci", str()):
                 continue
 
-            data_cheminfo = QueryChemInfo(WdrDriver=WdrDriver, query_term=query_term)
+            with StmMETRICS.Context(source="Chemikalieninfo"), StmMETRICS.Measure("query"):
+                data_cheminfo = QueryChemInfo(
+                    WdrDriver=WdrDriver,
+                    query_term=query_term,
+                    synonyms=GetKnownSynonyms(query_terms),
+                    index_synonyms=query_term == indexed_cas,
+                )
             if "Success!" not in data_cheminfo.get("query_status_ci", str()):
                 LogLOGGER.userinfo(f">>> {data_cheminfo['query_status_ci']}")
 
@@ -120,7 +251,7 @@ def GetQueryDataset(query_terms: list[str], WdrDriver: WebDriver = None, EvtCanc
         query_terms[0] = data_cheminfo["id_cas"]
 
     # Query PubChem
-    if GetCtkVar(CtkWidget=gui.BlvQueryPubChem):
+    if config.query_pubchem:
         for query_term in query_terms:
             if EvtCancel is not None and EvtCancel.is_set():
                 return NtpEMPTY
@@ -129,12 +260,13 @@ def GetQueryDataset(query_terms: list[str], WdrDriver: WebDriver = None, EvtCanc
             if query_term is None or "Success!" in data_pubchem.get("query_status_pc", str()):
                 continue
 
-            data_pubchem = QueryPubChem(query_term)
+            with StmMETRICS.Context(source="PubChem"), StmMETRICS.Measure("query"):
+                data_pubchem = QueryPubChem(query_term, index_synonyms=query_term == indexed_cas)
             if "Success!" not in data_pubchem.get("query_status_pc", str()):
                 LogLOGGER.userinfo(f">>> {data_pubchem['query_status_pc']}")
 
     # Query Gestis
-    if GetCtkVar(CtkWidget=gui.BlvQueryGestis):
+    if config.query_gestis:
         for query_term in query_terms:
             if EvtCancel is not None and EvtCancel.is_set():
                 return NtpEMPTY
@@ -143,7 +275,13 @@ def GetQueryDataset(query_terms: list[str], WdrDriver: WebDriver = None, EvtCanc
             if query_term is None or "Success!" in data_gestis.get("query_status_gt", str()):
                 continue
 
-            data_gestis = QueryGestis(WdrDriver=WdrDriver, query_term=query_term)
+            with StmMETRICS.Context(source="Gestis"), StmMETRICS.Measure("query"):
+                data_gestis = QueryGestis(
+                    WdrDriver=WdrDriver,
+                    query_term=query_term,
+                    PthOutput=config.output_folder,
+                    synonyms=GetKnownSynonyms(query_terms, data_cheminfo, data_pubchem),
+                )
             if "Success!" not in data_gestis.get("query_status_gt", str()):
                 LogLOGGER.userinfo(f">>> {data_gestis['query_status_gt']}")
 
@@ -152,29 +290,38 @@ def GetQueryDataset(query_terms: list[str], WdrDriver: WebDriver = None, EvtCanc
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.2     Added run config
+# ++ 26-10-19    fJ      1.1     Record queue wait, driver checkout and chemical time to StmMETRICS
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-27    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def WebDriverListener(QueData: Queue, QueOutput: Queue):
+def WebDriverListener(QueData: Queue, QueOutput: Queue, config: RunConfig):
     """Listener for data processing in threaded runs.\n
     - -> | <QueData> Data queue to pull data from\n
     - -> | <QueOutput> Output queue to push output into\n
+    - -> | <config> Run config\n
     Source: https://gist.github.com/wooddar/df4c89f381fa20ce819e94782dc5bc04"""
 
     while True:
         # Get any currently available data from the data queue, blocking until data is available
-        qry_number, current_data = QueData.get()
+        qry_number, current_data, enqueued = QueData.get()
 
         # Stop the listener in case of a stop signal and put the stop signal back on the queue to poison other listeners
         if qry_number == -1 and current_data == ["STOP"]:
-            QueData.put((qry_number, current_data))
+            QueData.put((qry_number, current_data, enqueued))
             break
 
-        # Get any currently available worker ID from the webdriver queue, blocking until one is available
-        worker_id = QueWEBDRIVERS.get()
-        WdrDriver = WEBDRIVERS[worker_id]
+        chem_id = next((chem_id for chem_id in current_data if chem_id is not None))
+        with StmMETRICS.Context(file=REPORT.get("file_name"), row=qry_number, chem_id=chem_id):
+            StmMETRICS.Record("queue_wait", perf_counter() - enqueued)
 
-        dataset = GetQueryDataset(WdrDriver=WdrDriver, query_terms=current_data)
+            # Get any currently available worker ID from the webdriver queue, blocking until one is available
+            with StmMETRICS.Measure("driver_checkout"):
+                worker_id = QueWEBDRIVERS.get()
+            WdrDriver = WEBDRIVERS[worker_id]
+
+            with StmMETRICS.Measure("chemical"):
+                dataset = GetQueryDataset(WdrDriver=WdrDriver, query_terms=current_data, config=config)
         QueOutput.put((qry_number, dataset))
 
         # Put the now freed webdriver back onto the webdriver queue
@@ -186,17 +333,24 @@ def WebDriverListener(QueData: Queue, QueOutput: Queue):
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.2     Read the max threads from the run config
+# ++ 26-10-19    fJ      1.1     Read the max threads from the registered frontend instead of a Tk variable
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-27    fJ      0.1     Created from ProcessFiles()
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def InitMultiThreadProcessing():
-    """Initialises webdrivers for multithreading."""
+def InitMultiThreadProcessing(config: RunConfig):
+    """Initialises webdrivers for multithreading.\n
+    - -> | <config> Run config"""
 
-    max_threads = min(int(REPORT["chems_count"]), int(GetCtkVar(CtkWidget=gui.StvMaxThreads)))
+    max_threads = min(int(REPORT["chems_count"]), config.max_threads)
 
     InitWebDriversForThreading(max_threads=max_threads)
     web_driver_listener = [
-        Thread(target=WebDriverListener, kwargs={"QueData": QueQUERY, "QueOutput": QueOUTPUT}, daemon=True)
+        Thread(
+            target=WebDriverListener,
+            kwargs={"QueData": QueQUERY, "QueOutput": QueOUTPUT, "config": config},
+            daemon=True,
+        )
         for _ in list(range(max_threads))
     ]
 
@@ -207,97 +361,304 @@ def InitMultiThreadProcessing():
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.5     Collect the datasets in a columnar buffer instead of a list of named tuples
+# ++ 26-10-19    fJ      1.4     Take the file's query table instead of a queries dictionary
+# ++ 26-10-19    fJ      1.3     Added run config
+# ++ 26-10-19    fJ      1.2     Record chemical time to StmMETRICS
+# ++ 26-10-19    fJ      1.1     Publish progress to BusPROGRESS instead of setting the GUI from the worker thread
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-27    fJ      0.1     Created from ProcessFiles()
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def SingleThreadProcessing(qry_dict: dict[str, list[str] | None], EvtCancel: Event) -> list[NamedTuple]:
+def SingleThreadProcessing(qry_table: QueryTable, config: RunConfig, EvtCancel: Event) -> ColumnarBuffer:
     """Processes files in the given folder and outputs web datasets .xlsx file. Runs queries in a single thread.\n
-    - -> | <qry_dict> Dictionary containing query number and query terms\n
+    - -> | <qry_table> Query table of the file\n
+    - -> | <config> Run config\n
     - -> | <EvtCancel> Cancel event to listen to\n
-    - <- | <return> List of compound datasets from different webservices"""
+    - <- | <return> Compound datasets from different webservices, one row per file row"""
 
-    query_datasets: list[NamedTuple] = []
+    query_datasets = ColumnarBuffer(fields=NtpCONSTRUCTOR._fields, rows_count=len(qry_table))
 
-    for _, qry_terms in qry_dict.items():
+    for qry_number, qry_terms in qry_table.items():
         if EvtCancel.is_set():
-            return []
+            return query_datasets
 
+        # Rows without query terms stay empty
         if qry_terms is None:
-            query_datasets.append(NtpEMPTY)
             continue
 
         REPORT["chem_no"] = REPORT["chem_no"] + 1
         REPORT["chem_id"] = next((chem_id for chem_id in qry_terms if chem_id is not None))
         REPORT["cas_no"] = REPORT["cas_no"] + 1 if qry_terms[0] is not None else REPORT["cas_no"]
-        gui.EvaluateProzessing(report=REPORT, final=False)
+        BusPROGRESS.Publish(report=REPORT, final=False)
 
-        query_datasets.append(GetQueryDataset(query_terms=qry_terms, EvtCancel=EvtCancel))
+        with (
+            StmMETRICS.Context(file=REPORT["file_name"], row=qry_number, chem_id=REPORT["chem_id"]),
+            StmMETRICS.Measure("chemical"),
+        ):
+            dataset = GetQueryDataset(query_terms=qry_terms, config=config, EvtCancel=EvtCancel)
+        query_datasets.SetRow(qry_number, dataset)
 
     return query_datasets
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.4     Collect the datasets in a columnar buffer instead of a list of named tuples
+# ++ 26-10-19    fJ      1.3     Take the file's query table instead of a queries dictionary
+# ++ 26-10-19    fJ      1.2     Pass enqueue time with query data to measure queue wait
+# ++ 26-10-19    fJ      1.1     Publish progress to BusPROGRESS, dropped the settle-down pause that throttled the GUI
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-26    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def MultiThreadProcessing(qry_dict: dict[str, list[str]]) -> list[NamedTuple]:
+def MultiThreadProcessing(qry_table: QueryTable) -> ColumnarBuffer:
     """Processes files in the given folder and outputs web datasets .xlsx file. Runs queries as separate threads.\n
-    - -> | <qry_dict> Dictionary containing query number and query terms\n
-    - <- | <return> List of compound datasets from different webservices\n
+    - -> | <qry_table> Query table of the file\n
+    - <- | <return> Compound datasets from different webservices, one row per file row\n
     Source: https://gist.github.com/wooddar/df4c89f381fa20ce819e94782dc5bc04"""
 
-    query_datasets: list[NamedTuple] = [None] * len(qry_dict)
+    query_datasets = ColumnarBuffer(fields=NtpCONSTRUCTOR._fields, rows_count=len(qry_table))
 
-    for qry_number, qry_terms in qry_dict.items():
-        if qry_terms is None:
-            query_datasets[qry_number] = NtpEMPTY
-            continue
-
-        QueQUERY.put((qry_number, qry_terms))
+    # Rows without query terms stay empty
+    for qry_number, qry_terms in qry_table.items():
+        if qry_terms is not None:
+            QueQUERY.put((qry_number, qry_terms, perf_counter()))
 
-    while query_datasets.count(None) > 0:
+    for _ in range(qry_table.chems_count):
         qry_number, dataset = QueOUTPUT.get()
-        query_datasets[qry_number] = dataset
+        query_datasets.SetRow(qry_number, dataset)
 
         REPORT["chem_no"] = REPORT["chem_no"] + 1
-        REPORT["chem_id"] = next((chem_id for chem_id in list(qry_dict.values())[qry_number] if chem_id is not None))
-        REPORT["cas_no"] = REPORT["cas_no"] + 1 if list(qry_dict.values())[qry_number][0] is not None else REPORT["cas_no"]
-        gui.EvaluateProzessing(report=REPORT, final=False)
+        qry_terms = qry_table.GetTerms(qry_number)
+        REPORT["chem_id"] = next((chem_id for chem_id in qry_terms if chem_id is not None))
+        REPORT["cas_no"] = REPORT["cas_no"] + 1 if qry_terms[0] is not None else REPORT["cas_no"]
+        BusPROGRESS.Publish(report=REPORT, final=False)
 
-        # Pause to let everything settle down
-        sleep(0.1)
+    return query_datasets
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.4     Send the names to index back with the dataset of each chemical
+# ++ 26-10-19    fJ      0.3     Share PubChem's rate limit with all workers of the broker
+# ++ 26-10-19    fJ      0.2     Forward the log records of local worker processes to the coordinator
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def RunQueryWorker(
+    address: tuple[str, int], authkey: bytes, PthOutput: Path | None = None, QueLogRecords: ProcessQueue | None = None
+) -> int:
+    """Queries chemicals pulled from the broker with an own webdriver until the coordinator finishes. Runs in a local
+    worker process or, started from the command line, on another host.\n
+    - -> | <address> Host and port of the broker\n
+    - -> | <authkey> Key to authenticate with\n
+    - -> | <PthOutput> Folder path for substance data sheets on this host, None uses the coordinator's output folder\n
+    - -> | <QueLogRecords> Log queue of the coordinator for local worker processes (s. GetProcessLogQueue()), None
+    logs on this host\n
+    - <- | <return> Number of queried chemicals"""
+
+    AttachProcessLogQueue(QueLogRecords)
+
+    def QueryJob(
+        payload: tuple[list[str], RunConfig],
+    ) -> tuple[dict[str, Any], list[dict[str, Any]], dict[str, list[str]]]:
+        global NtpCONSTRUCTOR
+        global NtpEMPTY
+
+        qry_terms, config = payload
+        if PthOutput is not None:
+            config = config._replace(output_folder=PthOutput)
+        NtpCONSTRUCTOR = GenerateNtpConstructor(config)
+        NtpEMPTY = NtpCONSTRUCTOR()
+
+        # Stage timings of each chemical are sent back with its dataset, so the coordinator's run profile is complete
+        StmMETRICS.Reset()
+        # Names to index are sent back as well, only the coordinator writes the synonym index file
+        IdxSYNONYMS.Reset()
+        with StmMETRICS.Measure("chemical"):
+            dataset = GetQueryDataset(query_terms=qry_terms, config=config)
+        return (dataset._asdict(), StmMETRICS.GetRecords(), IdxSYNONYMS.Export())
+
+    MgrBroker = ConnectBroker(address=address, authkey=authkey, timeout=BROKER_CONNECT_TIMEOUT)
+    LogLOGGER.info(f"Worker connected to broker <{address[0]}:{address[1]}>.")
+    # PubChem's rate limit holds for all workers together, so its tokens are reserved from the broker's bucket
+    BktPUBCHEM.Share(MgrBroker.GetTokenBucket(BktPUBCHEM.name, BktPUBCHEM.rate, BktPUBCHEM.capacity).Reserve)
+    try:
+        return RunWorker(MgrBroker=MgrBroker, handler=QueryJob)
+    finally:
+        BktPUBCHEM.Share(None)
+        QuitWebDrivers()
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.2     Local worker processes forward their log records to this process
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def InitProcessPoolProcessing(config: RunConfig):
+    """Starts the broker and the local worker processes for distributed runs.\n
+    - -> | <config> Run config"""
+
+    global MgrBROKER
+
+    authkey = config.broker_authkey or token_bytes(16)
+    MgrBROKER = StartBroker(address=config.broker_address or ("127.0.0.1", 0), authkey=authkey)
+    host, port = MgrBROKER.address
+    if config.broker_address is not None:
+        LogLOGGER.userinfo(f"Serving jobs to worker processes on <{host}:{port}> ...")
+
+    # Local worker processes can't connect to a wildcard address
+    address = ("127.0.0.1" if host in ("", "0.0.0.0") else host, port)
+    CtxSpawn = get_context("spawn")
+    for _ in range(min(int(REPORT["chems_count"]), config.processes)):
+        PrcWorker = CtxSpawn.Process(
+            target=RunQueryWorker,
+            kwargs={"address": address, "authkey": authkey, "QueLogRecords": GetProcessLogQueue()},
+            daemon=True,
+        )
+        PrcWorker.start()
+        LstWORKER_PROCESSES.append(PrcWorker)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.5     Add the names found by the worker processes to the synonym index
+# ++ 26-10-19    fJ      0.4     Requeue or fail the jobs of dead or timed out worker processes
+# ++ 26-10-19    fJ      0.3     Collect the datasets in a columnar buffer instead of a list of named tuples
+# ++ 26-10-19    fJ      0.2     Take the file's query table instead of a queries dictionary
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def ProcessPoolProcessing(qry_table: QueryTable, config: RunConfig, EvtCancel: Event) -> ColumnarBuffer | None:
+    """Processes files in the given folder and outputs web datasets .xlsx file. Runs queries in worker processes, which
+    pull them from the broker.\n
+    - -> | <qry_table> Query table of the file\n
+    - -> | <config> Run config\n
+    - -> | <EvtCancel> Cancel event to listen to\n
+    - <- | <return> Compound datasets from different webservices, one row per file row, None if all local worker
+    processes died"""
+
+    query_datasets = ColumnarBuffer(fields=NtpCONSTRUCTOR._fields, rows_count=len(qry_table))
+    # Jobs of dead local worker processes are requeued at once, the ones of remote workers after the job timeout
+    local_workers = {GetWorkerId(PrcWorker.pid): PrcWorker for PrcWorker in LstWORKER_PROCESSES}
+    TrkJobs = JobTracker(
+        MgrBroker=MgrBROKER,
+        IsWorkerDead=lambda worker_id: worker_id in local_workers and not local_workers[worker_id].is_alive(),
+    )
+
+    # Rows without query terms stay empty
+    for qry_number, qry_terms in qry_table.items():
+        if qry_terms is not None:
+            TrkJobs.Put((REPORT["file_name"], qry_number), (qry_terms, config))
+
+    while TrkJobs.pending_count > 0:
+        if EvtCancel.is_set():
+            return query_datasets
+
+        try:
+            (_, qry_number), result, error = TrkJobs.Get(timeout=1)
+        except Empty:
+            # Without remote workers, nobody is left to process the pending jobs
+            if config.broker_address is None and not any(PrcWorker.is_alive() for PrcWorker in LstWORKER_PROCESSES):
+                return None
+            continue
+
+        qry_terms = qry_table.GetTerms(qry_number)
+        REPORT["chem_no"] = REPORT["chem_no"] + 1
+        REPORT["chem_id"] = next((chem_id for chem_id in qry_terms if chem_id is not None))
+        REPORT["cas_no"] = REPORT["cas_no"] + 1 if qry_terms[0] is not None else REPORT["cas_no"]
+
+        # The row of a failed job stays empty
+        if error is not None:
+            LogLOGGER.userinfo(f">>> Skipped <{REPORT['chem_id']}>: Error in worker process! Retrying later may help ...")
+        else:
+            dataset, records, synonyms = result
+            query_datasets.SetRow(qry_number, dataset)
+            StmMETRICS.Merge(records, file=REPORT["file_name"], row=qry_number, chem_id=REPORT["chem_id"])
+            for cas_no, names in synonyms.items():
+                IdxSYNONYMS.Add(cas_no=cas_no, names=names)
+
+        BusPROGRESS.Publish(report=REPORT, final=False)
 
     return query_datasets
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def QuitProcessPoolProcessing():
+    """Stops the worker processes after their current query and shuts the broker down."""
+
+    global MgrBROKER
+    if MgrBROKER is None:
+        return
+
+    # Drop pending jobs, i.e. on cancel, and send the stop signal which workers pass on to each other
+    QueJobs = MgrBROKER.GetJobQueue()
+    while True:
+        try:
+            QueJobs.get_nowait()
+        except Empty:
+            break
+    QueJobs.put(None)
+
+    for PrcWorker in LstWORKER_PROCESSES:
+        PrcWorker.join(timeout=WORKER_STOP_TIMEOUT)
+        if PrcWorker.is_alive():
+            LogLOGGER.warning(f"Worker process <{PrcWorker.pid}> didn't stop in time and gets terminated.")
+            PrcWorker.terminate()
+    LstWORKER_PROCESSES.clear()
+
+    MgrBROKER.shutdown()
+    MgrBROKER = None
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.3     Count chemicals and CAS numbers from the query tables
+# ++ 26-10-19    fJ      1.2     Added Timer decorator and report the execution time
+# ++ 26-10-19    fJ      1.1     Report to the registered frontend instead of the GUI
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-26    fJ      0.3     Splitted AnalyseFiles() and ProcessFiles()
 # ++ 24-02-25    fJ      0.2     Replaced os.path with pathlib.Path
 # ++ 24-02-21    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
+@Timer
 def AnalyseFiles(file_paths: list[Path]):
     """Analyses given files for processing.\n
     - -> | <file_paths> List of file paths compatible for processing"""
 
-    gui.GuiToggleExecutionLock(force_disable=True)
+    GetFrontend().ToggleExecutionLock(force_disable=True)
 
+    timer = GetRunTime()
     query = PreprocessFiles(file_paths)
     if not query:
         return
 
     report: dict[str, int | str] = {
         "files_count": len(query),
-        "chems_count": sum(1 for qry in query.values() for nty in qry.values() if nty is not None),
-        "cas_count": sum(1 for qry in query.values() for nty in qry.values() if nty is not None and nty[0] is not None),
+        "chems_count": sum(qry_table.chems_count for qry_table in query.values()),
+        "cas_count": sum(qry_table.cas_count for qry_table in query.values()),
     }
-    return gui.EvaluateAnalysis(report)
+    report["execution_time"], _ = GetRunTime(timer)
+    return GetFrontend().EvaluateAnalysis(report)
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      2.5     Add the CAS numbers matched to names and their confidence to the output files
+# ++ 26-10-19    fJ      2.4     Save the synonym index of the run
+# ++ 26-10-19    fJ      2.3     Close the circuit breakers of all sources
+# ++ 26-10-19    fJ      2.2     Start the retry budget of the run, so retries end early on cancelling
+# ++ 26-10-19    fJ      2.1     Add SI values and units of the ChemInfo quantities to the output files
+# ++ 26-10-19    fJ      2.0     Convert the columnar dataset buffer of each file to a dataframe
+# ++ 26-10-19    fJ      1.9     Merge the input rows into the .xlsx output files on demand
+# ++ 26-10-19    fJ      1.8     Write an output file per output format of the run config
+# ++ 26-10-19    fJ      1.7     Count chemicals and CAS numbers from the query tables
+# ++ 26-10-19    fJ      1.6     Added distributed processing in worker processes
+# ++ 26-10-19    fJ      1.5     Settings are passed as run config, replaces the run_threaded switch
+# ++ 26-10-19    fJ      1.4     Report to the registered frontend, write output files to its output folder
+# ++ 26-10-19    fJ      1.3     Record function metrics and capture CPU profile and memory peak on demand
+# ++ 26-10-19    fJ      1.2     Record stage timings and write a run profile
+# ++ 26-10-19    fJ      1.1     Publish progress to BusPROGRESS instead of setting the GUI from the worker thread
 # ++ 24-03-04    fJ      TIMER   MultiThr8 | Wall time: 124.8130 s, CPU time: 56.1094 s -> 2.080 s | 0,935 s per item
 # ++ 24-03-04    fJ      TIMER   MultiThr6 | Wall time: 118.2340 s, CPU time: 50.2500 s -> 1.971 s | 0,838 s per item
 # ++ 24-03-04    fJ      TIMER   SingleThr | Wall time: 395.4463 s, CPU time: 38.6875 s -> 6.591 s | 0,645 s per item
@@ -308,87 +669,160 @@ def AnalyseFiles(file_paths: list[Path]):
 # ++ 24-02-25    fJ      0.2     Replaced os.path with pathlib.Path
 # ++ 24-02-21    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def ProcessFiles(file_paths: list[Path], EvtCancel: Event, run_threaded: bool = False):
+def ProcessFiles(file_paths: list[Path], EvtCancel: Event, config: RunConfig):
     """Processes files in the given folder and outputs web datasets .xlsx file. Runs all queries in a single thread.\n
     - -> | <file_paths> List of file paths compatible for processing\n
     - -> | <EvtCancel> Threading event to cancel function execution\n
-    - -> | <run_threaded> Switch to run processing in multiple threads instead of a single one"""
+    - -> | <config> Run config, built once by the frontend"""
 
-    gui.GuiToggleExecutionLock(force_disable=True)
+    GetFrontend().ToggleExecutionLock(force_disable=True)
 
     timer = GetRunTime()
+    StmMETRICS.Reset()
+    RegMETRICS.Reset()
+    BdgRETRIES.Start(EvtCancel=EvtCancel)
+    ResetCircuitBreakers()
+    LogLOGGER.info(f"Processing with {config._replace(broker_authkey=b'***')}.")
 
     query = PreprocessFiles(file_paths)
     if not query:
         return
 
     REPORT["files_count"] = len(query)
-    REPORT["chems_count"] = sum(1 for qry in query.values() for nty in qry.values() if nty is not None)
-    REPORT["cas_count"] = sum(1 for qry in query.values() for nty in qry.values() if nty is not None and nty[0] is not None)
+    REPORT["chems_count"] = sum(qry_table.chems_count for qry_table in query.values())
+    REPORT["cas_count"] = sum(qry_table.cas_count for qry_table in query.values())
     REPORT["file_no"] = 0
     REPORT["chem_no"] = 0
     REPORT["cas_no"] = 0
     REPORT["execution_time"] = 0
 
-    gui.EvaluateProzessing(report=None, final=False)
+    BusPROGRESS.Start()
+    BusPROGRESS.Publish(report=None, final=False)
 
-    if run_threaded:
+    if config.run_distributed:
+        InitProcessPoolProcessing(config)
+    elif config.run_threaded:
         # Unpoison the query queue (s. below)
         while QueQUERY.qsize() > 0:
             QueQUERY.get()
         # Reset the output queue
         while QueOUTPUT.qsize() > 0:
             QueOUTPUT.get()
-        InitMultiThreadProcessing()
+        InitMultiThreadProcessing(config)
 
     global NtpCONSTRUCTOR
     global NtpEMPTY
-    NtpCONSTRUCTOR = GenerateNtpConstructor()
+    NtpCONSTRUCTOR = GenerateNtpConstructor(config)
     NtpEMPTY = NtpCONSTRUCTOR()
 
     PthParent = next((PthFile.parent for PthFile in file_paths if PthFile.is_file()), None)
-    for file_name, qry_dict in query.items():
-        REPORT["file_no"] = REPORT["file_no"] + 1
-        REPORT["file_name"] = file_name
-
-        query_datasets = (
-            SingleThreadProcessing(qry_dict=qry_dict, EvtCancel=EvtCancel)
-            if not run_threaded
-            else MultiThreadProcessing(qry_dict=qry_dict)
-        )
-
-        if not run_threaded and EvtCancel.is_set():
-            QuitWebDrivers()
-            return gui.EvaluateOnError(PthFolder=PthParent, error="You have cancelled file processing!", show_in_gui=False)
-
-        DfDataset = GetDfFromNtList(nt_list=query_datasets, nt_constructor=NtpCONSTRUCTOR)
-        outfile_name = f"{Path(file_name).stem}_OUT.xlsx"
-        if not WriteDfToXlsx(DfDataframe=DfDataset, PthXlsFile=PthParent / outfile_name):
-            return gui.EvaluateOnError(PthFolder=PthParent, error=f"Can't access <{outfile_name}>! Is it currently open?")
-
-    gui.EvaluateProzessing(report=None, final=True)
+    input_paths = {PthFile.name: PthFile for PthFile in file_paths}
+    # Capture a CPU profile and the memory peak of the query processing on demand
+    with RegMETRICS.Capture(name="ProcessFiles", cpu=METRICS_CPU_PROFILE, memory=METRICS_TRACE_MEMORY):
+        for file_name, qry_table in query.items():
+            REPORT["file_no"] = REPORT["file_no"] + 1
+            REPORT["file_name"] = file_name
+
+            if config.run_distributed:
+                query_datasets = ProcessPoolProcessing(qry_table=qry_table, config=config, EvtCancel=EvtCancel)
+            elif config.run_threaded:
+                query_datasets = MultiThreadProcessing(qry_table=qry_table)
+            else:
+                query_datasets = SingleThreadProcessing(qry_table=qry_table, config=config, EvtCancel=EvtCancel)
+
+            if query_datasets is None:
+                QuitProcessPoolProcessing()
+                LogRunProfile()
+                BusPROGRESS.Clear()
+                return GetFrontend().EvaluateOnError(
+                    PthFolder=PthParent, error="All worker processes ended unexpectedly, check the log file!"
+                )
+
+            if (config.run_distributed or not config.run_threaded) and EvtCancel.is_set():
+                QuitProcessPoolProcessing()
+                QuitWebDrivers()
+                IdxSYNONYMS.Save()
+                LogRunProfile()
+                # Drop pending progress reports, so they don't overwrite the error state in the GUI
+                BusPROGRESS.Clear()
+                return GetFrontend().EvaluateOnError(
+                    PthFolder=PthParent, error="You have cancelled file processing!", show_in_gui=False
+                )
+
+            # Report which CAS numbers were matched to names, so inferred CAS numbers can be told from the input
+            DfDataset = query_datasets.ToDataFrame().join(qry_table.GetNameMatches())
+            # Parse the quantities of the whole file at once, so the output can be filtered and sorted by value
+            DfDataset = AddQuantityColumns(DfDataset, cols=QUANTITY_FIELDS)
+            for suffix in config.output_formats:
+                outfile_name = f"{Path(file_name).stem}_OUT{suffix}"
+                if suffix == ".xlsx" and config.merge_input:
+                    # Stream the input rows from the file instead of keeping its dataframe around
+                    written = WriteMergedDfToXlsx(
+                        PthSourceFile=input_paths[file_name],
+                        DfDataframe=DfDataset,
+                        PthXlsFile=config.output_folder / outfile_name,
+                    )
+                else:
+                    written = OUTPUT_WRITERS[suffix](DfDataset, config.output_folder / outfile_name)
+                if not written:
+                    QuitProcessPoolProcessing()
+                    BusPROGRESS.Clear()
+                    return GetFrontend().EvaluateOnError(
+                        PthFolder=PthParent, error=f"Can't access <{outfile_name}>! Is it currently open?"
+                    )
+
+    BusPROGRESS.Publish(report=None, final=True)
     # Poison the query queue to stop running threads
-    QueQUERY.put((-1, ["STOP"]))
+    QueQUERY.put((-1, ["STOP"], perf_counter()))
+    QuitProcessPoolProcessing()
     QuitWebDrivers()
+    # Keep the names found in this run for the next runs
+    IdxSYNONYMS.Save()
 
     REPORT["execution_time"], _ = GetRunTime(timer)
-    return gui.EvaluateProzessing(report=REPORT, final=True)
+    LogRunProfile()
+    return BusPROGRESS.Publish(report=REPORT, final=True)
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def LogRunProfile():
+    """Writes the stage timings and function metrics of the current run to metrics files and logs the p50/p95/p99
+    summary of the stage timings."""
+
+    if not StmMETRICS.GetRecords():
+        return
+
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    PthMetricsFile = PthMETRICS_FOLDER / f"{timestamp}{METRICS_FILE_FORMAT}"
+    PthRegistryFile = PthMETRICS_FOLDER / f"{timestamp}_functions.json"
+    for PthFile, exported in [
+        (PthMetricsFile, StmMETRICS.Export(PthMetricsFile)),
+        (PthRegistryFile, RegMETRICS.Export(PthRegistryFile)),
+    ]:
+        if exported:
+            LogLOGGER.info(f"Run profile written to <{PthFile}>.")
+        else:
+            LogLOGGER.warning(f"Can't write run profile to <{PthFile}>! Is it currently open?")
+
+    LogLOGGER.info(f"Run profile summary:\n{StmMETRICS.FormatSummary()}")
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.2     Read the query switches from the run config
+# ++ 26-10-19    fJ      1.1     Read the query switches from the registered frontend instead of Tk variables
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-03-02    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def GenerateNtpConstructor() -> type[NamedTuple]:
+def GenerateNtpConstructor(config: RunConfig) -> type[NamedTuple]:
     """Initialises the dataset constructor for the namedtuple to return.\n
+    - -> | <config> Run config\n
     - <- | <return> Dataset constructor"""
 
-    switches = [
-        GetCtkVar(CtkWidget=gui.BlvQueryChemInfo),
-        GetCtkVar(CtkWidget=gui.BlvQueryPubChem),
-        GetCtkVar(CtkWidget=gui.BlvQueryGestis),
-    ]
+    switches = [config.query_cheminfo, config.query_pubchem, config.query_gestis]
     constructors = [
         NtpCI_CONSTRUCTOR._fields,
         NtpPC_CONSTRUCTOR._fields,
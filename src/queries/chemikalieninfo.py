@@ -4,17 +4,21 @@
 from collections import namedtuple
 from datetime import datetime
 from time import sleep
-from typing import Any
+from typing import Any, Iterable
 
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import JavascriptException, StaleElementReferenceException
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webelement import WebElement
 
 import src.fctlib.selenium as fctSelenium
-from src.fctlib.decorators import Retry, RetryException, RetryFailedException
+from src.fctlib.circuitbreaker import GetCircuitBreaker
+from src.fctlib.decorators import Retry, RetryException, RetryFailedException, Timer
 from src.fctlib.logging import LogLOGGER
+from src.fctlib.metrics import StmMETRICS
+from src.fctlib.ranking import FormatRunnerUps, RankCandidates
 from src.fctlib.regex import CheckCasNo, GetGhsStatements, RepHAZARDS, RepPRECAUTIONARIES
+from src.fctlib.synonyms import IdxSYNONYMS
 from src.settings import DRV_SLEEPTIME, NOT_LISTED
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -22,6 +26,8 @@ from src.settings import DRV_SLEEPTIME, NOT_LISTED
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ChemInfo URL
 URL = "https://recherche.chemikalieninfo.de/public"
+# ChemInfo circuit breaker: Skips ChemInfo while it fails
+CbrCHEMINFO = GetCircuitBreaker("Chemikalieninfo")
 
 # ChemInfo XPaths: Search page
 XPATH_SEARCH_CAS = ".//input[@data-autosuggest-key='CASRN.CASRN']"
@@ -34,6 +40,7 @@ XPATH_SEARCH_HIT = "./div[3]/span/a | ./div[2]/span/a"
 # ChemInfo XPaths: Dossier page
 XPATH_DOSSIER_HEADING = ".//*[@id='navbar']/h1"
 XPATH_DOSSIER = ".//main[@id='dossier-content']"
+XPATH_DOSSIER_PARENT = ".//h4[@id='{id}']/parent::div | .//h3[@id='{id}']/parent::div"
 XPATH_DOSSIER_DEF_LISTS = [
     # Descriptor, parent ID, target XPath
     ["id_cas", "m98", "@dt", "=CAS-RN", ">dd"],
@@ -76,6 +83,26 @@ XPATH_DOSSIER_DEF_LISTS = [
     ["pc_viscosity", "m36", "@dt", "+Viskosität", "&", "-Einheit", ">dd"],
     # ["pc_xlogp", "m53", "@dt", "+Verteilungskoeffizient", ">dd"],
 ]
+# Compiled once, so no XPath is built per compound
+DOSSIER_XPATHS = fctSelenium.CompileXpathDescriptors(XPATH_DOSSIER_DEF_LISTS, parent_template=XPATH_DOSSIER_PARENT)
+# ChemInfo quantities: Parsed into SI values and units after processing (s. fctlib.units.AddQuantityColumns())
+QUANTITY_FIELDS = [
+    "pc_density",
+    "pc_energy_ionisation",
+    "pc_enthalpy_vaporisation",
+    "pc_flammability_limit_lower",
+    "pc_flammability_limit_upper",
+    "pc_pressure_critical",
+    "pc_pressure_vapor",
+    "pc_refractive_index",
+    "pc_refractive_index_wavelength",
+    "pc_surface_tension",
+    "pc_temperature_boiling",
+    "pc_temperature_critical",
+    "pc_temperature_flash",
+    "pc_temperature_melting",
+    "pc_viscosity",
+]
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -114,38 +141,27 @@ def GetHitList(WdrDriver: WebDriver, query_term: str) -> list[WebElement]:
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Classify the hit texts collected in a single script call
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.4     Reworked error handling
 # ++ 24-02-19    fJ      0.3     Reworked and pythonised
 # ++ 24-02-06    fJ      0.2     Added docstring
 # ++ 24-02-02    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def CleanHitList(WdrDriver: WebDriver, hit_list: list[WebElement]) -> list[WebElement]:
+def CleanHitList(hit_list: list[fctSelenium.ElementContent]) -> list[fctSelenium.ElementContent]:
     """Tries to return a cleaned hit list from the search hit list in case of multiple hits.\n
     Likely intended hits are defined by the string "Einzelinhaltsstoff" in the hit's text.\n
-    - -> | <WdrDriver> Webdriver to use\n
-    - -> | <hit_list> List of hit elements\n
-    - <- | <return> Cleaned list of hit elements"""
-
-    cleaned_hit_list = []
-
-    try:
-        for WelHit in hit_list:
-            # NOTE: We need to force scroll the target into view to access its content
-            fctSelenium.ScrollTo(WdrDriver=WdrDriver, WelTarget=WelHit)
-            if "Einzelinhaltsstoff" in WelHit.text:
-                cleaned_hit_list.append(WelHit)
+    - -> | <hit_list> List of hit contents, s. fctSelenium.GetElementContents()\n
+    - <- | <return> Cleaned list of hit contents"""
 
-    # Handle a seldom StaleElement exception by raising a retry exception handled one level up
-    except (StaleElementReferenceException, AttributeError) as Error:
-        LogLOGGER.warning(Error)
-        raise RetryException()
-
-    return cleaned_hit_list
+    return [hit for hit in hit_list if "Einzelinhaltsstoff" in hit.text]
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.3     Rank all hits if cleaning leaves none
+# ++ 26-10-19    fJ      1.2     Rank ambiguous hits instead of skipping them
+# ++ 26-10-19    fJ      1.1     Classify the hits collected in a single script call, take the hit link from them
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.4     Reworked error handling
 # ++ 24-02-19    fJ      0.3     Reworked and pythonised
@@ -153,18 +169,41 @@ def CleanHitList(WdrDriver: WebDriver, hit_list: list[WebElement]) -> list[WebEl
 # ++ 24-02-05    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
 @Retry(RetryException)
-def GetHitStatus(WdrDriver: WebDriver, query_term: str) -> str:
+def GetHitStatus(WdrDriver: WebDriver, query_term: str, synonyms: Iterable[str] = ()) -> str:
     """Get and analyse the hit list for the query term. In case of a single hit navigate to the hits URL.\n
+    Hits left ambiguous by CleanHitList() are ranked, all hits if it leaves none. The best ranked hit is selected if it
+    is a likely match.\n
     - -> | <WdrDriver> Webdriver to use\n
     - -> | <query_term> Term to query the database\n
+    - -> | <synonyms> Names and CAS numbers known from other sources for the chemical, to rank ambiguous hits\n
     - <- | <return> Query status as the analysis result"""
 
     try:
-        hit_list = GetHitList(WdrDriver=WdrDriver, query_term=query_term)
+        # Collect the texts and links of all hits at once, the hits are classified without further round trips
+        hit_list = fctSelenium.GetElementContents(
+            WdrDriver=WdrDriver,
+            elements=GetHitList(WdrDriver=WdrDriver, query_term=query_term),
+            link_xpath=XPATH_SEARCH_HIT,
+        )
         if len(hit_list) > 1:
-            hit_list = CleanHitList(WdrDriver=WdrDriver, hit_list=hit_list)
+            # Hits of mixtures only are ranked as well, instead of reporting no hit
+            hit_list = CleanHitList(hit_list=hit_list) or hit_list
             status = f"Most probable out of {len(hit_list)} query hits selected for <{query_term}>."
 
+        # Rank the hits cleaning left ambiguous instead of skipping them
+        runner_ups = ""
+        if len(hit_list) > 1:
+            ranking = RankCandidates(
+                candidates=[hit.text for hit in hit_list], query_term=query_term, synonyms=synonyms
+            )
+            runner_ups = FormatRunnerUps(ranking.runner_ups)
+            if ranking.selected is not None:
+                status = (
+                    f"Best ranked out of {len(hit_list)} query hits selected for <{query_term}> "
+                    f"(score {ranking.score:.2f})."
+                )
+                hit_list = [hit_list[ranking.selected]]
+
         if len(hit_list) == 0:
             status = f"Chemikalieninfo | Skipped <{query_term}>: No query hit found!"
         # Check again if cleaning wasn't successful
@@ -175,12 +214,14 @@ def GetHitStatus(WdrDriver: WebDriver, query_term: str) -> str:
 
             # NOTE: Accessing the link with Enter leads to "?dv=18" (Ansicht: Standardansicht), which clutters datasheet
             #       representation. Set it to "?dv=0" (Ansicht: [Alle Merkmale]).
-            WelHit = fctSelenium.GetSingleWebElement(WdrParent=hit_list[0], descriptor=XPATH_SEARCH_HIT)
-            hit_link = WelHit.get_attribute("href").replace("?", "?dv=0&")
+            hit_link = hit_list[0].href.replace("?", "?dv=0&")
             fctSelenium.NavigateURL(WdrDriver=WdrDriver, url=hit_link)
 
+        # Record the runner-ups, so a selection or a skip can be checked by hand
+        status = " ".join(filter(None, [status, runner_ups]))
+
     # Handle a seldom StaleElement exception by retrying
-    except (StaleElementReferenceException, AttributeError) as Error:
+    except (StaleElementReferenceException, JavascriptException, AttributeError) as Error:
         LogLOGGER.warning(Error)
         raise RetryException()
     # Handle the Retry call from subroutines
@@ -192,33 +233,36 @@ def GetHitStatus(WdrDriver: WebDriver, query_term: str) -> str:
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Use the precompiled XPath descriptor, get each parent element once per dossier
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.4     Reworked error handling
 # ++ 24-02-19    fJ      0.3     Reworked and pythonised
 # ++ 24-02-06    fJ      0.2     Added docstring
 # ++ 24-02-04    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def GetElements(WelDossier: WebElement, locators: list[str]) -> WebElement | list[WebElement] | None:
-    """Returns definition list entry/entries based on a location descriptor list.\n
+def GetElements(
+    WelDossier: WebElement, descriptor: fctSelenium.XpathDescriptor, parents: dict[str, WebElement | None]
+) -> WebElement | list[WebElement] | None:
+    """Returns definition list entry/entries based on a location descriptor.\n
     - -> | <WelDossier> Compound data web dossier\n
-    - -> | <locators> Location descriptor list\n
-    - <- | <return> Web element(s) located by the descriptor list"""
+    - -> | <descriptor> Precompiled location descriptor (s. DOSSIER_XPATHS)\n
+    - -> | <parents> Parent elements of the dossier by XPath, filled on first use, as descriptors share parents\n
+    - <- | <return> Web element(s) located by the descriptor"""
 
     try:
-        welParent = fctSelenium.GetSingleWebElement(
-            WdrParent=WelDossier,
-            descriptor=f".//h4[@id='{locators[1]}']/parent::div | .//h3[@id='{locators[1]}']/parent::div",
-            no_timeout=True,
-        )
+        if descriptor.parent not in parents:
+            parents[descriptor.parent] = fctSelenium.GetSingleWebElement(
+                WdrParent=WelDossier, descriptor=descriptor.parent, no_timeout=True
+            )
+        welParent = parents[descriptor.parent]
 
         if welParent is None:
             return None
 
-        strXpath, get_multiple = fctSelenium.XpathConstructor(locators[2:])
-        if not get_multiple:
-            return fctSelenium.GetSingleWebElement(WdrParent=welParent, descriptor=strXpath, no_timeout=True)
+        if not descriptor.get_multiple:
+            return fctSelenium.GetSingleWebElement(WdrParent=welParent, descriptor=descriptor.target, no_timeout=True)
         else:
-            return fctSelenium.GetWebElements(WdrParent=welParent, descriptor=strXpath, no_timeout=True)
+            return fctSelenium.GetWebElements(WdrParent=welParent, descriptor=descriptor.target, no_timeout=True)
 
     # Handle a seldom StaleElement exception by raising a retry exception handled one level up
     except (StaleElementReferenceException, AttributeError) as Error:
@@ -228,6 +272,7 @@ def GetElements(WelDossier: WebElement, locators: list[str]) -> WebElement | lis
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Get the parent elements of the dossier once for all descriptors
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.4     Reworked error handling
 # ++ 24-02-19    fJ      0.3     Reworked and pythonised
@@ -260,8 +305,9 @@ def GetCompoundData(WdrDriver: WebDriver | None, query_term: str, query_status:
             WelDossier: WebElement = fctSelenium.GetSingleWebElement(WdrParent=WdrDriver, descriptor=XPATH_DOSSIER)
 
             # Get data from definition lists using xpath_dossier_deflists
+            parents: dict[str, WebElement | None] = {}
             for def_list in XPATH_DOSSIER_DEF_LISTS:
-                WelData = GetElements(WelDossier=WelDossier, locators=def_list)
+                WelData = GetElements(WelDossier=WelDossier, descriptor=DOSSIER_XPATHS[def_list[0]], parents=parents)
 
                 if WelData is None or not WelData:
                     cpd_data[def_list[0]] = NOT_LISTED
@@ -334,30 +380,60 @@ def GetCompoundData(WdrDriver: WebDriver | None, query_term: str, query_status:
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.6     Add the registered names to the synonym index on demand only
+# ++ 26-10-19    fJ      1.5     Add the registered names to the synonym index
+# ++ 26-10-19    fJ      1.4     Pass known synonyms to rank ambiguous hits
+# ++ 26-10-19    fJ      1.3     Skip queries while the circuit breaker is open
+# ++ 26-10-19    fJ      1.2     Added Timer decorator
+# ++ 26-10-19    fJ      1.1     Record hit resolution and extraction time to StmMETRICS
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-19    fJ      0.4     Reworked and pythonised
 # ++ 24-02-06    fJ      0.3     Added docstring
 # ++ 24-02-05    fJ      0.2     Refactored
 # ++ 24-02-02    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def QueryChemInfo(WdrDriver: WebDriver, query_term: str) -> dict[str, Any]:
+@Timer
+def QueryChemInfo(
+    WdrDriver: WebDriver, query_term: str, synonyms: Iterable[str] = (), index_synonyms: bool = False
+) -> dict[str, Any]:
     """Queries Chemikalieninfo for a query term and returns compound data.\n
     - -> | <WdrDriver> Webdriver to use\n
     - -> | <query_term> Term to query the database\n
+    - -> | <synonyms> Names and CAS numbers known from other sources for the chemical, to rank ambiguous hits\n
+    - -> | <index_synonyms> Switch to add the registered names to the synonym index, only for query terms known to
+    identify the chemical (i.e. a CAS number from the input)\n
     - <- | <return> Compound data"""
 
+    if not CbrCHEMINFO.Allow():
+        status = f"Chemikalieninfo | Skipped <{query_term}>: Source unavailable! Retrying later may help ..."
+        return GetCompoundData(WdrDriver=None, query_term=query_term, query_status=status)
+
     if WdrDriver is None:
         WdrDriver = fctSelenium.InitWebDriver(use_existing=True)
     fctSelenium.NavigateURL(WdrDriver=WdrDriver, url=URL)
 
     try:
         # Get and analyse query hits to get single compound dataset URL
-        status = GetHitStatus(WdrDriver=WdrDriver, query_term=query_term)
+        with StmMETRICS.Measure("hit_resolution"):
+            status = GetHitStatus(WdrDriver=WdrDriver, query_term=query_term, synonyms=synonyms)
         # Get compound data
-        cpd_data = GetCompoundData(WdrDriver=WdrDriver, query_term=query_term, query_status=status)
+        with StmMETRICS.Measure("extraction"):
+            cpd_data = GetCompoundData(WdrDriver=WdrDriver, query_term=query_term, query_status=status)
+        CbrCHEMINFO.RecordSuccess()
+
+        # Keep the registered names for later runs, so name-only rows can be queried by CAS number
+        if index_synonyms and "Success!" in status:
+            IdxSYNONYMS.Add(
+                cas_no=cpd_data.get("id_cas", ""),
+                names=[
+                    *str(cpd_data.get("name_registered_ger", "")).split("|"),
+                    *str(cpd_data.get("name_registered_eng", "")).split("|"),
+                ],
+            )
 
     # Most abundand error is a seldom StaleElement exception that we handle by retrying. If this fails, we skip the compound.
     except RetryFailedException as Error:
+        CbrCHEMINFO.RecordFailure()
         LogLOGGER.error(f"An stale element error occurred while querying compound <{query_term}>: <{Error}>.")
         status = f"Chemikalieninfo | Skipped <{query_term}>: Error! This is not your fault. Retrying later may help ..."
         cpd_data = GetCompoundData(WdrDriver=None, query_term=query_term, query_status=status)
@@ -5,18 +5,19 @@ from collections import namedtuple
 from datetime import datetime
 from pathlib import Path
 from time import sleep
-from typing import Any
+from typing import Any, Iterable
 
 from requests import get
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import JavascriptException, StaleElementReferenceException
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
 import src.fctlib.selenium as fctSelenium
-import src.gui as gui
-from src.fctlib.ctk import GetCtkVar
-from src.fctlib.decorators import Retry, RetryException, RetryFailedException
+from src.fctlib.circuitbreaker import GetCircuitBreaker
+from src.fctlib.decorators import Retry, RetryException, RetryFailedException, Timer
 from src.fctlib.logging import LogLOGGER
+from src.fctlib.metrics import StmMETRICS
+from src.fctlib.ranking import FormatRunnerUps, RankCandidates, Ranking
 from src.fctlib.regex import CheckCasNo
 from src.settings import DRV_SLEEPTIME
 
@@ -25,6 +26,8 @@ from src.settings import DRV_SLEEPTIME
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ChemInfo URL
 URL = "https://gestis.dguv.de/search"
+# Gestis circuit breaker: Skips Gestis while it fails
+CbrGESTIS = GetCircuitBreaker("Gestis")
 
 # ChemInfo XPaths: Search page
 XPATH_SEARCH_CAS = ".//input[@placeholder='Nummern']"
@@ -73,88 +76,124 @@ def GetHitList(WdrDriver: WebDriver, query_term: str) -> list[WebElement]:
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.1     Classify the hit texts collected in a single script call
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def CleanHitList(WdrDriver: WebDriver, hit_list: list[WebElement], query_term: str) -> list[WebElement]:
+def CleanHitList(hit_list: list[fctSelenium.ElementContent], query_term: str) -> list[fctSelenium.ElementContent]:
     """Tries to return a cleaned hit list from the search hit list in case of multiple hits.\n
     Likely intended hits are defined by the similarity of search and find term.\n
-    - -> | <WdrDriver> Webdriver to use\n
-    - -> | <hit_list> List of hit elements\n
+    - -> | <hit_list> List of hit contents, s. fctSelenium.GetElementContents()\n
     - -> | <query_term> Query term for cleaning check\n
-    - <- | <return> Cleaned list of hit elements"""
-
-    cleaned_hit_list = []
-
-    try:
-        for WelHit in hit_list:
-            # NOTE: We need to force scroll the target into view to access its content
-            fctSelenium.ScrollTo(WdrDriver=WdrDriver, WelTarget=WelHit)
-            if WelHit.text.lower() == query_term.lower():
-                cleaned_hit_list.append(WelHit)
-
-    # Handle a seldom StaleElement exception by raising a retry exception handled one level up
-    except (StaleElementReferenceException, AttributeError) as Error:
-        LogLOGGER.warning(Error)
-        raise RetryException()
+    - <- | <return> Cleaned list of hit contents"""
 
-    return cleaned_hit_list
+    return [hit for hit in hit_list if hit.text.lower() == query_term.lower()]
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.2     Rank the results by their name and CAS number if they stay ambiguous
+# ++ 26-10-19    fJ      1.1     Classify the result texts collected in a single script call
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def CleanMultiHit(WdrDriver: WebDriver, query_term: str) -> list[WebElement]:
-    """Returns the hit list for the given query term.\n
+def CleanMultiHit(
+    WdrDriver: WebDriver, query_term: str, synonyms: Iterable[str] = ()
+) -> tuple[list[WebElement], Ranking | None]:
+    """Returns the results of a multi result hit for the given query term.\n
+    Results whose CAS number or name equals the query term are kept. If none or several are left, they are ranked:
+    Several results with the queried CAS number by their names, else all results by their names and CAS numbers.\n
     - -> | <WdrDriver> Webdriver to use\n
     - -> | <query_term> Term to query the database\n
-    - <- | <return> List of hit elements"""
-
-    search_field = XPATH_SEARCH_MULTI_CAS if CheckCasNo(query_term) else XPATH_SEARCH_MULTI_NAME
+    - -> | <synonyms> Names and CAS numbers known from other sources for the chemical, to rank ambiguous results\n
+    - <- | <return> List of result elements to click and the ranking, None if the results weren't ranked"""
 
-    multi_hit_list = []
     try:
-        hit_list = fctSelenium.GetWebElements(WdrParent=WdrDriver, descriptor=search_field)
-        for WelHit in hit_list:
-            if WelHit.text.lower() == query_term.lower():
-                multi_hit_list.append(WelHit)
+        names = fctSelenium.GetElementContents(
+            WdrDriver=WdrDriver,
+            elements=fctSelenium.GetWebElements(WdrParent=WdrDriver, descriptor=XPATH_SEARCH_MULTI_NAME),
+        )
+        cas_nos = fctSelenium.GetElementContents(
+            WdrDriver=WdrDriver,
+            elements=fctSelenium.GetWebElements(WdrParent=WdrDriver, descriptor=XPATH_SEARCH_MULTI_CAS),
+        )
 
     # Handle a seldom StaleElement exception by raising a retry exception handled one level up
-    except (StaleElementReferenceException, AttributeError) as Error:
+    except (StaleElementReferenceException, JavascriptException, AttributeError) as Error:
         LogLOGGER.warning(Error)
         raise RetryException()
 
-    return multi_hit_list
+    searched = cas_nos if CheckCasNo(query_term) else names
+    matches = [row_no for row_no, hit in enumerate(searched) if hit.text.lower() == query_term.lower()]
+    # Rows can only be ranked if each has its name and CAS number cell
+    if len(matches) == 1 or len(names) != len(cas_nos):
+        return [searched[row_no].element for row_no in matches], None
+
+    if matches:
+        # The CAS number matched already, only the names can tell the results apart
+        ranked = matches
+        candidates = [names[row_no].text for row_no in ranked]
+    else:
+        ranked = list(range(len(names)))
+        candidates = [f"{names[row_no].text}\n{cas_nos[row_no].text}" for row_no in ranked]
+    ranking = RankCandidates(candidates=candidates, query_term=query_term, synonyms=synonyms)
+    if ranking.selected is None:
+        return [searched[row_no].element for row_no in matches], ranking
+
+    return [names[ranked[ranking.selected]].element], ranking
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.3     Rank all hits if cleaning leaves none or several, rank the multi result hit as well
+# ++ 26-10-19    fJ      1.2     Rank ambiguous hits instead of skipping them
+# ++ 26-10-19    fJ      1.1     Classify the hits collected in a single script call
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
 @Retry(RetryException)
-def GetHitStatus(WdrDriver: WebDriver, query_term: str) -> str:
+def GetHitStatus(WdrDriver: WebDriver, query_term: str, synonyms: Iterable[str] = ()) -> str:
     """Get and analyse the hit list for the query term. In case of a single hit navigate to the hits URL.\n
+    If CleanHitList() leaves none or several hits, all hits are ranked and the best ranked hit is selected if it is a
+    likely match. The results of a multi result hit are ranked alike, s. CleanMultiHit().\n
     - -> | <WdrDriver> Webdriver to use\n
     - -> | <query_term> Term to query the database\n
+    - -> | <synonyms> Names and CAS numbers known from other sources for the chemical, to rank ambiguous hits\n
     - <- | <return> Query status as the analysis result"""
 
     try:
-        hit_list = GetHitList(WdrDriver=WdrDriver, query_term=query_term)
+        # Collect the texts of all hits at once, the hits are classified without further round trips
+        hit_list = fctSelenium.GetElementContents(
+            WdrDriver=WdrDriver, elements=GetHitList(WdrDriver=WdrDriver, query_term=query_term)
+        )
+        status = ""
+        runner_ups = ""
         if len(hit_list) > 1:
-            hit_list = CleanHitList(WdrDriver=WdrDriver, hit_list=hit_list, query_term=query_term)
-            status = f"Most probable out of {len(hit_list)} query hits selected for <{query_term}>."
+            cleaned_hit_list = CleanHitList(hit_list=hit_list, query_term=query_term)
+            if len(cleaned_hit_list) == 1:
+                status = f"Most probable out of {len(hit_list)} query hits selected for <{query_term}>."
+                hit_list = cleaned_hit_list
+            else:
+                # Rank all hits instead of skipping them, cleaning only keeps hits named like the query term
+                ranking = RankCandidates(
+                    candidates=[hit.text for hit in hit_list], query_term=query_term, synonyms=synonyms
+                )
+                runner_ups = FormatRunnerUps(ranking.runner_ups)
+                if ranking.selected is not None:
+                    status = (
+                        f"Best ranked out of {len(hit_list)} query hits selected for <{query_term}> "
+                        f"(score {ranking.score:.2f})."
+                    )
+                    hit_list = [hit_list[ranking.selected]]
 
         if len(hit_list) == 0:
             status = f"Gestis | Skipped <{query_term}>: No query hit found!"
-        # Check again if cleaning wasn't successful
+        # Check again if ranking wasn't successful
         elif len(hit_list) > 1:
             status = f"Gestis | Skipped <{query_term}>: More than one query hit found!"
         else:
-            status = f"Gestis | Success! {status}" if "status" in locals() else "Gestis | Success!"
-            hit_list[0].click()
+            status = " ".join(filter(None, ["Gestis | Success!", status]))
+            hit_list[0].element.click()
 
             # Sleep so the browser catches up to the visual change
             sleep(DRV_SLEEPTIME)
@@ -165,18 +204,27 @@ def GetHitStatus(WdrDriver: WebDriver, query_term: str) -> str:
             and fctSelenium.GetSingleWebElement(WdrParent=WdrDriver, descriptor=XPATH_SEARCH_MULTI_HEADER, no_timeout=True)
             is not None
         ):
-            multi_hit_list = CleanMultiHit(WdrDriver=WdrDriver, query_term=query_term)
+            multi_hit_list, multi_ranking = CleanMultiHit(WdrDriver=WdrDriver, query_term=query_term, synonyms=synonyms)
+            if multi_ranking is not None:
+                runner_ups = " ".join(filter(None, [runner_ups, FormatRunnerUps(multi_ranking.runner_ups)]))
             if len(multi_hit_list) != 1:
                 status = f"Gestis | Skipped <{query_term}>: Found unique query hit, but it led to an ambiguous result!"
             else:
-                status = f"{status} Most probable hit out of the ambiguous results selected for <{query_term}>."
+                if multi_ranking is not None:
+                    selection = f"Best ranked hit (score {multi_ranking.score:.2f})"
+                else:
+                    selection = "Most probable hit"
+                status = f"{status} {selection} out of the ambiguous results selected for <{query_term}>."
                 multi_hit_list[0].click()
 
                 # Sleep so the browser catches up to the visual change
                 sleep(DRV_SLEEPTIME)
 
+        # Record the runner-ups, so a selection or a skip can be checked by hand
+        status = " ".join(filter(None, [status, runner_ups]))
+
     # Handle a seldom StaleElement exception by retrying
-    except (StaleElementReferenceException, AttributeError) as Error:
+    except (StaleElementReferenceException, JavascriptException, AttributeError) as Error:
         LogLOGGER.warning(Error)
         raise RetryException()
     # Handle the Retry call from subroutines
@@ -188,15 +236,21 @@ def GetHitStatus(WdrDriver: WebDriver, query_term: str) -> str:
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.3     Output folder is passed in instead of being looked up
+# ++ 26-10-19    fJ      1.2     Write the PDF to the output folder of the registered frontend
+# ++ 26-10-19    fJ      1.1     Record PDF download time to StmMETRICS
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
 @Retry(RetryException)
-def GetCompoundData(WdrDriver: WebDriver | None, query_term: str, query_status: str) -> dict[str, Any]:
+def GetCompoundData(
+    WdrDriver: WebDriver | None, query_term: str, query_status: str, PthOutput: Path | None = None
+) -> dict[str, Any]:
     """Returns a dictionary of selected compound data from the Gestis website.\n
     - -> | <WdrDriver> Webdriver to use\n
     - -> | <query_term> Term of the PubChem query\n
     - -> | <query_status> Status of PubChem compound query\n
+    - -> | <PthOutput> Output folder, the safety data sheet is downloaded to its subfolder /SDB\n
     - <- | <return> Compound data dictionary"""
 
     cpd_data: dict[str, Any] = {}
@@ -220,16 +274,19 @@ def GetCompoundData(WdrDriver: WebDriver | None, query_term: str, query_status:
             pdf_link = WelPdfLink.get_attribute("href")
 
             file_name = f"SDB_{cpd_data["id_zvg"]}.pdf"
-            PthDownload = Path(GetCtkVar(gui.StvParentFolder)) / "SDB" / file_name
+            PthDownload = PthOutput / "SDB" / file_name
             PthDownload.parent.mkdir(parents=True, exist_ok=True)
-            RspPdfStream = get(url=pdf_link, stream=True)
-            try:
-                with open(PthDownload, "wb") as BwrPdfFile:
-                    BwrPdfFile.write(RspPdfStream.content)
-                cpd_data["file_sdb"] = file_name
-            except PermissionError as Error:
-                LogLOGGER.error(f"Error writing to <{file_name}>: <{Error}>.")
-                cpd_data["query_status_gt"] = f"Gestis | Error writing SDB to <{file_name}>! Is the file currently open?"
+            with StmMETRICS.Measure("pdf_download"):
+                RspPdfStream = get(url=pdf_link, stream=True)
+                try:
+                    with open(PthDownload, "wb") as BwrPdfFile:
+                        BwrPdfFile.write(RspPdfStream.content)
+                    cpd_data["file_sdb"] = file_name
+                except PermissionError as Error:
+                    LogLOGGER.error(f"Error writing to <{file_name}>: <{Error}>.")
+                    cpd_data["query_status_gt"] = (
+                        f"Gestis | Error writing SDB to <{file_name}>! Is the file currently open?"
+                    )
 
         # Handle a seldom StaleElement exception and an attribute error that results from missing web elements by retrying
         except (StaleElementReferenceException, AttributeError) as Error:
@@ -244,28 +301,48 @@ def GetCompoundData(WdrDriver: WebDriver | None, query_term: str, query_status:
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.5     Pass known synonyms to rank ambiguous hits
+# ++ 26-10-19    fJ      1.4     Skip queries while the circuit breaker is open
+# ++ 26-10-19    fJ      1.3     Added output folder for the safety data sheet
+# ++ 26-10-19    fJ      1.2     Added Timer decorator
+# ++ 26-10-19    fJ      1.1     Record hit resolution and extraction time to StmMETRICS
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def QueryGestis(WdrDriver: WebDriver, query_term: str) -> dict[str, Any]:
+@Timer
+def QueryGestis(
+    WdrDriver: WebDriver, query_term: str, PthOutput: Path, synonyms: Iterable[str] = ()
+) -> dict[str, Any]:
     """Queries Gestis for a query term and returns compound data as well as downloads the safety data sheet.\n
     - -> | <WdrDriver> Webdriver to use\n
     - -> | <query_term> Term to query the database\n
+    - -> | <PthOutput> Output folder, the safety data sheet is downloaded to its subfolder /SDB\n
+    - -> | <synonyms> Names and CAS numbers known from other sources for the chemical, to rank ambiguous hits\n
     - <- | <return> Compound data"""
 
+    if not CbrGESTIS.Allow():
+        status = f"Gestis | Skipped <{query_term}>: Source unavailable! Retrying later may help ..."
+        return GetCompoundData(WdrDriver=None, query_term=query_term, query_status=status)
+
     if WdrDriver is None:
         WdrDriver = fctSelenium.InitWebDriver(use_existing=True)
     fctSelenium.NavigateURL(WdrDriver=WdrDriver, url=URL)
 
     try:
         # Get and analyse query hits to get single compound dataset URL
-        status = GetHitStatus(WdrDriver=WdrDriver, query_term=query_term)
+        with StmMETRICS.Measure("hit_resolution"):
+            status = GetHitStatus(WdrDriver=WdrDriver, query_term=query_term, synonyms=synonyms)
 
         # Get compound data
-        cpd_data = GetCompoundData(WdrDriver=WdrDriver, query_term=query_term, query_status=status)
+        with StmMETRICS.Measure("extraction"):
+            cpd_data = GetCompoundData(
+                WdrDriver=WdrDriver, query_term=query_term, query_status=status, PthOutput=PthOutput
+            )
+        CbrGESTIS.RecordSuccess()
 
     # Most abundand error is a seldom StaleElement exception that we handle by retrying. If this fails, we skip the compound.
     except RetryFailedException as Error:
+        CbrGESTIS.RecordFailure()
         LogLOGGER.error(f"An stale element error occurred while querying compound <{query_term}>: <{Error}>.")
         status = f"Gestis | Skipped <{query_term}>: Error! This is not your fault. Retrying later may help ..."
         cpd_data = GetCompoundData(WdrDriver=None, query_term=query_term, query_status=status)
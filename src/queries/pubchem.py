@@ -5,17 +5,103 @@ from collections import namedtuple
 from datetime import datetime
 from typing import Any
 
-from pubchempy import Compound, PubChemPyError, get_compounds
+import pubchempy
+from pubchempy import Compound, PubChemHTTPError, PubChemPyError
+from requests import RequestException, Session
+from requests.adapters import HTTPAdapter
 
+from src.fctlib.circuitbreaker import GetCircuitBreaker
 from src.fctlib.converter import TryConvert
-from src.fctlib.decorators import Retry, RetryException, RetryFailedException
+from src.fctlib.decorators import ParseRetryAfter, Retry, RetryException, RetryFailedException, Timer
 from src.fctlib.logging import LogLOGGER
+from src.fctlib.metrics import StmMETRICS
+from src.fctlib.ratelimit import TokenBucket
 from src.fctlib.regex import CheckCasNo
-from src.settings import NOT_LISTED
+from src.fctlib.synonyms import IdxSYNONYMS
+from src.settings import (
+    NOT_LISTED,
+    PUBCHEM_POOL_SIZE,
+    PUBCHEM_REQUESTS_PER_SECOND,
+    PUBCHEM_TIMEOUT,
+    SYNONYM_INDEX_MAX_NAMES,
+)
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def InitPubChemSession() -> Session:
+    """Initialises the HTTP session for PubChem requests: Keep-alive connections pooled across threads, so the TCP and
+    TLS handshakes are made once per connection instead of once per request, and gzip-compressed responses.\n
+    - <- | <return> PubChem session"""
+
+    SesSession = Session()
+    AdpPool = HTTPAdapter(pool_connections=1, pool_maxsize=PUBCHEM_POOL_SIZE)
+    SesSession.mount("https://", AdpPool)
+    SesSession.mount("http://", AdpPool)
+    SesSession.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+
+    return SesSession
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Module variables
+# ++---------------------------------------------------------------------------------------------------------------------++#
+SesPUBCHEM = InitPubChemSession()
+"""HTTP session shared by all PubChem requests of the process."""
+BktPUBCHEM = TokenBucket(name="pubchem.ratelimit", rate=PUBCHEM_REQUESTS_PER_SECOND)
+"""Token bucket limiting all PubChem requests of the process to PubChem's rate limit, shared with the other processes
+in distributed runs (s. RunQueryWorker())."""
+CbrPUBCHEM = GetCircuitBreaker("PubChem")
+"""Circuit breaker skipping PubChem while it fails."""
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      0.1     Created
+# ++---------------------------------------------------------------------------------------------------------------------++#
+def GetPubChemJson(
+    identifier: str | int, namespace: str = "cid", operation: str | None = None
+) -> dict[str, Any] | None:
+    """Requests compound data from the PubChem PUG REST API on the shared session, like pubchempy.get_json().\n
+    - -> | <identifier> Compound identifier, i.e. a name or CID\n
+    - -> | <namespace> Identifier type, i.e. "name" or "cid"\n
+    - -> | <operation> Operation, i.e. "synonyms", None for the full compound records\n
+    - <- | <return> Parsed JSON response, None if PubChem found no compound\n
+    Raises RetryException if PubChem is busy or fails (with its Retry-After), PubChemHTTPError on other HTTP errors and
+    requests' RequestException on connection errors and timeouts."""
+
+    # pubchempy.API_BASE is read on each call, so it can be pointed elsewhere (i.e. by the benchmark)
+    url = "/".join(filter(None, [pubchempy.API_BASE, "compound", namespace, operation, "JSON"]))
+
+    BktPUBCHEM.Acquire()
+    # The identifier is posted like pubchempy does, so names don't need to be quoted
+    RspResponse = SesPUBCHEM.post(url, data={namespace: identifier}, timeout=PUBCHEM_TIMEOUT)
+
+    if RspResponse.status_code == 404:
+        return None
+    if not RspResponse.ok:
+        try:
+            fault = RspResponse.json()["Fault"]
+        except (RequestException, KeyError, TypeError):
+            fault = {}
+        Error = PubChemHTTPError(
+            code=RspResponse.status_code, msg=fault.get("Code", RspResponse.reason), details=fault.get("Details", [])
+        )
+        # Too many requests, busy or failing server: worth a retry, other errors fail the same way again
+        if RspResponse.status_code == 429 or RspResponse.status_code >= 500:
+            raise RetryException(str(Error), retry_after=ParseRetryAfter(RspResponse.headers.get("Retry-After")))
+        raise Error
+
+    return RspResponse.json()
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.3     Raise client errors as they are, they aren't failures of PubChem
+# ++ 26-10-19    fJ      1.2     Don't retry client errors
+# ++ 26-10-19    fJ      1.1     Request on the shared PubChem session
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.1     Extracted from QueryPubChem() to use retry decorator
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -24,49 +110,72 @@ def GetCompoundsList(query_term: str) -> list[Compound]:
     """Gets PubChem compound list for query term.\n
     - -> | <query_term> Query term to get PubChem compound(s)\n
     - <- | <return> List of PubChem compound(s)\n
-    This requires a PubChem request which can fail server-sided, so it is wrapped in a retry decorator."""
+    This requires a PubChem request which can fail server-sided, so it is wrapped in a retry decorator. Raises
+    PubChemHTTPError on client errors (i.e. a malformed query term), which aren't retried."""
 
     try:
-        return get_compounds(identifier=query_term, namespace="name")
-    except PubChemPyError as Error:
+        results = GetPubChemJson(identifier=query_term, namespace="name")
+    except RequestException as Error:
         raise RetryException(Error)
 
+    return [Compound(record) for record in results["PC_Compounds"]] if results else []
+
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      1.4     Add the synonyms to the synonym index on demand only
+# ++ 26-10-19    fJ      1.3     Add the synonyms to the synonym index
+# ++ 26-10-19    fJ      1.2     Don't retry client errors
+# ++ 26-10-19    fJ      1.1     Request the synonyms on the shared PubChem session instead of Compound.synonyms
 # ++ 24-03-04    fJ      1.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      0.1     Extracted from GetCompoundData() to use retry decorator
 # ++---------------------------------------------------------------------------------------------------------------------++#
 @Retry(RetryException)
-def GetCasNumbersFromSynonyms(PcpCpd: Compound) -> str:
+def GetCasNumbersFromSynonyms(PcpCpd: Compound, index_synonyms: bool = False) -> str:
     """Get all CAS numbers from synonyms of PubChem compound.\n
     - -> | <PcpCpd> PubChem compound to get synonyms for\n
+    - -> | <index_synonyms> Switch to add the synonyms to the synonym index, only for compounds known to be the queried
+    chemical\n
     - <- | <return> Concatenated CAS numbers\n
     This requires a PubChem request which can fail server-sided, so it is wrapped in a retry decorator."""
 
+    if getattr(PcpCpd, "cid", None) is None:
+        return NOT_LISTED
+
     try:
-        return (
-            ", ".join([synonym for synonym in PcpCpd.synonyms if CheckCasNo(synonym)])
-            if hasattr(PcpCpd, "synonyms")
-            else NOT_LISTED
-        )
-    except PubChemPyError as Error:
+        results = GetPubChemJson(identifier=PcpCpd.cid, operation="synonyms")
+    except RequestException as Error:
         raise RetryException(Error)
+    except PubChemPyError as Error:
+        raise RetryFailedException(Error)
+
+    synonyms = results["InformationList"]["Information"][0]["Synonym"] if results else []
+    cas_numbers = [synonym for synonym in synonyms if CheckCasNo(synonym)]
+    # Keep the names for later runs. PubChem lists the synonyms by relevance, so the first CAS number is the current
+    # one, the others are mostly deprecated.
+    if index_synonyms and cas_numbers:
+        IdxSYNONYMS.Add(cas_no=cas_numbers[0], names=synonyms[:SYNONYM_INDEX_MAX_NAMES])
+
+    return ", ".join(cas_numbers)
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      2.1     Pass on the switch to add the synonyms to the synonym index
 # ++ 24-03-04    fJ      2.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      1.1     Extracted GetCasNumbersFromSynonyms() to use retry decorator
 # ++ 24-02-16    fJ      1.0     Unit test: passed
 # ++ 24-02-16    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def GetCompoundData(query_term: str, query_status: str, PcpCpd: Compound | None, nt_init: bool = False) -> dict[str, Any]:
+def GetCompoundData(
+    query_term: str, query_status: str, PcpCpd: Compound | None, nt_init: bool = False, index_synonyms: bool = False
+) -> dict[str, Any]:
     """Returns a dictionary of selected compound data from an PubChem compound object.\n
     - -> | <query_status> Status of PubChem compound query\n
     - -> | <query_term> Term of the PubChem query\n
     - -> | <cpd> PubChem compound object\n
     - -> | <nt_init> Switch for initialisation of the named tuple\n
+    - -> | <index_synonyms> Switch to add the synonyms to the synonym index, s. GetCasNumbersFromSynonyms()\n
     - <- | <return> Compound data dictionary"""
     cpd_data: dict[str, Any] = {}
 
@@ -87,7 +196,7 @@ def GetCompoundData(query_term: str, query_status: str, PcpCpd: Compound | None,
 
         # We'll get CAS numbers from synonyms in an Retry-decorated function because of the extra PubChem request
         try:
-            cpd_data["cas_numbers"] = GetCasNumbersFromSynonyms(PcpCpd)
+            cpd_data["cas_numbers"] = GetCasNumbersFromSynonyms(PcpCpd, index_synonyms=index_synonyms)
         except RetryFailedException as Error:
             LogLOGGER.error(f"Failed to get CAS numbers from synonyms for <{query_term}>: {Error}")
             cpd_data["cas_numbers"] = "Error while getting synonyms!"
@@ -119,6 +228,11 @@ def GetCompoundData(query_term: str, query_status: str, PcpCpd: Compound | None,
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ DATE        DEV     VER     ACTIONS
+# ++ 26-10-19    fJ      2.5     Skip queries on client errors without counting them as failures of PubChem
+# ++ 26-10-19    fJ      2.4     Add the synonyms to the synonym index on demand only
+# ++ 26-10-19    fJ      2.3     Skip queries while the circuit breaker is open
+# ++ 26-10-19    fJ      2.2     Added Timer decorator
+# ++ 26-10-19    fJ      2.1     Record hit resolution and extraction time to StmMETRICS
 # ++ 24-03-04    fJ      2.0     Dev tests: passed ... works as intended
 # ++ 24-02-28    fJ      1.1     Extracted GetCompounds() to use retry decorator
 # ++ 24-02-16    fJ      1.0     Unit test: passed
@@ -126,14 +240,31 @@ def GetCompoundData(query_term: str, query_status: str, PcpCpd: Compound | None,
 # ++ 24-02-06    fJ      0.2     Added docstring
 # ++ 24-02-04    fJ      0.1     Created
 # ++---------------------------------------------------------------------------------------------------------------------++#
-def QueryPubChem(query_term: str) -> dict[str, Any]:
+@Timer
+def QueryPubChem(query_term: str, index_synonyms: bool = False) -> dict[str, Any]:
     """Queries PubChem for a query term and returns compound data.\n
     - -> | <query_term> Term to query the database\n
+    - -> | <index_synonyms> Switch to add the compound's synonyms to the synonym index, only for query terms known to
+    identify the chemical (i.e. a CAS number from the input)\n
     - <- | <return> Compound data"""
 
+    if not CbrPUBCHEM.Allow():
+        status = f"PubChem | Skipped <{query_term}>: Source unavailable! Retrying later may help ..."
+        return GetCompoundData(query_term=query_term, query_status=status, PcpCpd=None)
+
     try:
-        compounds: list[Compound] = GetCompoundsList(query_term=query_term)
+        with StmMETRICS.Measure("hit_resolution"):
+            compounds: list[Compound] = GetCompoundsList(query_term=query_term)
+        CbrPUBCHEM.RecordSuccess()
+    # Only busy or failing servers and transport errors count for the breaker, PubChem itself answered client errors
+    except PubChemHTTPError as Error:
+        CbrPUBCHEM.RecordSuccess()
+        LogLOGGER.warning(f"PubChem rejected the query of compound <{query_term}>: <{Error}>.")
+        status = f"PubChem | Skipped <{query_term}>: Query rejected by PubChem! Check the query term ..."
+        compounds = None
+        compound = None
     except RetryFailedException as Error:
+        CbrPUBCHEM.RecordFailure()
         LogLOGGER.error(f"An PubChem error occurred while querying compound <{query_term}>: <{Error}>.")
         status = f"PubChem | Skipped <{query_term}>: Error! This is not your fault. Retrying later may help ..."
         compounds = None
@@ -149,7 +280,10 @@ def QueryPubChem(query_term: str) -> dict[str, Any]:
 
         compound = compounds[0] if len(compounds) == 1 else None
 
-    return GetCompoundData(query_term=query_term, query_status=status, PcpCpd=compound)
+    with StmMETRICS.Measure("extraction"):
+        return GetCompoundData(
+            query_term=query_term, query_status=status, PcpCpd=compound, index_synonyms=index_synonyms
+        )
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
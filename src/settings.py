@@ -28,6 +28,20 @@ PthCONFIG_FILE = Path.cwd() / "config.ini"
 """Config.ini file path."""
 PthLOGFILE = Path.cwd() / "logs" / f"{datetime.now().strftime('%Y-%m')}.log"
 """Log file path."""
+LOG_MAX_BYTES = 5 * 1024 * 1024
+"""Size [bytes] at which the log file gets rotated."""
+LOG_BACKUP_COUNT = 5
+"""Number of rotated log files to keep."""
+PthMETRICS_FOLDER = Path.cwd() / "logs" / "metrics"
+"""Folder path for run profiles with stage timings."""
+PthSYNONYM_INDEX = Path.cwd() / "data" / "synonyms.json"
+"""Synonym index file path, names of chemicals found in past runs to resolve name-only rows to CAS numbers."""
+METRICS_FILE_FORMAT = ".jsonl"
+"""File format of run profiles: ".jsonl" or ".csv"."""
+METRICS_CPU_PROFILE = False
+"""Switch to capture a cProfile of the query processing in the run profile. Slows down processing noticeably."""
+METRICS_TRACE_MEMORY = False
+"""Switch to trace the memory peak of the query processing in the run profile. Slows down processing noticeably."""
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -39,6 +53,26 @@ STD_SIZE = 14
 """ GUI base size for fonts and widgets."""
 GUI_PADDING = 8
 """ GUI standard padding."""
+PROGRESS_POLL_INTERVAL = 250
+"""Interval [ms] in which the GUI polls and renders processing progress."""
+PRINTER_POLL_INTERVAL = 100
+"""Interval [ms] in which the GUI polls and renders log entries in the Printer textbox."""
+PRINTER_MAX_LINES = 1000
+"""Maximum number of lines the Printer textbox keeps, the full log is written to the log file."""
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Command line settings
+# ++---------------------------------------------------------------------------------------------------------------------++#
+CLI_PROGRESS_INTERVAL = 10
+"""Interval [s] in which the command line interface logs processing progress."""
+BROKER_CONNECT_TIMEOUT = 60
+"""Time [s] a worker process keeps retrying to connect to the broker, so workers may start before the coordinator."""
+WORKER_STOP_TIMEOUT = 60
+"""Time [s] to wait for a worker process to finish its current query before it gets terminated."""
+JOB_TIMEOUT = 600
+"""Time [s] a worker process may take for a chemical before it is queried by another worker process."""
+JOB_MAX_ATTEMPTS = 2
+"""Number of worker processes a chemical is handed to before it is skipped, so it doesn't kill all of them."""
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ IO settings
@@ -51,12 +85,46 @@ SUPPORTED_EXTENSIONS = {
 
 SUPPORTED_REQUEST_COL_NAMES = ["CAS", "Name"]
 """Column names supported as sources for web requests.""" ""
+FILE_CACHE_SIZE = 64
+"""Number of parsed input files kept in memory, so processing reuses the files parsed by the analysis."""
+FILE_READ_PROCESSES = 8
+"""Maximum number of processes to parse input files in parallel, limited to the number of CPUs. 1 disables it."""
+FILE_READ_PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+"""Total size [bytes] of input files from which on they are parsed in parallel, as starting processes takes a second."""
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Queries settings
 # ++---------------------------------------------------------------------------------------------------------------------++#
 NOT_LISTED = "Not listed!"
 """String used for denoting not listed entries."""
+RETRY_BUDGET_RATIO = 0.2
+"""Share of query calls that may be retried while a service fails, s. fctlib.decorators.RetryBudget."""
+RETRY_BUDGET_RESERVE = 20
+"""Number of retries that may be made at once, i.e. at the start of a run."""
+RETRY_MAX_DELAY = 30
+"""Maximum delay [s] between retries, longer Retry-After requests of a service aren't retried."""
+BREAKER_FAILURE_RATE = 0.5
+"""Share of failed queries of a source that stops querying it for a while, s. fctlib.circuitbreaker.CircuitBreaker."""
+BREAKER_WINDOW = 20
+"""Number of latest queries of a source the failure rate is taken from."""
+BREAKER_MIN_CALLS = 10
+"""Number of queries of a source needed before it may be stopped."""
+BREAKER_OPEN_TIME = 60
+"""Time [s] a stopped source is skipped before a single query probes if it is available again."""
+PUBCHEM_REQUESTS_PER_SECOND = 5
+"""PubChem's documented rate limit [requests/s], shared by all threads and worker processes of a run."""
+PUBCHEM_TIMEOUT = (5, 30)
+"""Connect and read timeout [s] of PubChem requests."""
+PUBCHEM_POOL_SIZE = 16
+"""Number of keep-alive connections to PubChem shared by all threads of a process."""
+RANKING_MIN_SCORE = 0.8
+"""Minimum score [0..1] of the best ranked hit to be selected out of ambiguous hits, s. fctlib.ranking."""
+RANKING_RUNNER_UPS = 3
+"""Number of runner-up hits recorded in the query status when the best ranked hit is selected."""
+SYNONYM_INDEX_MAX_NAMES = 100
+"""Maximum number of PubChem synonyms indexed per chemical, PubChem lists the most common names first."""
+FUZZY_MIN_SCORE = 0.8
+"""Minimum trigram similarity [0..1] of a name to an indexed name to report the match in the output, s. fctlib.fuzzy."""
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Selenium settings
@@ -69,3 +137,5 @@ DRV_TIMEOUT = 3
 """Timeout for webdriver actions."""
 DRV_NO_TIMEOUT = 0.01
 """Timeout and poll frequency for webdriver actions if none is needed."""
+DRV_SCROLL_ATTEMPTS = 5
+"""Maximum number of attempts to scroll an element into view."""
@@ -0,0 +1,156 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+from multiprocessing import AuthenticationError
+from queue import Empty
+from threading import Thread
+
+from src.fctlib.broker import ConnectBroker, GetWorkerId, JobTracker, RunWorker, StartBroker
+
+
+def Square(payload: int) -> int:
+    if payload < 0:
+        raise ValueError("negative")
+    return payload**2
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for BrokerManager, StartBroker, ConnectBroker and RunWorker
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestBroker(unittest.TestCase):
+    def setUp(self):
+        self.broker = StartBroker(authkey=b"test")
+
+    def tearDown(self):
+        self.broker.shutdown()
+
+    def RunWorkers(self, count: int) -> list[Thread]:
+        threads = []
+        for _ in range(count):
+            worker = ConnectBroker(address=self.broker.address, authkey=b"test", timeout=5)
+            threads.append(Thread(target=RunWorker, args=(worker, Square), daemon=True))
+            threads[-1].start()
+        return threads
+
+    def test_jobs_are_processed_once(self):
+        QueJobs = self.broker.GetJobQueue()
+        for job_id in range(20):
+            QueJobs.put((job_id, job_id))
+        QueJobs.put(None)
+
+        threads = self.RunWorkers(3)
+        QueResults = self.broker.GetResultQueue()
+        results = dict(QueResults.get(timeout=5)[:2] for _ in range(20))
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(results, {job_id: job_id**2 for job_id in range(20)})
+        self.assertTrue(all(not thread.is_alive() for thread in threads))
+
+    def test_failing_job(self):
+        QueJobs = self.broker.GetJobQueue()
+        QueJobs.put(("bad", -1))
+        QueJobs.put(("good", 2))
+        QueJobs.put(None)
+
+        self.RunWorkers(1)
+        QueResults = self.broker.GetResultQueue()
+        results = {job_id: (result, error) for job_id, result, error in (QueResults.get(timeout=5) for _ in range(2))}
+
+        self.assertIsNone(results["bad"][0])
+        self.assertIn("ValueError", results["bad"][1])
+        self.assertEqual(results["good"], (4, None))
+
+    def test_token_bucket_shared_by_workers(self):
+        workers = [ConnectBroker(address=self.broker.address, authkey=b"test", timeout=5) for _ in range(2)]
+        buckets = [worker.GetTokenBucket("TestBucket", 0.1) for worker in workers]
+
+        self.assertEqual(buckets[0].Reserve(), 0.0)
+        self.assertGreater(buckets[1].Reserve(), 9.0)
+
+    def test_wrong_authkey(self):
+        with self.assertRaises(AuthenticationError):
+            ConnectBroker(address=self.broker.address, authkey=b"wrong", timeout=1)
+
+    def test_unreachable_broker(self):
+        with self.assertRaises(ConnectionError):
+            ConnectBroker(address=("127.0.0.1", 1), authkey=b"test", timeout=0.5)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for JobTracker
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestJobTracker(unittest.TestCase):
+    def setUp(self):
+        self.broker = StartBroker(authkey=b"test")
+        self.dead_workers = set()
+        self.tracker = JobTracker(
+            MgrBroker=self.broker,
+            timeout=60,
+            max_attempts=2,
+            IsWorkerDead=lambda worker_id: worker_id in self.dead_workers,
+        )
+
+    def tearDown(self):
+        self.broker.shutdown()
+
+    def TakeJob(self, worker_id: tuple[str, int]):
+        """Takes the next job like a worker that dies afterwards."""
+        job_id, _ = self.broker.GetJobQueue().get(timeout=5)
+        self.broker.GetLeaseQueue().put((job_id, worker_id))
+        self.dead_workers.add(worker_id)
+
+    def RunWorker(self):
+        self.broker.GetJobQueue().put(None)
+        worker = ConnectBroker(address=self.broker.address, authkey=b"test", timeout=5)
+        Thread(target=RunWorker, args=(worker, Square), daemon=True).start()
+
+    def test_results_of_pending_jobs(self):
+        for job_id in range(5):
+            self.tracker.Put(job_id, job_id)
+        self.RunWorker()
+
+        results = dict(self.tracker.Get(timeout=5)[:2] for _ in range(5))
+        self.assertEqual(results, {job_id: job_id**2 for job_id in range(5)})
+        self.assertEqual(self.tracker.pending_count, 0)
+
+    def test_job_of_dead_worker_requeued(self):
+        self.tracker.Put("job", 3)
+        self.TakeJob(("host", 1))
+        with self.assertRaises(Empty):
+            self.tracker.Get(timeout=0.1)
+        self.RunWorker()
+
+        self.assertEqual(self.tracker.Get(timeout=5), ("job", 9, None))
+        self.assertEqual(self.tracker.pending_count, 0)
+
+    def test_job_failed_after_max_attempts(self):
+        self.tracker.Put("job", 3)
+        self.TakeJob(("host", 1))
+        with self.assertRaises(Empty):
+            self.tracker.Get(timeout=0.1)
+        self.TakeJob(("host", 2))
+
+        job_id, result, error = self.tracker.Get(timeout=5)
+        self.assertEqual((job_id, result), ("job", None))
+        self.assertIn("died", error)
+        self.assertEqual(self.tracker.pending_count, 0)
+        self.assertTrue(self.broker.GetJobQueue().empty())
+
+    def test_job_of_timed_out_worker_requeued(self):
+        self.tracker.timeout = 0
+        self.tracker.Put("job", 3)
+        job_id, _ = self.broker.GetJobQueue().get(timeout=5)
+        self.broker.GetLeaseQueue().put((job_id, GetWorkerId()))
+        with self.assertRaises(Empty):
+            self.tracker.Get(timeout=0.1)
+
+        self.assertEqual(self.broker.GetJobQueue().get(timeout=5), ("job", 3))
+
+    def test_late_result_dropped(self):
+        self.tracker.Put("job", 3)
+        self.broker.GetResultQueue().put(("former", 1, None))
+        self.broker.GetResultQueue().put(("job", 9, None))
+
+        self.assertEqual(self.tracker.Get(timeout=5), ("job", 9, None))
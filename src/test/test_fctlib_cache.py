@@ -0,0 +1,103 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from src.fctlib.cache import FileCache
+from src.fctlib.metrics import RegMETRICS
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for FileCache
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.PthFile = Path(self.temp_dir.name) / "test.csv"
+        self.PthFile.write_text("CAS\n50-00-0\n")
+        self.cache = FileCache(name="TestCache", max_entries=2)
+        self.loads: list[Path] = []
+        RegMETRICS.Reset()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def Load(self, PthFile: Path, suffix: str = "") -> str:
+        self.loads.append(PthFile)
+        return PthFile.read_text() + suffix
+
+    def test_hit(self):
+        first = self.cache.GetOrLoad(self.PthFile, self.Load)
+        second = self.cache.GetOrLoad(self.PthFile, self.Load)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.loads), 1)
+        self.assertEqual(RegMETRICS.GetCounter("TestCache.hits").value, 1)
+        self.assertEqual(RegMETRICS.GetCounter("TestCache.misses").value, 1)
+
+    def test_changed_file(self):
+        self.cache.GetOrLoad(self.PthFile, self.Load)
+        self.PthFile.write_text("CAS\n64-17-5\n")
+        # Same size, so the modification time has to invalidate the entry
+        stat = self.PthFile.stat()
+        os.utime(self.PthFile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(self.cache.GetOrLoad(self.PthFile, self.Load), "CAS\n64-17-5\n")
+        self.assertEqual(len(self.loads), 2)
+
+    def test_args_are_part_of_key(self):
+        self.assertEqual(self.cache.GetOrLoad(self.PthFile, self.Load, "!"), "CAS\n50-00-0\n!")
+        self.assertEqual(self.cache.GetOrLoad(self.PthFile, self.Load, "?"), "CAS\n50-00-0\n?")
+        self.assertEqual(len(self.loads), 2)
+
+    def test_least_recently_used_dropped(self):
+        for suffix in ["a", "b", "a", "c"]:
+            self.cache.GetOrLoad(self.PthFile, self.Load, suffix)
+
+        self.assertEqual(len(self.cache), 2)
+        self.cache.GetOrLoad(self.PthFile, self.Load, "a")
+        self.cache.GetOrLoad(self.PthFile, self.Load, "b")
+        self.assertEqual(len(self.loads), 4)
+
+    def test_errors_not_cached(self):
+        def Fail(PthFile: Path):
+            raise PermissionError()
+
+        with self.assertRaises(PermissionError):
+            self.cache.GetOrLoad(self.PthFile, Fail)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            self.cache.GetOrLoad(self.PthFile.with_name("missing.csv"), self.Load)
+
+    @patch("src.fctlib.cache.cpu_count", return_value=2)
+    def test_preload(self, _):
+        file_paths = [self.PthFile.with_name(f"{file_no}.csv") for file_no in range(3)]
+        for file_no, PthFile in enumerate(file_paths):
+            PthFile.write_text(f"CAS\n{file_no}\n")
+        # Loading a folder fails in the worker process, GetOrLoad() raises it
+        file_paths.append(Path(self.temp_dir.name))
+
+        self.assertEqual(self.cache.Preload(file_paths, Path.read_text, max_workers=2), 2)
+        self.cache.max_entries = 4
+        # Only files that aren't cached yet get loaded
+        self.assertEqual(self.cache.Preload(file_paths, Path.read_text, max_workers=2), 1)
+        self.assertEqual([self.cache.GetOrLoad(PthFile, Path.read_text) for PthFile in file_paths[:3]][2], "CAS\n2\n")
+        self.assertEqual(RegMETRICS.GetCounter("TestCache.hits").value, 3)
+        self.assertEqual(RegMETRICS.GetCounter("TestCache.misses").value, 0)
+        with self.assertRaises(IsADirectoryError):
+            self.cache.GetOrLoad(file_paths[3], Path.read_text)
+
+    @patch("src.fctlib.cache.cpu_count", return_value=2)
+    def test_preload_skipped(self, _):
+        file_paths = [self.PthFile, self.PthFile.with_name("other.csv")]
+        file_paths[1].write_text("CAS\n")
+
+        self.assertEqual(self.cache.Preload(file_paths, Path.read_text, min_bytes=1024), 0)
+        self.assertEqual(self.cache.Preload(file_paths, Path.read_text, max_workers=1), 0)
+        self.assertEqual(len(self.cache), 0)
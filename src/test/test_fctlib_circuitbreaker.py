@@ -0,0 +1,107 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+from time import sleep
+
+from src.fctlib.circuitbreaker import (
+    BREAKERS,
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    GetCircuitBreaker,
+    ResetCircuitBreakers,
+)
+from src.fctlib.metrics import RegMETRICS
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for CircuitBreaker
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        RegMETRICS.Reset()
+        self.breaker = CircuitBreaker(name="TestSource", failure_rate=0.5, window=10, min_calls=4, open_time=0.05)
+
+    def Record(self, outcomes: str):
+        for outcome in outcomes:
+            self.assertTrue(self.breaker.Allow())
+            self.breaker.RecordSuccess() if outcome == "+" else self.breaker.RecordFailure()
+
+    def test_stays_closed_below_failure_rate(self):
+        self.Record("+-++-++")
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_stays_closed_below_min_calls(self):
+        self.Record("---")
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_opens_on_failure_rate(self):
+        self.Record("++--")
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.Allow())
+        self.assertEqual(RegMETRICS.GetCounter("breaker.TestSource.opened").value, 1)
+        self.assertEqual(RegMETRICS.GetCounter("breaker.TestSource.rejected").value, 1)
+
+    def test_old_outcomes_leave_the_window(self):
+        self.breaker = CircuitBreaker(name="TestSource", failure_rate=0.5, window=4, min_calls=4)
+        self.Record("-++++")
+        # 2 of 6 calls failed, but only 1 of the latest 4
+        self.Record("-")
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_single_probe_when_half_open(self):
+        self.Record("----")
+        sleep(0.06)
+
+        self.assertTrue(self.breaker.Allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        # Other calls wait for the outcome of the probe
+        self.assertFalse(self.breaker.Allow())
+
+    def test_successful_probe_closes(self):
+        self.Record("----")
+        sleep(0.06)
+        self.Record("+")
+
+        self.assertEqual(self.breaker.state, CLOSED)
+        # The failures before don't count anymore
+        self.Record("-")
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_failed_probe_opens_again(self):
+        self.Record("----")
+        sleep(0.06)
+        self.Record("-")
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.Allow())
+
+    def test_reset(self):
+        self.Record("----")
+        self.breaker.Reset()
+
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.Allow())
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetCircuitBreaker and ResetCircuitBreakers
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestCircuitBreakers(unittest.TestCase):
+    def tearDown(self):
+        BREAKERS.pop("TestRegistry", None)
+
+    def test_same_breaker_per_name(self):
+        self.assertIs(GetCircuitBreaker("TestRegistry"), GetCircuitBreaker("TestRegistry"))
+
+    def test_reset_all(self):
+        breaker = GetCircuitBreaker("TestRegistry")
+        for _ in range(breaker.min_calls):
+            breaker.RecordFailure()
+        self.assertEqual(breaker.state, OPEN)
+
+        ResetCircuitBreakers()
+        self.assertEqual(breaker.state, CLOSED)
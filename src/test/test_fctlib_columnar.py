@@ -0,0 +1,93 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+from collections import namedtuple
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pandas
+
+from src.fctlib.columnar import ColumnarBuffer, ColumnarColumn
+from src.fctlib.pandas import GetDfFromNtList, WriteDfToParquet
+
+NtpTEST = namedtuple("NtpTEST", ["status", "mass", "count", "mixed", "empty"], defaults=(None,) * 5)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for ColumnarBuffer
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestColumnarBuffer(unittest.TestCase):
+    def setUp(self):
+        self.records = [
+            NtpTEST("Success!", 30.03, 1, 46.07),
+            NtpTEST(),
+            NtpTEST("Success!", 46.07, 2, "Not listed!"),
+            NtpTEST("No query hit found!", 18.02, None, "Not listed!"),
+        ]
+        self.buffer = ColumnarBuffer(fields=NtpTEST._fields, rows_count=len(self.records))
+        # Rows are set in any order, by position or by field name
+        self.buffer.SetRow(3, self.records[3])
+        self.buffer.SetRow(0, self.records[0])
+        self.buffer.SetRow(2, self.records[2]._asdict())
+
+    def test_get_row(self):
+        for row_no, record in enumerate(self.records):
+            self.assertEqual(self.buffer.GetRow(row_no), tuple(record))
+
+    def test_column_types(self):
+        DfResult = self.buffer.ToDataFrame()
+
+        self.assertEqual(str(DfResult["status"].dtype), "category")
+        self.assertEqual(DfResult["mass"].dtype, "float64")
+        self.assertEqual(str(DfResult["count"].dtype), "Int64")
+        self.assertEqual(DfResult["mixed"].dtype, object)
+
+    def test_same_values_as_records(self):
+        DfExpected = GetDfFromNtList(nt_list=self.records, nt_constructor=NtpTEST)
+        DfResult = self.buffer.ToDataFrame()
+
+        self.assertEqual(len(DfResult), len(DfExpected))
+        for col in NtpTEST._fields:
+            expected = [None if pandas.isna(value) else value for value in DfExpected[col]]
+            self.assertEqual([None if pandas.isna(value) else value for value in DfResult[col]], expected)
+
+    def test_write_parquet(self):
+        with TemporaryDirectory() as tmp_dir:
+            self.assertTrue(WriteDfToParquet(self.buffer.ToDataFrame(), Path(tmp_dir) / "test.parquet"))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for ColumnarColumn
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestColumnarColumn(unittest.TestCase):
+    def test_repeated_strings_stored_once(self):
+        column = ColumnarColumn(rows_count=100)
+        for row_no in range(100):
+            column.Set(row_no, "Not listed!" if row_no % 2 else "".join(["Succ", "ess!"]))
+
+        self.assertEqual(column.categories, ["Success!", "Not listed!"])
+        self.assertEqual(str(column.ToSeries("test").dtype), "category")
+
+    def test_distinct_strings_not_looked_up(self):
+        column = ColumnarColumn(rows_count=4)
+        for row_no, value in enumerate(["a", "b", "c", "a"]):
+            column.Set(row_no, value)
+
+        self.assertEqual(column.ToSeries("test").tolist(), ["a", "b", "c", "a"])
+        self.assertNotEqual(str(column.ToSeries("test").dtype), "category")
+
+    def test_ints_turn_into_floats(self):
+        column = ColumnarColumn(rows_count=2)
+        column.Set(0, 1)
+        column.Set(1, 1.5)
+
+        self.assertEqual(column.ToSeries("test").tolist(), [1.0, 1.5])
+
+    def test_other_values_as_strings(self):
+        column = ColumnarColumn(rows_count=3)
+        column.Set(0, True)
+        column.Set(1, ["50-00-0"])
+        column.Set(2, 2**64)
+
+        self.assertEqual([column.Get(row_no) for row_no in range(3)], ["True", "['50-00-0']", str(2**64)])
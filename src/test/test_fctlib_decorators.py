@@ -3,8 +3,13 @@
 # ++---------------------------------------------------------------------------------------------------------------------++#
 import contextlib
 import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from threading import Event
+from unittest.mock import patch
 
 from src.fctlib import decorators
+from src.fctlib.metrics import RegMETRICS
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -39,3 +44,151 @@ class TestRetry(unittest.TestCase):
         with contextlib.suppress(decorators.RetryFailedException):
             test_func()
         self.assertEqual(attempt_count, 3)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for Retry backoff, budget and cancellation
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestRetryBackoff(unittest.TestCase):
+    def setUp(self):
+        RegMETRICS.Reset()
+        self.budget = decorators.RetryBudget(ratio=0.2, reserve=20)
+        patcher = patch.object(decorators, "BdgRETRIES", self.budget)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.calls = 0
+
+    def Fail(self, retry_after: float | None = None):
+        self.calls += 1
+        raise decorators.RetryException("failure", retry_after=retry_after)
+
+    def test_exponential_backoff_with_full_jitter(self):
+        func = decorators.Retry(attempts=4, delay=0.5, max_delay=1.5)(self.Fail)
+
+        with patch.object(decorators, "uniform", return_value=0.0) as uniform:
+            with self.assertRaises(decorators.RetryFailedException):
+                func()
+
+        self.assertEqual([call.args for call in uniform.call_args_list], [(0, 0.5), (0, 1.0), (0, 1.5)])
+        self.assertEqual(RegMETRICS.GetCounter("retry.retries").value, 3)
+        self.assertEqual(RegMETRICS.GetCounter("retry.given_up.exhausted").value, 1)
+
+    def test_retry_after_waited(self):
+        func = decorators.Retry(attempts=2, delay=0)(lambda: self.Fail(retry_after=0.05))
+
+        with self.assertRaises(decorators.RetryFailedException):
+            func()
+
+        self.assertEqual(self.calls, 2)
+        self.assertGreaterEqual(RegMETRICS.GetHistogram("retry.delay").GetSummary()["min"], 0.05)
+
+    def test_long_retry_after_not_retried(self):
+        func = decorators.Retry(attempts=3, delay=0, max_delay=1)(lambda: self.Fail(retry_after=60))
+
+        with self.assertRaises(decorators.RetryFailedException):
+            func()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(RegMETRICS.GetCounter("retry.given_up.retry_after").value, 1)
+
+    def test_budget_exhausted(self):
+        self.budget.ratio = 0.0
+        self.budget.reserve = 1
+        self.budget.Start()
+        func = decorators.Retry(attempts=3, delay=0)(self.Fail)
+
+        for _ in range(2):
+            with self.assertRaises(decorators.RetryFailedException):
+                func()
+
+        # The only token is used by the first call, the second call isn't retried
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(RegMETRICS.GetCounter("retry.given_up.budget").value, 2)
+
+    def test_budget_refilled_by_calls(self):
+        budget = decorators.RetryBudget(ratio=0.5, reserve=1)
+        self.assertTrue(budget.Withdraw())
+        self.assertFalse(budget.Withdraw())
+        budget.Deposit()
+        budget.Deposit()
+        self.assertTrue(budget.Withdraw())
+
+    def test_cancelled_while_waiting(self):
+        EvtCancel = Event()
+        EvtCancel.set()
+        self.budget.Start(EvtCancel=EvtCancel)
+        func = decorators.Retry(attempts=3, delay=10, max_delay=10)(self.Fail)
+
+        with self.assertRaises(decorators.RetryFailedException):
+            func()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(RegMETRICS.GetCounter("retry.given_up.cancelled").value, 1)
+
+    def test_other_exceptions_not_retried(self):
+        def test_func():
+            self.calls += 1
+            raise ValueError("failure")
+
+        with self.assertRaises(ValueError):
+            decorators.Retry(delay=0)(test_func)()
+        self.assertEqual(self.calls, 1)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for ParseRetryAfter
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestParseRetryAfter(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(decorators.ParseRetryAfter("5"), 5.0)
+
+    def test_http_date(self):
+        date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        self.assertAlmostEqual(decorators.ParseRetryAfter(date), 30, delta=2)
+
+    def test_past_http_date(self):
+        self.assertEqual(decorators.ParseRetryAfter("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(decorators.ParseRetryAfter(None))
+        self.assertIsNone(decorators.ParseRetryAfter("soon"))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for Timer
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestTimer(unittest.TestCase):
+    def setUp(self):
+        RegMETRICS.Reset()
+
+    def test_timer_without_arguments(self):
+        @decorators.Timer
+        def test_timer_func():
+            return "success"
+
+        self.assertEqual(test_timer_func(), "success")
+        self.assertEqual(test_timer_func.__name__, "test_timer_func")
+        self.assertEqual(RegMETRICS.GetSummary()["histograms"]["test_timer_func"]["count"], 1)
+        self.assertEqual(RegMETRICS.GetSummary()["histograms"]["test_timer_func.cpu"]["count"], 1)
+
+    def test_timer_with_name(self):
+        @decorators.Timer(name="test_timer_named")
+        def test_func():
+            return "success"
+
+        test_func()
+        test_func()
+
+        self.assertEqual(RegMETRICS.GetSummary()["histograms"]["test_timer_named"]["count"], 2)
+
+    def test_timer_counts_errors(self):
+        @decorators.Timer(name="test_timer_error")
+        def test_func():
+            raise ValueError("failure")
+
+        with self.assertRaises(ValueError):
+            test_func()
+
+        summary = RegMETRICS.GetSummary()
+        self.assertEqual(summary["counters"]["test_timer_error.errors"], 1)
+        self.assertEqual(summary["histograms"]["test_timer_error"]["count"], 1)
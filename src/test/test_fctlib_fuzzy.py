@@ -0,0 +1,112 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+
+from src.fctlib.fuzzy import CleanName, GetMarkers, GetTrigrams, NameMatch, NameMatcher
+from src.fctlib.metrics import RegMETRICS
+from src.fctlib.synonyms import SynonymIndex
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for CleanName, GetTrigrams and GetMarkers
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestCleanName(unittest.TestCase):
+    def test_grades(self):
+        self.assertEqual(CleanName("Aceton techn."), "Aceton")
+        self.assertEqual(CleanName("Methanol p.a."), "Methanol")
+        self.assertEqual(CleanName("Glycerin Ph. Eur."), "Glycerin")
+        self.assertEqual(CleanName("Toluol, reinst"), "Toluol")
+        self.assertEqual(CleanName("Natriumchlorid (techn.)"), "Natriumchlorid")
+
+    def test_concentrations(self):
+        self.assertEqual(CleanName("Ethanol 96%"), "Ethanol")
+        self.assertEqual(CleanName("Ethanol 96 % vergällt"), "Ethanol")
+        self.assertEqual(CleanName("Salzsäure 37 % (w/w)"), "Salzsäure")
+        self.assertEqual(CleanName("Schwefelsäure 95-97%"), "Schwefelsäure")
+        self.assertEqual(CleanName("Natronlauge 0,1 M"), "Natronlauge")
+        self.assertEqual(CleanName("Wasserstoffperoxid ca. 30%"), "Wasserstoffperoxid")
+
+    def test_names_kept(self):
+        self.assertEqual(CleanName("1,2-Dichlorethan"), "1,2-Dichlorethan")
+        self.assertEqual(CleanName("2-Propanol"), "2-Propanol")
+        self.assertEqual(CleanName("Vitamin B12"), "Vitamin B12")
+        # Nothing left
+        self.assertEqual(CleanName(" techn. "), "techn.")
+
+    def test_trigrams(self):
+        self.assertEqual(GetTrigrams("ab"), {"##a": 1, "#ab": 1, "ab#": 1})
+        self.assertEqual(sum(GetTrigrams("aceton").values()), len("aceton") + 1)
+
+    def test_markers(self):
+        self.assertEqual(GetMarkers("12dichlorbenzol"), ["12", "di"])
+        self.assertEqual(GetMarkers("2methylpropan1ol"), ["2", "meth", "prop", "1"])
+        self.assertEqual(GetMarkers("ethylacetat"), ["eth"])
+        self.assertEqual(GetMarkers("aceton"), [])
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for NameMatcher
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestNameMatcher(unittest.TestCase):
+    def setUp(self):
+        RegMETRICS.Reset()
+        index = SynonymIndex()
+        index.Add("67-64-1", ["Aceton", "Propan-2-on", "Dimethylketon"])
+        index.Add("64-17-5", ["Ethanol", "Ethylalkohol"])
+        index.Add("71-23-8", ["1-Propanol"])
+        index.Add("67-63-0", ["2-Propanol", "Isopropanol"])
+        index.Add("95-50-1", ["1,2-Dichlorbenzol"])
+        index.Add("141-78-6", ["Ethylacetat", "Essigsäureethylester"])
+        index.Add("75-65-0", ["tert-Butanol", "2-Methylpropan-2-ol"])
+        index.Add("76-22-2", ["Campher"])
+        index.Add("79-92-5", ["Camphen"])
+        self.matcher = NameMatcher(index=index, min_score=0.8)
+
+    def test_exact(self):
+        self.assertEqual(self.matcher.Match("ethanol"), NameMatch("ethanol", "64-17-5", 1.0))
+        self.assertEqual(RegMETRICS.GetCounter("fuzzy.exact").value, 1)
+
+    def test_cleaned(self):
+        self.assertEqual(self.matcher.Match("Aceton techn."), NameMatch("Aceton", "67-64-1", 1.0))
+        self.assertEqual(RegMETRICS.GetCounter("fuzzy.cleaned").value, 1)
+
+    def test_similar(self):
+        match = self.matcher.Match("Ethylalkohol 96%")
+        self.assertEqual(match.cas_no, "64-17-5")
+
+        match = self.matcher.Match("Dimethylketon, rein")
+        self.assertEqual((match.term, match.cas_no), ("Dimethylketon", "67-64-1"))
+
+        match = self.matcher.Match("Isopropanolum")
+        self.assertEqual((match.term, match.cas_no), ("Isopropanolum", "67-63-0"))
+        self.assertGreaterEqual(match.confidence, 0.8)
+        self.assertLess(match.confidence, 1.0)
+        self.assertEqual(RegMETRICS.GetHistogram("fuzzy.confidence").GetSummary()["count"], 1)
+
+    def test_unmatched(self):
+        self.assertEqual(self.matcher.Match("Toluol techn."), NameMatch("Toluol", None, 0.0))
+        self.assertEqual(RegMETRICS.GetCounter("fuzzy.unmatched").value, 1)
+
+    def test_isomers_unmatched(self):
+        self.assertIsNone(self.matcher.Match("1,3-Dichlorbenzol").cas_no)
+        self.assertIsNone(self.matcher.Match("2-Methylpropan-1-ol").cas_no)
+        self.assertIsNone(self.matcher.Match("3-Propanol").cas_no)
+
+    def test_homologues_unmatched(self):
+        self.assertIsNone(self.matcher.Match("Methylacetat").cas_no)
+        self.assertIsNone(self.matcher.Match("Essigsäuremethylester").cas_no)
+        self.assertIsNone(self.matcher.Match("Trichlorbenzol").cas_no)
+        self.assertEqual(RegMETRICS.GetCounter("fuzzy.similar").value, 0)
+
+    def test_ambiguous(self):
+        # Equally similar to Campher and Camphen
+        self.assertIsNone(self.matcher.Match("Camphe").cas_no)
+
+    def test_rewrite(self):
+        self.assertEqual(self.matcher.Rewrite("Aceton techn."), NameMatch("Aceton", "67-64-1", 1.0))
+        self.assertEqual(self.matcher.Rewrite("Toluol techn."), NameMatch("Toluol", None, 0.0))
+
+    def test_empty_index(self):
+        matcher = NameMatcher(index=SynonymIndex())
+        self.assertEqual(matcher.Match("Ethanol 96%"), NameMatch("Ethanol", None, 0.0))
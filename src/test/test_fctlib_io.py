@@ -1,11 +1,13 @@
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Imports
 # ++---------------------------------------------------------------------------------------------------------------------++#
+import os
 import unittest
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
-from src.fctlib.io import GetFilePaths, GetFolderPath, GetSupportedFilesFromPath
+from src.fctlib.io import GetFilePaths, GetFilePathsFromPatterns, GetFolderPath, GetShard, GetSupportedFilesFromPath
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -109,3 +111,61 @@ class TestGetSupportedFilesFromPath(unittest.TestCase):
         expected = [Path("file.xlsx")]
         result = GetSupportedFilesFromPath(file_paths, extensions)
         self.assertEqual(result, expected)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetFilePathsFromPatterns
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetFilePathsFromPatterns(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.PthRoot = Path(self.temp_dir.name).resolve()
+        for file_name in ["b.xlsx", "a.csv", "sub/c.xlsx"]:
+            (self.PthRoot / file_name).parent.mkdir(parents=True, exist_ok=True)
+            (self.PthRoot / file_name).touch()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_glob_pattern(self):
+        result = GetFilePathsFromPatterns([str(self.PthRoot / "*.xlsx")])
+        self.assertEqual(result, [self.PthRoot / "b.xlsx"])
+
+    def test_recursive_glob_pattern(self):
+        result = GetFilePathsFromPatterns([str(self.PthRoot / "**" / "*.xlsx")])
+        self.assertEqual(result, [self.PthRoot / "b.xlsx", self.PthRoot / "sub" / "c.xlsx"])
+
+    def test_folder_and_file_without_duplicates(self):
+        result = GetFilePathsFromPatterns([str(self.PthRoot), str(self.PthRoot / "a.csv")])
+        self.assertEqual(result, [self.PthRoot / "a.csv", self.PthRoot / "b.xlsx"])
+
+    def test_relative_pattern(self):
+        cwd = Path.cwd()
+        os.chdir(self.PthRoot)
+        try:
+            result = GetFilePathsFromPatterns(["sub/*.xlsx"])
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(result, [self.PthRoot / "sub" / "c.xlsx"])
+
+    def test_no_match(self):
+        self.assertEqual(GetFilePathsFromPatterns([str(self.PthRoot / "*.xls")]), [])
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetShard
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetShard(unittest.TestCase):
+    def test_shards_cover_all_files_once(self):
+        file_paths = [Path(f"file{file_no}.xlsx") for file_no in range(7)]
+        shards = [GetShard(file_paths, shard_no, 3) for shard_no in (1, 2, 3)]
+        self.assertEqual(sorted(sum(shards, [])), sorted(file_paths))
+        self.assertEqual([len(shard) for shard in shards], [3, 2, 2])
+
+    def test_independent_of_input_order(self):
+        file_paths = [Path("c.xlsx"), Path("a.xlsx"), Path("b.xlsx")]
+        self.assertEqual(GetShard(file_paths, 1, 2), GetShard(list(reversed(file_paths)), 1, 2))
+
+    def test_invalid_shard(self):
+        with self.assertRaises(ValueError):
+            GetShard([Path("a.xlsx")], 3, 2)
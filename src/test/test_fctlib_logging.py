@@ -0,0 +1,127 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import logging
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import RotatingFileHandler
+from multiprocessing import get_context
+from threading import Event, Thread
+
+from src.fctlib.logging import (
+    AttachProcessLogQueue,
+    AttachQueueListener,
+    FunctionHandler,
+    GetHandlerLevel,
+    LogLOGGER,
+    LstLOGLISTENER,
+)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Helper handlers
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class ListHandler(logging.Handler):
+    """Collects formatted log records, optionally blocked until an event is set to simulate slow I/O."""
+
+    def __init__(self, EvtRelease: Event | None = None):
+        super().__init__()
+        self.records = []
+        self.EvtRelease = EvtRelease
+
+    def emit(self, record):
+        if self.EvtRelease is not None:
+            self.EvtRelease.wait()
+        self.records.append(self.format(record))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for AttachQueueListener
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestAttachQueueListener(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger(f"TestLogger.{self.id()}")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        self.logger.handlers.clear()
+
+    def test_records_reach_handlers(self):
+        handler = ListHandler()
+        listener = AttachQueueListener(LogLogger=self.logger, handlers=[handler])
+
+        self.logger.info("first")
+        self.logger.info("second")
+        listener.stop()
+
+        self.assertEqual(handler.records, ["first", "second"])
+
+    def test_handler_levels_are_respected(self):
+        handler = ListHandler()
+        handler.setLevel(logging.WARNING)
+        listener = AttachQueueListener(LogLogger=self.logger, handlers=[handler])
+
+        self.logger.info("skipped")
+        self.logger.warning("kept")
+        listener.stop()
+
+        self.assertEqual(handler.records, ["kept"])
+
+    def test_callers_not_blocked_by_slow_handler(self):
+        # 8 threads logging 25 records each to a handler blocked until all of them finished
+        threads_count, records_count = 8, 25
+        EvtRelease = Event()
+        self.addCleanup(EvtRelease.set)
+        handler = ListHandler(EvtRelease=EvtRelease)
+        listener = AttachQueueListener(LogLogger=self.logger, handlers=[handler])
+
+        def log():
+            for record_no in range(records_count):
+                self.logger.info(f"Record {record_no}")
+
+        threads = [Thread(target=log, daemon=True) for _ in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        # Logging threads only enqueue, so they finish although the handler hasn't emitted a single record yet
+        self.assertTrue(all(not thread.is_alive() for thread in threads))
+        self.assertEqual(handler.records, [])
+
+        EvtRelease.set()
+        listener.stop()
+        self.assertEqual(len(handler.records), threads_count * records_count)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for the app logger setup
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestLstLOGLISTENER(unittest.TestCase):
+    def test_handlers_run_in_listener(self):
+        self.assertTrue(any(isinstance(handler, RotatingFileHandler) for handler in LstLOGLISTENER.handlers))
+        self.assertTrue(any(isinstance(handler, FunctionHandler) for handler in LstLOGLISTENER.handlers))
+
+    def test_get_handler_level(self):
+        self.assertEqual(GetHandlerLevel(RotatingFileHandler), logging.INFO)
+        self.assertEqual(GetHandlerLevel(logging.NullHandler), -1)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for AttachProcessLogQueue
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestAttachProcessLogQueue(unittest.TestCase):
+    def test_child_process_forwards_to_parent(self):
+        CtxSpawn = get_context("spawn")
+        QueLogRecords = CtxSpawn.Queue()
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=CtxSpawn, initializer=AttachProcessLogQueue, initargs=(QueLogRecords,)
+        ) as Executor:
+            file_level = Executor.submit(GetHandlerLevel, RotatingFileHandler).result(timeout=60)
+            Executor.submit(LogLOGGER.info, "Logged in child").result(timeout=60)
+        record = QueLogRecords.get(timeout=60)
+
+        # The child never opened the log file, its records reach the parent instead
+        self.assertEqual(file_level, -1)
+        self.assertEqual(record.getMessage(), "Logged in child")
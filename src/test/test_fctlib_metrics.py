@@ -0,0 +1,219 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import json
+import unittest
+from csv import DictReader
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+
+from src.fctlib.metrics import GetPercentiles, MetricsRegistry, StageMetrics
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetPercentiles
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetPercentiles(unittest.TestCase):
+    def test_interpolation(self):
+        percentiles = GetPercentiles(values=[4, 1, 3, 2, 5], percentiles=(0, 50, 95, 100))
+        self.assertEqual(percentiles[0], 1)
+        self.assertEqual(percentiles[50], 3)
+        self.assertAlmostEqual(percentiles[95], 4.8)
+        self.assertEqual(percentiles[100], 5)
+
+    def test_single_value(self):
+        self.assertEqual(GetPercentiles(values=[2.5]), {50: 2.5, 95: 2.5, 99: 2.5})
+
+    def test_empty(self):
+        self.assertEqual(GetPercentiles(values=[]), {50: None, 95: None, 99: None})
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for StageMetrics
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestStageMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = StageMetrics()
+
+    def test_measure(self):
+        with self.metrics.Measure("navigation", url="test"):
+            pass
+
+        records = self.metrics.GetRecords()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["stage"], "navigation")
+        self.assertEqual(records[0]["url"], "test")
+        self.assertGreaterEqual(records[0]["duration"], 0)
+
+    def test_measure_on_exception(self):
+        with self.assertRaises(ValueError):
+            with self.metrics.Measure("extraction"):
+                raise ValueError()
+
+        self.assertEqual(len(self.metrics.GetRecords()), 1)
+
+    def test_nested_context(self):
+        with self.metrics.Context(chem_id="50-00-0"):
+            with self.metrics.Context(source="Gestis"):
+                self.metrics.Record("extraction", 1.0)
+            self.metrics.Record("chemical", 2.0)
+        self.metrics.Record("other", 3.0)
+
+        extraction, chemical, other = self.metrics.GetRecords()
+        self.assertEqual((extraction["chem_id"], extraction["source"]), ("50-00-0", "Gestis"))
+        self.assertEqual(chemical["chem_id"], "50-00-0")
+        self.assertNotIn("source", chemical)
+        self.assertNotIn("chem_id", other)
+
+    def test_context_is_thread_local(self):
+        def record(chem_id: str):
+            with self.metrics.Context(chem_id=chem_id):
+                for _ in range(100):
+                    self.metrics.Record("query", 0.1, expected=chem_id)
+
+        threads = [Thread(target=record, args=(str(thread_no),)) for thread_no in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        records = self.metrics.GetRecords()
+        self.assertEqual(len(records), 800)
+        self.assertTrue(all(record["chem_id"] == record["expected"] for record in records))
+
+    def test_summary(self):
+        with self.metrics.Context(source="PubChem"):
+            for duration in (1.0, 2.0, 3.0):
+                self.metrics.Record("hit_resolution", duration)
+        self.metrics.Record("queue_wait", 0.5)
+
+        summary = self.metrics.GetSummary()
+
+        self.assertEqual(list(summary), [("-", "queue_wait"), ("PubChem", "hit_resolution")])
+        self.assertEqual(summary[("PubChem", "hit_resolution")]["count"], 3)
+        self.assertEqual(summary[("PubChem", "hit_resolution")]["total"], 6.0)
+        self.assertEqual(summary[("PubChem", "hit_resolution")]["p50"], 2.0)
+        self.assertIn("hit_resolution", self.metrics.FormatSummary())
+
+    def test_merge(self):
+        worker = StageMetrics()
+        with worker.Context(source="PubChem"):
+            worker.Record("query", 1.0)
+
+        with self.metrics.Context(file="test.xlsx"):
+            self.metrics.Merge(worker.GetRecords(), row=3, source="-")
+
+        (record,) = self.metrics.GetRecords()
+        self.assertEqual((record["file"], record["row"], record["source"]), ("test.xlsx", 3, "PubChem"))
+        self.assertEqual(record["duration"], 1.0)
+
+    def test_reset(self):
+        self.metrics.Record("query", 1.0)
+        self.metrics.Reset()
+        self.assertEqual(self.metrics.GetRecords(), [])
+
+    def test_export_jsonl(self):
+        with self.metrics.Context(source="Gestis"):
+            self.metrics.Record("pdf_download", 1.0)
+
+        with TemporaryDirectory() as temp_dir:
+            PthFile = Path(temp_dir) / "metrics" / "run.jsonl"
+            self.assertTrue(self.metrics.Export(PthFile))
+            records = [json.loads(line) for line in PthFile.read_text(encoding="utf-8").splitlines()]
+
+        self.assertEqual(records[0]["source"], "Gestis")
+        self.assertEqual(records[0]["stage"], "pdf_download")
+
+    def test_export_csv(self):
+        self.metrics.Record("queue_wait", 0.5)
+        with self.metrics.Context(source="Gestis"):
+            self.metrics.Record("pdf_download", 1.0)
+
+        with TemporaryDirectory() as temp_dir:
+            PthFile = Path(temp_dir) / "run.csv"
+            self.assertTrue(self.metrics.Export(PthFile))
+            with open(PthFile, newline="", encoding="utf-8") as TxtFile:
+                rows = list(DictReader(TxtFile))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["source"], "")
+        self.assertEqual(rows[1]["source"], "Gestis")
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for MetricsRegistry
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_metrics_are_created_once(self):
+        self.assertIs(self.registry.GetHistogram("query"), self.registry.GetHistogram("query"))
+        self.assertIs(self.registry.GetCounter("query.errors"), self.registry.GetCounter("query.errors"))
+
+    def test_histogram_summary(self):
+        for value in (1.0, 2.0, 3.0):
+            self.registry.GetHistogram("query").Observe(value)
+
+        summary = self.registry.GetSummary()["histograms"]["query"]
+
+        self.assertEqual((summary["count"], summary["total"], summary["min"], summary["max"]), (3, 6.0, 1.0, 3.0))
+        self.assertEqual(summary["p50"], 2.0)
+
+    def test_counter_from_threads(self):
+        def increment():
+            for _ in range(1000):
+                self.registry.GetCounter("calls").Increment()
+
+        threads = [Thread(target=increment) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.registry.GetSummary()["counters"]["calls"], 8000)
+
+    def test_reset_in_place(self):
+        histogram = self.registry.GetHistogram("query")
+        histogram.Observe(1.0)
+        self.registry.GetCounter("calls").Increment()
+
+        self.registry.Reset()
+        histogram.Observe(2.0)
+
+        summary = self.registry.GetSummary()
+        self.assertEqual(summary["histograms"]["query"]["total"], 2.0)
+        self.assertEqual(summary["counters"]["calls"], 0)
+
+    def test_capture_memory(self):
+        with self.registry.Capture(name="test", memory=True):
+            data = [bytes(1024) for _ in range(1000)]
+        del data
+
+        summary = self.registry.GetSummary()["histograms"]["test.memory_peak"]
+        self.assertGreater(summary["max"], 1000 * 1024)
+
+    def test_capture_cpu(self):
+        with self.registry.Capture(name="test", cpu=True):
+            sorted(range(10000), reverse=True)
+
+        self.assertIn("test", self.registry.GetSummary()["profiles"])
+
+    def test_capture_disabled(self):
+        with self.registry.Capture(name="test"):
+            pass
+
+        summary = self.registry.GetSummary()
+        self.assertEqual(summary["profiles"], {})
+        self.assertNotIn("test.memory_peak", summary["histograms"])
+
+    def test_export(self):
+        self.registry.GetHistogram("query").Observe(1.0)
+
+        with TemporaryDirectory() as temp_dir:
+            PthFile = Path(temp_dir) / "run_functions.json"
+            self.assertTrue(self.registry.Export(PthFile))
+            summary = json.loads(PthFile.read_text(encoding="utf-8"))
+
+        self.assertEqual(summary["histograms"]["query"]["count"], 1)
@@ -3,11 +3,25 @@
 # ++---------------------------------------------------------------------------------------------------------------------++#
 import unittest
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
 import pandas
-
-from src.fctlib.pandas import GetDfFromFilePath, GetDfFromNtList, GetUniqueColsFromDf, WriteDfToXlsx
+from openpyxl import Workbook
+
+from src.fctlib.pandas import (
+    GetDfFromFilePath,
+    GetDfFromNtList,
+    GetHeaderFromFilePath,
+    GetUniqueColIndices,
+    GetUniqueColsFromDf,
+    GetXlsxCellValue,
+    IterRowsFromFilePath,
+    WriteDfToCsv,
+    WriteDfToParquet,
+    WriteDfToXlsx,
+    WriteMergedDfToXlsx,
+)
 
 #
 # Didn't invest the time to get this running ...
@@ -61,6 +75,88 @@ from src.fctlib.pandas import GetDfFromFilePath, GetDfFromNtList, GetUniqueColsF
 #         self.assertIsNone(result)
 
 
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetHeaderFromFilePath and GetDfFromFilePath with columns to search
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetDfFromFilePathColsToSearch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.PthTemp = Path(self.temp_dir.name)
+        self.test_df = pandas.DataFrame(
+            {"Amount": [1, 2], "Name": ["Water", "Ethanol"], "Supplier": ["A", "B"], "CAS No": ["7732-18-5", None]}
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_xlsx_header(self):
+        PthFile = self.PthTemp / "test.xlsx"
+        self.test_df.to_excel(PthFile, index=False)
+        self.assertEqual(GetHeaderFromFilePath(PthFile), ["Amount", "Name", "Supplier", "CAS No"])
+
+    def test_csv_header(self):
+        PthFile = self.PthTemp / "test.csv"
+        self.test_df.rename(columns={"Supplier": ""}).to_csv(PthFile, index=False)
+        self.assertEqual(GetHeaderFromFilePath(PthFile), ["Amount", "Name", None, "CAS No"])
+
+    def test_only_cols_to_search_loaded(self):
+        for file_name in ["test.xlsx", "test.csv"]:
+            PthFile = self.PthTemp / file_name
+            if PthFile.suffix == ".xlsx":
+                self.test_df.to_excel(PthFile, index=False)
+            else:
+                self.test_df.to_csv(PthFile, index=False)
+
+            result = GetDfFromFilePath(PthFile, cols_to_search=["CAS", "Name"])
+            self.assertEqual(list(result.columns), ["Name", "CAS No"])
+            self.assertTrue(GetUniqueColsFromDf(result, ["CAS", "Name"]).equals(self.test_df[["CAS No", "Name"]]))
+
+    def test_xlsx_cols_like_read_excel(self):
+        PthFile = self.PthTemp / "test.xlsx"
+        test_df = pandas.concat([self.test_df, pandas.DataFrame({"Supplier": [None, "C", None]})], ignore_index=True)
+        test_df.to_excel(PthFile, index=False)
+
+        expected = pandas.read_excel(PthFile, usecols=[1, 3])
+        with patch("src.fctlib.pandas.EXCEL_ENGINE", None):
+            result = GetDfFromFilePath(PthFile, cols_to_search=["Name", "CAS"])
+        self.assertTrue(expected.equals(result))
+
+    def test_xlsx_single_col_blank_cells(self):
+        PthFile = self.PthTemp / "test.xlsx"
+        test_df = pandas.DataFrame({"CAS No": ["67-64-1", None, "64-17-5"], "Supplier": ["A", "B", None]})
+        test_df.to_excel(PthFile, index=False)
+
+        expected = pandas.read_excel(PthFile, usecols=[0])
+        with patch("src.fctlib.pandas.EXCEL_ENGINE", None):
+            result = GetDfFromFilePath(PthFile, cols_to_search=["CAS"])
+        self.assertTrue(expected.equals(result))
+        self.assertEqual(result["CAS No"].iloc[2], "64-17-5")
+
+    def test_no_cols_to_search_found(self):
+        PthFile = self.PthTemp / "test.csv"
+        self.test_df.to_csv(PthFile, index=False)
+        self.assertTrue(GetDfFromFilePath(PthFile, cols_to_search=["Formula"]).empty)
+
+    def test_permission_error(self):
+        PthFile = self.PthTemp / "test.xlsx"
+        self.test_df.to_excel(PthFile, index=False)
+        with patch("src.fctlib.pandas.EXCEL_ENGINE", None), patch(
+            "src.fctlib.pandas.load_workbook", side_effect=PermissionError
+        ):
+            self.assertIsNone(GetDfFromFilePath(PthFile, cols_to_search=["CAS"]))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetUniqueColIndices
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetUniqueColIndices(unittest.TestCase):
+    def test_order_of_cols_to_search(self):
+        self.assertEqual(GetUniqueColIndices(["Name", "x", "cas-nr"], ["CAS", "Name"]), [2, 0])
+
+    def test_ambiguous_and_unnamed_cols(self):
+        self.assertEqual(GetUniqueColIndices(["CAS", "cas no", None, "Unnamed: 3 Name"], ["CAS", "Name"]), [])
+
+
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Unit test for GetUniqueColsFromDf (generated by Cody.AI)
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -134,23 +230,153 @@ class TestGetDfFromNtList(unittest.TestCase):
 # ++ Unit test for WriteDfToXlsx (generated by Cody.AI)
 # ++---------------------------------------------------------------------------------------------------------------------++#
 class TestWriteDfToXlsx(unittest.TestCase):
-    @patch("pandas.DataFrame.to_excel")
-    def test_write_df_to_xlsx_success(self, mock_to_excel):
+    def setUp(self):
+        self.test_df = pandas.DataFrame(
+            {"CAS": ["50-00-0", None], "Mass": [30.03, float("nan")], "Count": [1, 2]},
+            index=pandas.Index([1, 2], name="row_no"),
+        )
+
+    def test_write_df_to_xlsx_success(self):
+        with TemporaryDirectory() as tmp_dir:
+            test_pth = Path(tmp_dir) / "test.xlsx"
+
+            result = WriteDfToXlsx(self.test_df, test_pth)
+
+            self.assertTrue(result)
+            pandas.testing.assert_frame_equal(
+                pandas.read_excel(test_pth, sheet_name="Query Output", index_col=0), self.test_df
+            )
+
+    @patch("pathlib.Path.open")
+    def test_write_df_to_xlsx_permission_error(self, mock_open):
         test_df = pandas.DataFrame()
         test_pth = Path("test.xlsx")
 
+        mock_open.side_effect = PermissionError()
+
         result = WriteDfToXlsx(test_df, test_pth)
 
+        self.assertFalse(result)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetXlsxCellValue
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetXlsxCellValue(unittest.TestCase):
+    def test_na_values(self):
+        for value in [None, pandas.NA, pandas.NaT, float("nan")]:
+            self.assertIsNone(GetXlsxCellValue(value))
+
+    def test_values_as_is(self):
+        for value in [1, 30.03, "50-00-0", pandas.Timestamp("2026-10-19")]:
+            self.assertEqual(GetXlsxCellValue(value), value)
+
+    def test_others_as_string(self):
+        self.assertEqual(GetXlsxCellValue(["H225", "H319"]), "['H225', 'H319']")
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for WriteDfToParquet and WriteDfToCsv
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestWriteDfToParquetCsv(unittest.TestCase):
+    def setUp(self):
+        self.test_df = pandas.DataFrame(
+            {"CAS": ["50-00-0", "Not listed!"], "Mass": [30.03, "Not listed!"]},
+            index=pandas.Index([1, 2], name="row_no"),
+        )
+
+    def test_write_df_to_parquet(self):
+        with TemporaryDirectory() as tmp_dir:
+            test_pth = Path(tmp_dir) / "test.parquet"
+
+            result = WriteDfToParquet(self.test_df, test_pth)
+
+            self.assertTrue(result)
+            DfResult = pandas.read_parquet(test_pth)
+            self.assertEqual(DfResult.index.name, "row_no")
+            self.assertEqual(DfResult["Mass"].tolist(), ["30.03", "Not listed!"])
+
+    def test_write_df_to_csv(self):
+        with TemporaryDirectory() as tmp_dir:
+            test_pth = Path(tmp_dir) / "test.csv"
+
+            result = WriteDfToCsv(self.test_df, test_pth)
+
+            self.assertTrue(result)
+            self.assertTrue(test_pth.read_bytes().startswith(b"\xef\xbb\xbf"))
+            self.assertEqual(pandas.read_csv(test_pth, index_col=0, encoding="utf-8-sig").shape, (2, 2))
+
+    @patch("pandas.DataFrame.to_csv")
+    def test_write_df_to_csv_permission_error(self, mock_to_csv):
+        mock_to_csv.side_effect = PermissionError()
+
+        self.assertFalse(WriteDfToCsv(self.test_df, Path("test.csv")))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for IterRowsFromFilePath and WriteMergedDfToXlsx
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestMergedOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.PthXlsx = Path(self.tmp_dir.name) / "input.xlsx"
+        WbkInput = Workbook()
+        for row in [
+            ["CAS", "Name", "Amount"],
+            ["50-00-0", "Formaldehyde", 5],
+            [None, None, None],
+            [None, None, "only amount"],
+            ["64-17-5", "Ethanol", None],
+            [None, None, None],
+        ]:
+            WbkInput.active.append(row)
+        WbkInput.save(self.PthXlsx)
+        self.PthCsv = Path(self.tmp_dir.name) / "input.csv"
+        self.PthCsv.write_text("CAS,Name,Amount\n50-00-0,Formaldehyde,5\n\n,,only amount\n64-17-5,Ethanol,\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_rows_match_dataframe_rows(self):
+        for PthFile in [self.PthXlsx, self.PthCsv]:
+            header, *rows = IterRowsFromFilePath(PthFile)
+
+            self.assertEqual(header, ["CAS", "Name", "Amount"])
+            self.assertEqual(len(rows), len(GetDfFromFilePath(PthFile)))
+            self.assertEqual(rows[-1][:2], ["64-17-5", "Ethanol"])
+
+    def test_blank_rows_kept_trailing_dropped(self):
+        rows = list(IterRowsFromFilePath(self.PthXlsx))
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[2], [])
+
+    def test_write_merged_df_to_xlsx(self):
+        test_df = pandas.DataFrame({"Formula": ["CH2O", None, None, "C2H6O"]})
+        PthOutput = Path(self.tmp_dir.name) / "output.xlsx"
+
+        result = WriteMergedDfToXlsx(self.PthXlsx, test_df, PthOutput)
+
         self.assertTrue(result)
-        mock_to_excel.assert_called_with(excel_writer=test_pth, sheet_name="Query Output", index=True, engine="openpyxl")
+        DfOutput = pandas.read_excel(PthOutput)
+        self.assertEqual(list(DfOutput.columns), ["CAS", "Name", "Amount", "Formula"])
+        self.assertEqual(DfOutput["Amount"].tolist()[::2], [5, "only amount"])
+        self.assertEqual(DfOutput["Formula"].tolist()[::3], ["CH2O", "C2H6O"])
 
-    @patch("pandas.DataFrame.to_excel")
-    def test_write_df_to_xlsx_permission_error(self, mock_to_excel):
-        test_df = pandas.DataFrame()
-        test_pth = Path("test.xlsx")
+    def test_write_merged_df_to_xlsx_row_mismatch(self):
+        test_df = pandas.DataFrame({"Formula": ["CH2O"]})
+        PthOutput = Path(self.tmp_dir.name) / "output.xlsx"
 
-        mock_to_excel.side_effect = PermissionError()
+        with self.assertLogs(level="WARNING"):
+            result = WriteMergedDfToXlsx(self.PthCsv, test_df, PthOutput)
 
-        result = WriteDfToXlsx(test_df, test_pth)
+        self.assertTrue(result)
+        self.assertEqual(pandas.read_excel(PthOutput).shape, (3, 4))
+
+    @patch("pathlib.Path.open")
+    def test_write_merged_df_to_xlsx_permission_error(self, mock_open):
+        mock_open.side_effect = PermissionError()
+
+        result = WriteMergedDfToXlsx(self.PthXlsx, pandas.DataFrame(), Path("output.xlsx"))
 
         self.assertFalse(result)
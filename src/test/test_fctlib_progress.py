@@ -0,0 +1,89 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+from threading import Thread
+
+from src.fctlib.progress import GetThroughputAndEta, ProgressBus
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetThroughputAndEta
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetThroughputAndEta(unittest.TestCase):
+    def test_running(self):
+        throughput, eta = GetThroughputAndEta(done=10, total=30, elapsed=5)
+        self.assertAlmostEqual(throughput, 2.0)
+        self.assertAlmostEqual(eta, 10.0)
+
+    def test_not_started(self):
+        self.assertEqual(GetThroughputAndEta(done=0, total=30, elapsed=5), (0.0, None))
+
+    def test_finished(self):
+        _, eta = GetThroughputAndEta(done=30, total=30, elapsed=5)
+        self.assertEqual(eta, 0)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for ProgressBus
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestProgressBus(unittest.TestCase):
+    def setUp(self):
+        self.bus = ProgressBus()
+        self.bus.Start()
+
+    def test_drain_empty(self):
+        self.assertEqual(self.bus.Drain(), [])
+
+    def test_coalesce_intermediate_reports(self):
+        self.bus.Publish(report=None, final=False)
+        for chem_no in range(1, 6):
+            self.bus.Publish(report={"chem_no": chem_no, "chems_count": 5}, final=False)
+        self.bus.Publish(report=None, final=True)
+
+        events = self.bus.Drain()
+
+        self.assertEqual(len(events), 3)
+        self.assertIsNone(events[0][0])
+        self.assertEqual(events[1][0]["chem_no"], 5)
+        self.assertEqual(events[2], (None, True))
+
+    def test_final_report_is_kept(self):
+        self.bus.Publish(report={"chem_no": 4, "chems_count": 5}, final=False)
+        self.bus.Publish(report={"chem_no": 5, "chems_count": 5}, final=True)
+
+        events = self.bus.Drain()
+
+        self.assertEqual([final for _, final in events], [False, True])
+
+    def test_report_is_copied(self):
+        report = {"chem_no": 1, "chems_count": 2}
+        self.bus.Publish(report=report)
+        report["chem_no"] = 2
+
+        self.assertEqual(self.bus.Drain()[0][0]["chem_no"], 1)
+
+    def test_rates_added(self):
+        self.bus.Publish(report={"chem_no": 1, "chems_count": 2})
+        report, _ = self.bus.Drain()[0]
+
+        self.assertIn("throughput", report)
+        self.assertIn("eta", report)
+
+    def test_clear(self):
+        self.bus.Publish(report=None)
+        self.bus.Clear()
+        self.assertEqual(self.bus.Drain(), [])
+
+    def test_publish_from_threads(self):
+        def publish():
+            for _ in range(100):
+                self.bus.Publish(report={"file_no": 1}, final=False)
+
+        threads = [Thread(target=publish) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.bus.Drain()), 1)
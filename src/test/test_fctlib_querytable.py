@@ -0,0 +1,131 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pandas
+
+from src.fctlib.querytable import NAME_MATCH_FIELDS, GetQueryTable, GetQueryTableFromFilePath
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for QueryTable and GetQueryTable
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetQueryTable(unittest.TestCase):
+    def setUp(self):
+        self.test_df = pandas.DataFrame(
+            {
+                "CAS": ["7732-18-5", "7732-18-4", None, "64-17-5", None, "50-00-0"],
+                "Name": ["Water", None, " Ethanol ", None, "  ", float("nan")],
+            }
+        )
+
+    def test_cas_and_names(self):
+        qry_table = GetQueryTable(PdsCasNos=self.test_df["CAS"], DfTerms=self.test_df[["Name"]])
+
+        self.assertEqual(len(qry_table), 6)
+        self.assertEqual(
+            list(qry_table.items()),
+            [(0, ["7732-18-5", "Water"]), (1, None), (2, [None, "Ethanol"]), (3, ["64-17-5"]), (4, None), (5, ["50-00-0"])],
+        )
+        self.assertEqual(qry_table.chems_count, 4)
+        self.assertEqual(qry_table.cas_count, 3)
+
+    def test_names_only(self):
+        qry_table = GetQueryTable(PdsCasNos=None, DfTerms=self.test_df[["Name"]])
+
+        self.assertEqual(qry_table.GetTerms(0), [None, "Water"])
+        self.assertIsNone(qry_table.GetTerms(1))
+        self.assertEqual(qry_table.chems_count, 2)
+        self.assertEqual(qry_table.cas_count, 0)
+
+    def test_cas_only(self):
+        qry_table = GetQueryTable(PdsCasNos=self.test_df["CAS"], DfTerms=self.test_df[[]])
+
+        self.assertEqual(qry_table.GetTerms(0), ["7732-18-5"])
+        self.assertIsNone(qry_table.GetTerms(1))
+        self.assertEqual(qry_table.chems_count, 3)
+
+    def test_numeric_terms(self):
+        qry_table = GetQueryTable(PdsCasNos=None, DfTerms=pandas.DataFrame({"Name": [5, 6]}))
+        self.assertEqual(qry_table.GetTerms(1), [None, "6"])
+
+    def test_empty_file(self):
+        qry_table = GetQueryTable(PdsCasNos=pandas.Series([], dtype=object), DfTerms=pandas.DataFrame())
+        self.assertEqual((len(qry_table), qry_table.chems_count, list(qry_table.items())), (0, 0, []))
+
+    def test_resolve_cas_nos(self):
+        qry_table = GetQueryTable(PdsCasNos=self.test_df["CAS"], DfTerms=self.test_df[["Name"]])
+        calls = []
+
+        def Resolve(name):
+            calls.append(name)
+            return {"Ethanol": "64-17-5"}.get(name)
+
+        resolved = qry_table.ResolveCasNos(Resolve)
+
+        self.assertEqual(calls, ["Ethanol"])
+        self.assertEqual(resolved.GetTerms(2), ["64-17-5", "Ethanol"])
+        self.assertEqual(resolved.cas_count, 4)
+        # The original table stays as read
+        self.assertEqual(qry_table.GetTerms(2), [None, "Ethanol"])
+
+    def test_resolve_cas_nos_unresolved(self):
+        qry_table = GetQueryTable(PdsCasNos=None, DfTerms=self.test_df[["Name"]])
+        self.assertIs(qry_table.ResolveCasNos(lambda name: None), qry_table)
+
+    def test_rewrite_terms(self):
+        DfTerms = pandas.DataFrame(
+            {"Name": ["Aceton techn.", "Ethanol 96%", "Wasser", "Methylacetat"], "Trade": [None, "EtOH", None, None]}
+        )
+        qry_table = GetQueryTable(PdsCasNos=pandas.Series(["7732-18-5", None, None, None]), DfTerms=DfTerms)
+        rewrites = {
+            "Aceton techn.": ("Aceton", "67-64-1", 1.0),
+            "Ethanol 96%": ("Ethanol", None, 0.0),
+            "EtOH": ("EtOH", "64-17-5", 1.0),
+            "Methylacetat": ("Methylacetat", "141-78-6", 0.85),
+        }
+
+        rewritten = qry_table.RewriteTerms(lambda term: rewrites.get(term, (term, None, 0.0)))
+
+        # Rows with a CAS number are kept as read, similar names don't fill in CAS numbers
+        self.assertEqual(
+            list(rewritten.items()),
+            [
+                (0, ["7732-18-5", "Aceton techn."]),
+                (1, ["64-17-5", "Ethanol", "EtOH"]),
+                (2, [None, "Wasser"]),
+                (3, [None, "Methylacetat"]),
+            ],
+        )
+        DfMatches = rewritten.GetNameMatches()
+        self.assertEqual(list(DfMatches.columns), list(NAME_MATCH_FIELDS))
+        self.assertEqual(DfMatches["name_match_cas"].tolist(), [None, "64-17-5", None, "141-78-6"])
+        self.assertEqual(DfMatches["name_match_confidence"].fillna(0).tolist(), [0.0, 1.0, 0.0, 0.85])
+        # The original table has no matches
+        self.assertTrue(qry_table.GetNameMatches()["name_match_cas"].isna().all())
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetQueryTableFromFilePath
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetQueryTableFromFilePath(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.PthFile = Path(self.temp_dir.name) / "test.csv"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_identifier_cols(self):
+        pandas.DataFrame({"Name": ["Water", "Ethanol"], "Amount": [1, 2], "CAS No": ["7732-18-5", None]}).to_csv(
+            self.PthFile, index=False
+        )
+        qry_table = GetQueryTableFromFilePath(self.PthFile, ("CAS", "Name"))
+        self.assertEqual(list(qry_table.items()), [(0, ["7732-18-5", "Water"]), (1, [None, "Ethanol"])])
+
+    def test_no_identifier_cols(self):
+        pandas.DataFrame({"Amount": [1, 2]}).to_csv(self.PthFile, index=False)
+        self.assertIsNone(GetQueryTableFromFilePath(self.PthFile, ("CAS", "Name")))
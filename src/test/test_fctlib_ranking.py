@@ -0,0 +1,99 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+
+from src.fctlib.ranking import (
+    SCORE_CAS,
+    SCORE_NAME_EXACT,
+    SCORE_NAME_NORMALISED,
+    SCORE_SYNONYM_CAS,
+    SCORE_SYNONYM_NAME,
+    FormatRunnerUps,
+    GetCasNumbers,
+    NormaliseName,
+    RankCandidates,
+    ScoreCandidate,
+)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for NormaliseName and GetCasNumbers
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestNormalisation(unittest.TestCase):
+    def test_normalise_name(self):
+        self.assertEqual(NormaliseName("1,2-Dichlorethan"), NormaliseName("1.2 dichlorethan"))
+        self.assertEqual(NormaliseName("Natriumchlorid "), "natriumchlorid")
+        self.assertEqual(NormaliseName("Éthanol"), "ethanol")
+        self.assertEqual(NormaliseName("Ätzkalk"), "atzkalk")
+
+    def test_get_cas_numbers(self):
+        self.assertEqual(GetCasNumbers("Aceton\nEinzelinhaltsstoff\n67-64-1"), {"67-64-1"})
+        # Wrong checksum
+        self.assertEqual(GetCasNumbers("Aceton 67-64-2"), set())
+        # Part of a longer number
+        self.assertEqual(GetCasNumbers("EG-Nr. 200-662-2-1"), set())
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for ScoreCandidate
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestScoreCandidate(unittest.TestCase):
+    def test_cas_match(self):
+        self.assertEqual(ScoreCandidate("Aceton\n67-64-1", query_term="67-64-1"), SCORE_CAS)
+        self.assertEqual(ScoreCandidate("Ethanol\n64-17-5", query_term="67-64-1"), 0.0)
+
+    def test_name_match(self):
+        self.assertEqual(ScoreCandidate("Aceton\nEinzelinhaltsstoff", query_term="aceton"), SCORE_NAME_EXACT)
+        self.assertEqual(ScoreCandidate("1,2-Dichlorethan", query_term="1.2-Dichlorethan"), SCORE_NAME_NORMALISED)
+
+    def test_synonym_match(self):
+        synonyms = {"Propan-2-on", "67-64-1"}
+        query_term = "Dimethylketon"
+        self.assertEqual(ScoreCandidate("Aceton\n67-64-1", query_term, synonyms), SCORE_SYNONYM_CAS)
+        self.assertEqual(ScoreCandidate("Propan-2-on", query_term, synonyms), SCORE_SYNONYM_NAME)
+        # Another CAS number than the known ones
+        self.assertEqual(ScoreCandidate("Propan-2-on\n64-17-5", query_term, synonyms), 0.0)
+
+    def test_partial_match(self):
+        self.assertEqual(ScoreCandidate("Aceton, technisch", query_term="Aceton"), 0.25)
+        self.assertEqual(ScoreCandidate("Ethanol", query_term="Aceton"), 0.0)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for RankCandidates and FormatRunnerUps
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestRankCandidates(unittest.TestCase):
+    def test_selects_best_candidate(self):
+        candidates = ["Aceton, technisch", "Aceton\nEinzelinhaltsstoff", "Acetonitril"]
+        ranking = RankCandidates(candidates, query_term="Aceton")
+
+        self.assertEqual(ranking.selected, 1)
+        self.assertEqual(ranking.score, SCORE_NAME_EXACT)
+        self.assertEqual(ranking.runner_ups, [("Aceton, technisch", 0.25), ("Acetonitril", 0.0)])
+
+    def test_no_selection_below_min_score(self):
+        ranking = RankCandidates(["Aceton, technisch", "Aceton, rein"], query_term="Aceton")
+
+        self.assertIsNone(ranking.selected)
+        self.assertEqual(ranking.score, 0.25)
+        self.assertEqual([name for name, _ in ranking.runner_ups], ["Aceton, technisch", "Aceton, rein"])
+
+    def test_no_selection_on_tie(self):
+        ranking = RankCandidates(["Aceton\n67-64-1", "Aceton\nGemisch"], query_term="Aceton")
+        self.assertIsNone(ranking.selected)
+
+    def test_synonyms_break_tie(self):
+        ranking = RankCandidates(["Aceton\n64-17-5", "Aceton\n67-64-1"], query_term="Aceton", synonyms=["67-64-1"])
+        self.assertEqual(ranking.selected, 1)
+
+    def test_runner_ups_limited(self):
+        ranking = RankCandidates(["Aceton", "A", "B", "C", "D"], query_term="Aceton", runner_ups=2)
+        self.assertEqual(len(ranking.runner_ups), 2)
+
+    def test_no_candidates(self):
+        self.assertEqual(RankCandidates([], query_term="Aceton"), (None, 0.0, []))
+
+    def test_format_runner_ups(self):
+        self.assertEqual(FormatRunnerUps([("Aceton, technisch", 0.25)]), "Runner-ups: <Aceton, technisch> (0.25).")
+        self.assertEqual(FormatRunnerUps([]), "")
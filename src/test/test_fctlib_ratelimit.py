@@ -0,0 +1,75 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+from threading import Event, Thread
+from time import perf_counter
+
+from src.fctlib.metrics import RegMETRICS
+from src.fctlib.ratelimit import TokenBucket
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for TokenBucket
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        RegMETRICS.Reset()
+
+    def test_burst_passes_at_once(self):
+        bucket = TokenBucket(name="TestBucket", rate=1.0, capacity=3)
+
+        start = perf_counter()
+        for _ in range(3):
+            self.assertTrue(bucket.Acquire())
+
+        self.assertLess(perf_counter() - start, 0.1)
+        self.assertEqual(RegMETRICS.GetHistogram("TestBucket.wait").GetSummary()["count"], 0)
+
+    def test_rate_limited(self):
+        bucket = TokenBucket(name="TestBucket", rate=50.0)
+
+        start = perf_counter()
+        for _ in range(6):
+            bucket.Acquire()
+
+        # The first token is in the bucket, the other five take 1/50 s each
+        self.assertGreaterEqual(perf_counter() - start, 0.095)
+        self.assertEqual(RegMETRICS.GetHistogram("TestBucket.wait").GetSummary()["count"], 5)
+
+    def test_rate_limited_across_threads(self):
+        bucket = TokenBucket(name="TestBucket", rate=100.0)
+        threads = [Thread(target=lambda: [bucket.Acquire() for _ in range(5)]) for _ in range(4)]
+
+        start = perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertGreaterEqual(perf_counter() - start, 0.185)
+
+    def test_rate_limit_shared(self):
+        shared = TokenBucket(name="SharedBucket", rate=0.1)
+        buckets = [TokenBucket(name="TestBucket", rate=0.1) for _ in range(2)]
+        for bucket in buckets:
+            bucket.Share(shared.Reserve)
+        EvtCancel = Event()
+        EvtCancel.set()
+
+        # The second bucket still holds its own token, but has to wait for the shared one
+        self.assertTrue(buckets[0].Acquire(EvtCancel=EvtCancel))
+        self.assertFalse(buckets[1].Acquire(EvtCancel=EvtCancel))
+
+        buckets[1].Share(None)
+        self.assertTrue(buckets[1].Acquire(EvtCancel=EvtCancel))
+
+    def test_cancelled_while_waiting(self):
+        bucket = TokenBucket(name="TestBucket", rate=0.1)
+        EvtCancel = Event()
+        EvtCancel.set()
+
+        self.assertTrue(bucket.Acquire(EvtCancel=EvtCancel))
+        start = perf_counter()
+        self.assertFalse(bucket.Acquire(EvtCancel=EvtCancel))
+        self.assertLess(perf_counter() - start, 1.0)
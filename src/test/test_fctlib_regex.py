@@ -4,7 +4,9 @@
 import unittest
 from re import compile as reCompile
 
-from src.fctlib.regex import CheckCasNo, GetDelocalisedDecimals, GetGhsStatements
+from pandas import Series
+
+from src.fctlib.regex import CheckCasNo, CheckCasNos, GetDelocalisedDecimals, GetGhsStatements
 
 
 # ++---------------------------------------------------------------------------------------------------------------------++#
@@ -36,6 +38,25 @@ class TestCheckCasNo(unittest.TestCase):
         self.assertFalse(CheckCasNo(""))
 
 
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for CheckCasNos
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestCheckCasNos(unittest.TestCase):
+    def test_like_CheckCasNo(self):
+        values = ["123-45-5", "123-45-6", "123 - 45 - 6", "abc", "1234", "123-456", "123a-45-6", "", "7732-18-5"]
+        values += ["1234567-12-2", "12345678-12-3", "50-00-0", "64-17-5", "64-17-6"]
+        result = CheckCasNos(Series(values, index=range(10, 10 + len(values))))
+
+        self.assertEqual(result.tolist(), [CheckCasNo(value) for value in values])
+        self.assertEqual(result.index.tolist(), list(range(10, 10 + len(values))))
+
+    def test_na_and_numbers(self):
+        self.assertEqual(CheckCasNos(Series([None, float("nan"), 50.0, "50-00-0"])).tolist(), [False] * 3 + [True])
+
+    def test_empty(self):
+        self.assertEqual(CheckCasNos(Series([], dtype=object)).tolist(), [])
+
+
 # ++---------------------------------------------------------------------------------------------------------------------++#
 # ++ Unit test for GetDelocalisedDecimals (generated by Cody.AI)
 # ++---------------------------------------------------------------------------------------------------------------------++#
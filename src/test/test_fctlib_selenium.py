@@ -0,0 +1,131 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+from unittest.mock import MagicMock, PropertyMock
+
+from selenium.common.exceptions import JavascriptException
+
+import src.fctlib.selenium as fctSelenium
+from src.fctlib.selenium import (
+    JS_ELEMENT_CONTENTS,
+    CompileXpathDescriptors,
+    ElementContent,
+    GetElementContents,
+    ScrollTo,
+    XpathConstructor,
+)
+
+LOCATOR_LISTS = [
+    ["id_cas", "m98", "@dt", "=CAS-RN", ">dd"],
+    ["pc_density", "m42", "@dt", "+Dichte", "&", "-Einheit", ">dd"],
+    ["pc_odour", "m71", "@dt", "+Geruch", ">dd", "*"],
+    ["name_registered_ger", "m86", "@tbody", "<tr", "*"],
+]
+PARENT_TEMPLATE = ".//h4[@id='{id}']/parent::div"
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for CompileXpathDescriptors
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestCompileXpathDescriptors(unittest.TestCase):
+    def setUp(self):
+        self.descriptors = CompileXpathDescriptors(LOCATOR_LISTS, parent_template=PARENT_TEMPLATE)
+
+    def test_same_xpaths_as_constructor(self):
+        self.assertEqual(list(self.descriptors), [locator_list[0] for locator_list in LOCATOR_LISTS])
+        for locator_list in LOCATOR_LISTS:
+            descriptor = self.descriptors[locator_list[0]]
+            self.assertEqual((descriptor.target, descriptor.get_multiple), XpathConstructor(locator_list[2:]))
+
+    def test_parent_xpath(self):
+        self.assertEqual(self.descriptors["pc_density"].parent, ".//h4[@id='m42']/parent::div")
+
+    def test_xpaths(self):
+        self.assertEqual(
+            self.descriptors["pc_density"].target,
+            ".//dt[contains(text(),'Dichte') and not(contains(text(),'Einheit'))]/following-sibling::dd[1]",
+        )
+        self.assertFalse(self.descriptors["pc_density"].get_multiple)
+        self.assertEqual(self.descriptors["name_registered_ger"].target, ".//tbody/tr")
+        self.assertTrue(self.descriptors["name_registered_ger"].get_multiple)
+
+    def test_compiled_with_lxml_only(self):
+        descriptor = self.descriptors["id_cas"]
+        if fctSelenium.XPath is None:
+            self.assertIsNone(descriptor.parent_compiled)
+            self.assertIsNone(descriptor.target_compiled)
+        else:
+            self.assertEqual(descriptor.target_compiled.path, descriptor.target)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for ScrollTo
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestScrollTo(unittest.TestCase):
+    def setUp(self):
+        self.driver = MagicMock()
+        self.target = MagicMock()
+
+    def test_displayed_without_scrolling(self):
+        self.target.is_displayed.return_value = True
+
+        self.assertTrue(ScrollTo(WdrDriver=self.driver, WelTarget=self.target))
+        self.driver.execute_script.assert_not_called()
+
+    def test_displayed_after_scrolling(self):
+        self.target.is_displayed.side_effect = [False, False, True]
+
+        self.assertTrue(ScrollTo(WdrDriver=self.driver, WelTarget=self.target))
+        self.assertEqual(self.driver.execute_script.call_count, 2)
+
+    def test_never_displayed_is_bounded(self):
+        self.target.is_displayed.return_value = False
+
+        self.assertFalse(ScrollTo(WdrDriver=self.driver, WelTarget=self.target, attempts=3))
+        self.assertEqual(self.driver.execute_script.call_count, 3)
+
+    def test_undefined_element(self):
+        self.target.is_displayed.return_value = False
+        self.driver.execute_script.side_effect = JavascriptException()
+
+        self.assertFalse(ScrollTo(WdrDriver=self.driver, WelTarget=self.target))
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetElementContents
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetElementContents(unittest.TestCase):
+    def setUp(self):
+        self.driver = MagicMock()
+        self.elements = [MagicMock(), MagicMock()]
+        # Reading an element's text would be another round trip to the browser
+        for element in self.elements:
+            type(element).text = PropertyMock(side_effect=AssertionError("WebElement.text read"))
+
+    def test_single_script_call(self):
+        self.driver.execute_script.return_value = [["Aceton Einzelinhaltsstoff", "https://a/?id=1"], ["Aceton", None]]
+
+        contents = GetElementContents(WdrDriver=self.driver, elements=self.elements, link_xpath="./a")
+
+        self.driver.execute_script.assert_called_once_with(JS_ELEMENT_CONTENTS, self.elements, "./a")
+        self.assertEqual(
+            contents,
+            [
+                ElementContent(self.elements[0], "Aceton Einzelinhaltsstoff", "https://a/?id=1"),
+                ElementContent(self.elements[1], "Aceton", None),
+            ],
+        )
+
+    def test_without_link(self):
+        self.driver.execute_script.return_value = [["Aceton", None], ["Acetonitril", None]]
+
+        contents = GetElementContents(WdrDriver=self.driver, elements=self.elements)
+
+        self.driver.execute_script.assert_called_once_with(JS_ELEMENT_CONTENTS, self.elements, None)
+        self.assertEqual([content.text for content in contents], ["Aceton", "Acetonitril"])
+
+    def test_no_elements(self):
+        self.assertEqual(GetElementContents(WdrDriver=self.driver, elements=[]), [])
+        self.assertEqual(GetElementContents(WdrDriver=self.driver, elements=None), [])
+        self.driver.execute_script.assert_not_called()
@@ -0,0 +1,105 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from src.fctlib.metrics import RegMETRICS
+from src.fctlib.synonyms import SYNONYM_INDEX_VERSION, SynonymIndex
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for SynonymIndex
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestSynonymIndex(unittest.TestCase):
+    def setUp(self):
+        RegMETRICS.Reset()
+        self.temp_folder = TemporaryDirectory()
+        self.PthFile = Path(self.temp_folder.name) / "data" / "synonyms.json"
+        self.index = SynonymIndex(PthFile=self.PthFile)
+
+    def tearDown(self):
+        self.temp_folder.cleanup()
+
+    def test_resolve_normalised_names(self):
+        self.assertEqual(self.index.Add("67-64-1", ["Aceton", "Propan-2-on", "67-64-1"]), 2)
+
+        self.assertEqual(self.index.Resolve("ACETON"), "67-64-1")
+        self.assertEqual(self.index.Resolve("propan 2-on"), "67-64-1")
+        self.assertIsNone(self.index.Resolve("Ethanol"))
+        self.assertEqual(RegMETRICS.GetCounter("synonyms.hits").value, 2)
+        self.assertEqual(RegMETRICS.GetCounter("synonyms.misses").value, 1)
+
+    def test_cas_numbers_not_indexed(self):
+        self.assertEqual(self.index.Add("67-64-1", ["67-64-1", "", None]), 0)
+        self.assertEqual(self.index.Add("67-64-2", ["Aceton"]), 0)
+        self.assertEqual(len(self.index), 0)
+
+    def test_ambiguous_names(self):
+        self.index.Add("64-17-5", ["Ethanol", "Alkohol"])
+        self.assertEqual(self.index.Add("67-63-0", ["Isopropanol", "Alkohol"]), 2)
+        self.assertEqual(self.index.Add("67-63-0", ["Alkohol"]), 0)
+
+        self.assertIsNone(self.index.Resolve("Alkohol"))
+        self.assertEqual(self.index.Resolve("Ethanol"), "64-17-5")
+
+    def test_save_and_load(self):
+        self.index.Add("64-17-5", ["Ethanol", "Alkohol"])
+        self.index.Add("67-63-0", ["Isopropanol", "Alkohol"])
+        self.assertTrue(self.index.Save())
+
+        index = SynonymIndex(PthFile=self.PthFile)
+        self.assertEqual(index.Resolve("ethanol"), "64-17-5")
+        self.assertIsNone(index.Resolve("alkohol"))
+        self.assertEqual(len(index), 3)
+        # Names stay ambiguous after loading
+        index.Add("64-17-5", ["Alkohol"])
+        self.assertIsNone(index.Resolve("alkohol"))
+
+    def test_unchanged_not_saved(self):
+        self.assertTrue(self.index.Save())
+        self.assertFalse(self.PthFile.exists())
+
+    def test_other_version_ignored(self):
+        self.PthFile.parent.mkdir(parents=True)
+        content = {"version": SYNONYM_INDEX_VERSION + 1, "cas_numbers": {"64-17-5": ["ethanol"]}, "ambiguous": []}
+        self.PthFile.write_text(json.dumps(content), encoding="utf-8")
+
+        self.assertIsNone(self.index.Resolve("Ethanol"))
+
+    def test_corrupt_file_ignored(self):
+        self.PthFile.parent.mkdir(parents=True)
+        self.PthFile.write_text("{", encoding="utf-8")
+
+        self.assertIsNone(self.index.Resolve("Ethanol"))
+        self.index.Add("64-17-5", ["Ethanol"])
+        self.assertTrue(self.index.Save())
+        self.assertEqual(SynonymIndex(PthFile=self.PthFile).Resolve("Ethanol"), "64-17-5")
+
+    def test_export_merged_into_other_index(self):
+        worker_index = SynonymIndex()
+        worker_index.Add("67-64-1", ["Aceton", "Propan-2-on"])
+        worker_index.Add("64-17-5", ["Ethanol", "Alkohol"])
+        worker_index.Add("67-63-0", ["Alkohol"])
+
+        exported = worker_index.Export()
+        self.assertEqual(
+            {cas_no: sorted(names) for cas_no, names in exported.items()},
+            {"67-64-1": ["aceton", "propan2on"], "64-17-5": ["ethanol"]},
+        )
+        for cas_no, names in exported.items():
+            self.index.Add(cas_no=cas_no, names=names)
+
+        self.assertEqual(self.index.Resolve("Propan-2-on"), "67-64-1")
+        self.assertEqual(self.index.Resolve("ethanol"), "64-17-5")
+        self.assertIsNone(self.index.Resolve("Alkohol"))
+
+    def test_reset(self):
+        self.index.Add("64-17-5", ["Ethanol"])
+        self.index.Reset(PthFile=None)
+
+        self.assertEqual(len(self.index), 0)
+        self.assertTrue(self.index.Save())
+        self.assertFalse(self.PthFile.exists())
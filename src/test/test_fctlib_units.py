@@ -0,0 +1,79 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+
+import pandas
+
+from src.fctlib.units import AddQuantityColumns, GetQuantities
+from src.settings import NOT_LISTED
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetQuantities
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestGetQuantities(unittest.TestCase):
+    def assertQuantity(self, raw_value, expected_value, expected_unit):
+        DfResult = GetQuantities(pandas.Series([raw_value]))
+        self.assertAlmostEqual(DfResult["value"][0], expected_value, delta=abs(expected_value) * 1e-9)
+        self.assertEqual(DfResult["unit"][0], expected_unit)
+
+    def assertNoQuantity(self, raw_value):
+        DfResult = GetQuantities(pandas.Series([raw_value]))
+        self.assertTrue(pandas.isna(DfResult["value"][0]))
+        self.assertTrue(pandas.isna(DfResult["unit"][0]))
+
+    def test_decimal_comma(self):
+        self.assertQuantity("0,815 g/cm3", 815.0, "kg/m3")
+        self.assertQuantity("0,79 g/cm³", 790.0, "kg/m3")
+
+    def test_thousands_separator(self):
+        self.assertQuantity("1.013 hPa", 101300.0, "Pa")
+        self.assertQuantity("1.013,25 hPa", 101325.0, "Pa")
+        self.assertQuantity("0.815 g/cm3", 815.0, "kg/m3")
+
+    def test_temperature_offset(self):
+        self.assertQuantity("-19,1 °C", 254.05, "K")
+        self.assertQuantity("−5 °C", 268.15, "K")
+
+    def test_qualifiers_conditions_and_ranges(self):
+        self.assertQuantity("ca. 56 °C", 329.15, "K")
+        self.assertQuantity("59 hPa bei 20 °C", 5900.0, "Pa")
+        self.assertQuantity("0,3 mPa s (20 °C)", 3e-4, "Pa*s")
+        self.assertQuantity("3,3 - 19 Vol.-%", 3.3, "%")
+        self.assertQuantity("78 °C|79 °C", 351.15, "K")
+
+    def test_dimensionless(self):
+        self.assertQuantity("1,3614", 1.3614, "")
+
+    def test_no_quantity(self):
+        self.assertNoQuantity(NOT_LISTED)
+        self.assertNoQuantity("12 Furlongs")
+        self.assertNoQuantity(None)
+
+    def test_keeps_index(self):
+        PdsValues = pandas.Series(["22,3 mN/m", NOT_LISTED], index=[5, 7])
+        self.assertEqual(GetQuantities(PdsValues).index.tolist(), [5, 7])
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for AddQuantityColumns
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestAddQuantityColumns(unittest.TestCase):
+    def test_columns_next_to_source(self):
+        DfDataset = pandas.DataFrame(
+            {
+                "query_status_ci": ["Success!", "Success!"],
+                "pc_density": ["0,79 g/cm3", NOT_LISTED],
+                "pc_odour": ["stechend", NOT_LISTED],
+            }
+        )
+        DfResult = AddQuantityColumns(DfDataset, cols=["pc_density", "pc_viscosity"])
+
+        self.assertEqual(
+            DfResult.columns.tolist(),
+            ["query_status_ci", "pc_density", "pc_density_value", "pc_density_unit", "pc_odour"],
+        )
+        self.assertEqual(DfResult["pc_density_value"].dtype, "float64")
+        self.assertEqual(DfResult["pc_density_value"][0], 790.0)
+        self.assertTrue(pandas.isna(DfResult["pc_density_value"][1]))
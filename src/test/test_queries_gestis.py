@@ -0,0 +1,147 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.fctlib.ranking import Ranking
+from src.fctlib.selenium import ElementContent
+from src.queries.gestis import (
+    XPATH_SEARCH_MULTI_CAS,
+    XPATH_SEARCH_MULTI_NAME,
+    CleanMultiHit,
+    GetHitStatus,
+)
+
+
+# Replacements of the selenium helpers, so hits are defined by their texts only
+def GetContents(*texts: str) -> list[ElementContent]:
+    return [ElementContent(element=MagicMock(), text=text, href=None) for text in texts]
+
+
+def GetCells(descriptors: dict[str, list[ElementContent]]):
+    return lambda WdrParent, descriptor: [content.element for content in descriptors.get(descriptor, [])]
+
+
+def GetContentsOf(contents: list[ElementContent]):
+    by_element = {id(content.element): content for content in contents}
+    return lambda WdrDriver, elements, link_xpath=None: [by_element[id(element)] for element in elements]
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetHitStatus
+# ++---------------------------------------------------------------------------------------------------------------------++#
+@patch("src.queries.gestis.sleep", MagicMock())
+class TestGetHitStatus(unittest.TestCase):
+    def GetHitStatus(self, hits: list[ElementContent], query_term: str, synonyms=(), multi_header=None) -> str:
+        with (
+            patch("src.queries.gestis.GetHitList", return_value=[hit.element for hit in hits]),
+            patch("src.fctlib.selenium.GetElementContents", side_effect=GetContentsOf(hits)),
+            patch("src.fctlib.selenium.GetSingleWebElement", return_value=multi_header),
+        ):
+            return GetHitStatus(WdrDriver=MagicMock(), query_term=query_term, synonyms=synonyms)
+
+    def test_single_hit(self):
+        hits = GetContents("Aceton")
+        self.assertEqual(self.GetHitStatus(hits, query_term="Aceton"), "Gestis | Success!")
+        hits[0].element.click.assert_called_once()
+
+    def test_cleaned_hit(self):
+        hits = GetContents("Acetonitril", "Aceton")
+
+        status = self.GetHitStatus(hits, query_term="aceton")
+
+        self.assertIn("Success! Most probable out of 2 query hits", status)
+        hits[1].element.click.assert_called_once()
+
+    def test_differently_named_hits_ranked(self):
+        # None of the hits is named like the query term, the known synonyms tell them apart
+        hits = GetContents("Acetonitril", "Aceton")
+
+        status = self.GetHitStatus(hits, query_term="Propan-2-on", synonyms={"Aceton", "Dimethylketon"})
+
+        self.assertIn("Success! Best ranked out of 2 query hits selected for <Propan-2-on> (score 0.80)", status)
+        self.assertIn("Runner-ups: <Acetonitril> (0.00).", status)
+        hits[1].element.click.assert_called_once()
+        hits[0].element.click.assert_not_called()
+
+    def test_differently_named_hits_unranked(self):
+        hits = GetContents("Acetonitril", "Aceton")
+
+        status = self.GetHitStatus(hits, query_term="Propan-2-on")
+
+        self.assertIn("Skipped <Propan-2-on>: More than one query hit found!", status)
+        self.assertIn("Runner-ups: <Acetonitril> (0.00), <Aceton> (0.00).", status)
+
+    def test_multi_hit_ranked(self):
+        hits = GetContents("Natriumhydroxid")
+        WelResult = MagicMock()
+        ranking = Ranking(selected=0, score=0.8, runner_ups=[("Natronlauge 50 %", 0.0)])
+
+        with patch("src.queries.gestis.CleanMultiHit", return_value=([WelResult], ranking)):
+            status = self.GetHitStatus(hits, query_term="1310-73-2", multi_header=MagicMock())
+
+        self.assertIn("Best ranked hit (score 0.80) out of the ambiguous results selected for <1310-73-2>.", status)
+        self.assertIn("Runner-ups: <Natronlauge 50 %> (0.00).", status)
+        WelResult.click.assert_called_once()
+
+    def test_no_hit(self):
+        self.assertEqual(self.GetHitStatus([], query_term="Aceton"), "Gestis | Skipped <Aceton>: No query hit found!")
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for CleanMultiHit
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestCleanMultiHit(unittest.TestCase):
+    def CleanMultiHit(self, names: list[ElementContent], cas_nos: list[ElementContent], query_term: str, synonyms=()):
+        with (
+            patch(
+                "src.fctlib.selenium.GetWebElements",
+                side_effect=GetCells({XPATH_SEARCH_MULTI_NAME: names, XPATH_SEARCH_MULTI_CAS: cas_nos}),
+            ),
+            patch("src.fctlib.selenium.GetElementContents", side_effect=GetContentsOf(names + cas_nos)),
+        ):
+            return CleanMultiHit(WdrDriver=MagicMock(), query_term=query_term, synonyms=synonyms)
+
+    def test_unique_cas(self):
+        names = GetContents("Natriumhydroxid", "Natronlauge")
+        cas_nos = GetContents("1310-73-2", "1310-73-3")
+
+        self.assertEqual(self.CleanMultiHit(names, cas_nos, query_term="1310-73-2"), ([cas_nos[0].element], None))
+
+    def test_same_cas_ranked_by_name(self):
+        names = GetContents("Natronlauge 50 %", "Natriumhydroxid")
+        cas_nos = GetContents("1310-73-2", "1310-73-2")
+
+        multi_hit_list, ranking = self.CleanMultiHit(
+            names, cas_nos, query_term="1310-73-2", synonyms={"1310-73-2", "Natriumhydroxid", "Ätznatron"}
+        )
+
+        self.assertEqual(multi_hit_list, [names[1].element])
+        self.assertEqual(ranking.selected, 1)
+
+    def test_same_cas_unranked(self):
+        names = GetContents("Natronlauge 50 %", "Natronlauge 30 %")
+        cas_nos = GetContents("1310-73-2", "1310-73-2")
+
+        multi_hit_list, ranking = self.CleanMultiHit(names, cas_nos, query_term="1310-73-2")
+
+        self.assertEqual(multi_hit_list, [cas_nos[0].element, cas_nos[1].element])
+        self.assertIsNone(ranking.selected)
+
+    def test_no_name_ranked_by_name_and_cas(self):
+        names = GetContents("Natriumhydroxid", "Kaliumhydroxid")
+        cas_nos = GetContents("1310-73-2", "1310-58-3")
+
+        multi_hit_list, ranking = self.CleanMultiHit(
+            names, cas_nos, query_term="Ätznatron", synonyms={"1310-73-2", "Natriumhydroxid"}
+        )
+
+        self.assertEqual(multi_hit_list, [names[0].element])
+        self.assertEqual(ranking.selected, 0)
+
+    def test_no_name_unranked(self):
+        names = GetContents("Natriumhydroxid")
+        cas_nos = GetContents("1310-73-2")
+
+        self.assertEqual(self.CleanMultiHit(names, cas_nos, query_term="Ätznatron")[0], [])
@@ -0,0 +1,69 @@
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Imports
+# ++---------------------------------------------------------------------------------------------------------------------++#
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pubchempy import PubChemHTTPError
+
+from src.fctlib.circuitbreaker import CLOSED, OPEN, CircuitBreaker
+from src.fctlib.decorators import RetryFailedException
+from src.fctlib.synonyms import IdxSYNONYMS
+from src.queries.pubchem import GetCasNumbersFromSynonyms, QueryPubChem
+from src.settings import PthSYNONYM_INDEX
+
+SYNONYMS = {"InformationList": {"Information": [{"Synonym": ["acetone", "67-64-1", "Propan-2-one", "1332-84-9"]}]}}
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for GetCasNumbersFromSynonyms
+# ++---------------------------------------------------------------------------------------------------------------------++#
+@patch("src.queries.pubchem.GetPubChemJson", MagicMock(return_value=SYNONYMS))
+class TestGetCasNumbersFromSynonyms(unittest.TestCase):
+    def setUp(self):
+        IdxSYNONYMS.Reset()
+
+    def tearDown(self):
+        IdxSYNONYMS.Reset(PthSYNONYM_INDEX)
+
+    def test_cas_numbers(self):
+        self.assertEqual(GetCasNumbersFromSynonyms(MagicMock(cid=180)), "67-64-1, 1332-84-9")
+
+    def test_not_indexed_by_default(self):
+        GetCasNumbersFromSynonyms(MagicMock(cid=180))
+        self.assertEqual(len(IdxSYNONYMS), 0)
+
+    def test_indexed_on_demand(self):
+        GetCasNumbersFromSynonyms(MagicMock(cid=180), index_synonyms=True)
+
+        self.assertEqual(IdxSYNONYMS.Resolve("Propan-2-one"), "67-64-1")
+        self.assertEqual(len(IdxSYNONYMS), 2)
+
+
+# ++---------------------------------------------------------------------------------------------------------------------++#
+# ++ Unit test for QueryPubChem
+# ++---------------------------------------------------------------------------------------------------------------------++#
+class TestQueryPubChem(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(name="TestPubChem", failure_rate=0.5, window=2, min_calls=2)
+        self.patcher = patch("src.queries.pubchem.CbrPUBCHEM", self.breaker)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    @patch("src.queries.pubchem.GetPubChemJson", side_effect=PubChemHTTPError(400, "PUGREST.BadRequest", []))
+    def test_client_error_not_counted_as_failure(self, _):
+        for _ in range(3):
+            data = QueryPubChem("((malformed")
+            self.assertIn("Query rejected by PubChem", data["query_status_pc"])
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    @patch("src.queries.pubchem.GetCompoundsList", side_effect=RetryFailedException())
+    def test_server_error_counted_as_failure(self, _):
+        for _ in range(2):
+            data = QueryPubChem("acetone")
+            self.assertIn("This is not your fault", data["query_status_pc"])
+
+        self.assertEqual(self.breaker.state, OPEN)